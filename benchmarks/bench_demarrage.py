@@ -0,0 +1,119 @@
+"""
+Temps de démarrage de chaque commande de `python -m planning_medecin` et dépendances lourdes qu'elle charge.
+
+Chaque commande est lancée plusieurs fois dans un nouveau processus (meilleur temps retenu), sur un petit fichier
+de critères, puis une fois de plus pour relever lesquelles de numpy, pandas, rich et streamlit ont été importées.
+Les résultats sont enregistrés en JSON avec le commit courant :
+
+    python benchmarks/bench_demarrage.py --sortie demarrage.json
+    python benchmarks/bench_demarrage.py --comparer demarrage.json
+
+`view` (critères ou planning enregistré au format npy) et `demo` ne doivent pas importer pandas ; le script sort en
+erreur si c'est le cas.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+RACINE = Path(__file__).resolve().parent.parent
+DEPENDANCES = ["numpy", "pandas", "rich", "streamlit"]
+SANS_PANDAS = {"view", "view npy", "demo"}
+
+# Exécute la commande dans le processus courant, puis écrit les dépendances lourdes chargées dans le fichier argv[1].
+PILOTE = """
+import json, sys
+sortie, sys.argv = sys.argv[1], ["planning_medecin"] + sys.argv[2:]
+from planning_medecin.__main__ import app
+try:
+    app()
+except SystemExit:
+    pass
+with open(sortie, "w") as file:
+    json.dump([m for m in {dependances!r} if m in sys.modules], file)
+"""
+
+
+def commandes(dossier):
+    criteres = os.path.join(dossier, "criteres.json")
+    archive = os.path.join(dossier, "planning")
+    return {
+        "aide": ["--help"],
+        "demo": ["demo", "--sortie", criteres],
+        "view": ["view", criteres],
+        "solve": ["solve", criteres, "--no-cache"],
+        "solve csv": ["solve", criteres, "--no-cache", "--format", "csv"],
+        "solve npy": ["solve", criteres, "--no-cache", "--format", "npy", "--sortie", archive],
+        "view npy": ["view", archive, "--debut", "3", "--fin", "5"],
+        "solve-batch": ["solve-batch", criteres, "--sortie", os.path.join(dossier, "resultats"), "--workers", "1"],
+    }
+
+
+def executer(arguments):
+    environnement = dict(os.environ, PYTHONPATH=str(RACINE) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    resultats = []
+    with tempfile.TemporaryDirectory() as dossier:
+        subprocess.run([sys.executable, "-m", "planning_medecin", "demo", "--sortie", os.path.join(dossier, "criteres.json")],
+                       env=environnement, check=True, cwd=dossier)
+        for nom, args in commandes(dossier).items():
+            meilleur = float("inf")
+            for _ in range(arguments.repetitions):
+                debut = time.perf_counter()
+                subprocess.run([sys.executable, "-m", "planning_medecin", *args], env=environnement, cwd=dossier,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                meilleur = min(meilleur, time.perf_counter() - debut)
+            fichier = os.path.join(dossier, "modules.json")
+            subprocess.run([sys.executable, "-c", PILOTE.format(dependances=DEPENDANCES), fichier, *args],
+                           env=environnement, cwd=dossier, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            with open(fichier) as file:
+                charges = json.load(file)
+            resultats.append({"commande": nom, "duree_s": meilleur, "modules": charges})
+            print(f"{nom:<12} {meilleur * 1000:8.1f} ms  {', '.join(charges) or '-'}")
+    return resultats
+
+
+def commit_courant():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=RACINE).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sortie", default="bench_demarrage.json", help="Fichier JSON des résultats")
+    parser.add_argument("--comparer", help="Fichier JSON d'une exécution précédente à comparer")
+    parser.add_argument("--repetitions", type=int, default=5)
+    arguments = parser.parse_args()
+
+    resultats = executer(arguments)
+    with open(arguments.sortie, "w") as file:
+        json.dump({
+            "commit": commit_courant(),
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "resultats": resultats,
+        }, file, indent=2)
+    if arguments.comparer:
+        with open(arguments.comparer) as file:
+            reference = json.load(file)
+        anciens = {r["commande"]: r for r in reference["resultats"]}
+        print(f"\nComparaison avec {reference.get('commit')} (rapport nouveau / ancien) :")
+        for r in resultats:
+            if r["commande"] in anciens:
+                print(f"{r['commande']:<12} ×{r['duree_s'] / anciens[r['commande']]['duree_s']:6.2f}")
+
+    fautifs = [r["commande"] for r in resultats if r["commande"] in SANS_PANDAS and "pandas" in r["modules"]]
+    if fautifs:
+        sys.exit(f"pandas est importé par : {', '.join(fautifs)}")
+
+
+if __name__ == "__main__":
+    main()
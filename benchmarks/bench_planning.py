@@ -0,0 +1,147 @@
+"""
+Mesures de performance des fonctions de la bibliothèque sur une grille de tailles de scénarios synthétiques.
+
+Chaque fonction est chronométrée (meilleur temps sur plusieurs répétitions) puis exécutée une fois de plus sous
+tracemalloc pour mesurer son pic mémoire. Les résultats sont enregistrés en JSON avec le commit courant, afin de
+comparer deux versions du planificateur :
+
+    python benchmarks/bench_planning.py --sortie bench_avant.json
+    python benchmarks/bench_planning.py --sortie bench_apres.json --comparer bench_avant.json
+
+La grille par défaut va de 10 à 10 000 médecins et de 10 à 3 650 jours ; les combinaisons dépassant
+--max-disponibilites entrées de disponibilité sont ignorées (--rapide se limite aux petites tailles).
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from planning_medecin.faisabilite import verifier_faisabilite  # noqa: E402
+from planning_medecin.lib_hp import (  # noqa: E402
+    MatriceDisponibilites,
+    dispo_medecin,
+    jours_de_gardes,
+    planifier,
+    trouver_emploi_du_temps,
+)
+from planning_medecin.scenarios import generer_scenario  # noqa: E402
+
+TAILLES_MEDECINS = [10, 100, 1_000, 10_000]
+TAILLES_JOURS = [10, 365, 3_650]
+
+FONCTIONS = {
+    "jours_de_gardes": lambda m, v, j, g: jours_de_gardes(v, j),
+    "MatriceDisponibilites": lambda m, v, j, g: MatriceDisponibilites.depuis_medecins(m, j),
+    "dispo_medecin": lambda m, v, j, g: dispo_medecin(m, j),
+    "planifier": lambda m, v, j, g: planifier(m, v, j, g),
+    "trouver_emploi_du_temps": lambda m, v, j, g: trouver_emploi_du_temps(m, v, j, g),
+    "verifier_faisabilite": lambda m, v, j, g: verifier_faisabilite(m, v, j, g),
+}
+
+
+def mesurer(fonction, scenario, repetitions):
+    """Renvoie (meilleur temps en secondes, pic mémoire en octets, statut) pour un appel de `fonction`."""
+    meilleur = float("inf")
+    statut = "ok"
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        try:
+            fonction(*scenario)
+        except ValueError as erreur:
+            statut = f"ValueError: {erreur}"
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    tracemalloc.start()
+    try:
+        fonction(*scenario)
+    except ValueError:
+        pass
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return meilleur, pic, statut
+
+
+def commit_courant():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executer(arguments):
+    tailles_medecins = [10, 100] if arguments.rapide else TAILLES_MEDECINS
+    tailles_jours = [10, 365] if arguments.rapide else TAILLES_JOURS
+    resultats = []
+    for nb_medecins in tailles_medecins:
+        for nb_jours in tailles_jours:
+            if nb_medecins * nb_jours * arguments.densite > arguments.max_disponibilites:
+                continue
+            scenario = generer_scenario(
+                nb_medecins, nb_jours, arguments.densite, arguments.vacances, arguments.duree_vacances,
+                arguments.max_gardes, arguments.graine,
+            )
+            for nom, fonction in FONCTIONS.items():
+                if arguments.fonctions and nom not in arguments.fonctions:
+                    continue
+                duree, pic, statut = mesurer(fonction, scenario, arguments.repetitions)
+                resultats.append({
+                    "fonction": nom,
+                    "nb_medecins": nb_medecins,
+                    "nb_jours": nb_jours,
+                    "duree_s": duree,
+                    "memoire_pic_o": pic,
+                    "statut": statut,
+                })
+                print(f"{nom:<24} {nb_medecins:>6} médecins {nb_jours:>5} jours  {duree:9.4f} s  {pic / 1e6:9.2f} Mo  {statut[:40]}")
+    return resultats
+
+
+def comparer(resultats, reference):
+    cle = lambda r: (r["fonction"], r["nb_medecins"], r["nb_jours"])  # noqa: E731
+    anciens = {cle(r): r for r in reference["resultats"]}
+    print(f"\nComparaison avec {reference.get('commit')} (rapport nouveau / ancien) :")
+    for r in resultats:
+        ancien = anciens.get(cle(r))
+        if ancien and ancien["duree_s"] > 0:
+            print(f"{r['fonction']:<24} {r['nb_medecins']:>6} × {r['nb_jours']:>5}  temps ×{r['duree_s'] / ancien['duree_s']:6.2f}"
+                  f"  mémoire ×{r['memoire_pic_o'] / max(ancien['memoire_pic_o'], 1):6.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sortie", default="bench_planning.json", help="Fichier JSON des résultats")
+    parser.add_argument("--comparer", help="Fichier JSON d'une exécution précédente à comparer")
+    parser.add_argument("--rapide", action="store_true", help="Se limiter aux petites tailles")
+    parser.add_argument("--fonctions", nargs="*", choices=list(FONCTIONS), help="Fonctions à mesurer (toutes par défaut)")
+    parser.add_argument("--densite", type=float, default=0.3)
+    parser.add_argument("--vacances", type=int, default=4)
+    parser.add_argument("--duree-vacances", type=int, default=7)
+    parser.add_argument("--max-gardes", choices=["serre", "large"], default="large")
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--max-disponibilites", type=float, default=5e6)
+    arguments = parser.parse_args()
+
+    resultats = executer(arguments)
+    rapport = {
+        "commit": commit_courant(),
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "parametres": {k: v for k, v in vars(arguments).items() if k not in ("sortie", "comparer")},
+        "resultats": resultats,
+    }
+    with open(arguments.sortie, "w") as file:
+        json.dump(rapport, file, indent=2, ensure_ascii=False)
+    if arguments.comparer:
+        with open(arguments.comparer) as file:
+            comparer(resultats, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
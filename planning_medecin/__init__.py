@@ -1 +1,66 @@
-from .lib_hp import PeriodeVacance, Medecin, jours_de_gardes, dispo_medecin, trouver_emploi_du_temps
\ No newline at end of file
+import importlib
+
+# Les noms publics sont importés à leur premier accès (PEP 562) : `import planning_medecin`
+# ne charge ni numpy ni pandas, et chaque sous-module n'est importé que s'il est utilisé.
+_EXPORTS = {
+    "PeriodeVacance": "lib_hp",
+    "Medecin": "lib_hp",
+    "MatriceDisponibilites": "lib_hp",
+    "IndexParJour": "lib_hp",
+    "Planning": "lib_hp",
+    "CriteresInvalides": "lib_hp",
+    "charger_criteres": "lib_hp",
+    "CalendrierVacances": "calendrier",
+    "jours_de_gardes": "lib_hp",
+    "dispo_medecin": "lib_hp",
+    "planifier": "lib_hp",
+    "trouver_emploi_du_temps": "lib_hp",
+    "iter_emplois_du_temps": "lib_hp",
+    "Faisabilite": "faisabilite",
+    "verifier_faisabilite": "faisabilite",
+    "StatistiquesRecherche": "solveur_exact",
+    "StatistiquesPortfolio": "portfolio",
+    "AjoutMedecin": "ajustement",
+    "RetraitMedecin": "ajustement",
+    "AjoutDisponibilites": "ajustement",
+    "RetraitDisponibilites": "ajustement",
+    "AjoutVacance": "ajustement",
+    "ajuster_planning": "ajustement",
+    "CacheSolutions": "cache",
+    "cle_canonique": "cache",
+    "PlanningArchive": "archive",
+    "enregistrer_planning": "archive",
+    "ouvrir_planning": "archive",
+    "ServicePlanification": "service",
+    "resoudre_via_service": "service",
+    "planifier_via_service": "service",
+    "PlafondMinimal": "minimisation",
+    "minimiser_max_gardes": "minimisation",
+    "Fenetre": "fenetres",
+    "iterer_fenetres": "fenetres",
+    "planifier_par_fenetres": "fenetres",
+    "Composante": "lignes",
+    "PlanningLignes": "lignes",
+    "charger_lignes": "lignes",
+    "planifier_par_lignes": "lignes",
+    "PlanningEffectifs": "effectifs",
+    "charger_effectifs": "effectifs",
+    "effectifs_par_jour": "effectifs",
+    "planifier_effectifs": "effectifs",
+    "MesurePhase": "profilage",
+    "Profil": "profilage",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(nom):
+    if nom not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
+    valeur = getattr(importlib.import_module(f".{_EXPORTS[nom]}", __name__), nom)
+    globals()[nom] = valeur
+    return valeur
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
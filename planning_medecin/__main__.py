@@ -1,16 +1,29 @@
+import contextlib
+import csv
 import json
 import os
+import sys
+from functools import lru_cache
+import typer
 from typer import Typer
-from rich.console import Console
-from rich.table import Table
-from planning_medecin.lib_hp import Medecin, PeriodeVacance, trouver_emploi_du_temps
 
+# Les dépendances lourdes (numpy, pandas, rich) sont importées dans les commandes qui s'en servent :
+# `view` n'importe ni numpy ni pandas, `demo` n'importe ni pandas ni rich.
 app = Typer()
-console = Console()
+
+
+@lru_cache(maxsize=None)
+def get_console():
+    """Console rich partagée, créée au premier affichage."""
+    from rich.console import Console
+
+    return Console()
 
 
 def get_data():
-    """Récupère les données nécessaires pour la génération du planning."""
+    """Récupère les données nécessaires pour la génération du planning : les médecins et les vacances de démonstration."""
+    from planning_medecin.lib_hp import Medecin, PeriodeVacance
+
     medecins = [
         Medecin("Dr. MACHECOURT", {1, 2, 3, 4, 8, 9}),
         Medecin("Dr. SENGEL", {1, 2, 4, 5, 6, 7, 10}),
@@ -22,47 +35,519 @@ def get_data():
     return medecins, vacances
 
 
-@app.command()
-def demo():
-    """Génère un fichier demonstration.json contenant les critères."""
+def get_scenario(
+    nb_medecins: int = 0,
+    nb_jours: int = 10,
+    densite: float = 0.3,
+    nb_vacances: int = 2,
+    duree_vacances: int = 7,
+    max_gardes: str = "large",
+    graine: int = 0
+):
+    """
+    Récupère des critères complets (médecins, vacances, nombre de jours, nombre maximal de gardes).
+
+    Sans argument, renvoie les données de `get_data` sur 10 jours avec 3 gardes au plus.
+    Avec `nb_medecins`, renvoie un scénario synthétique reproductible généré par `generer_scenario`.
+    """
+    if nb_medecins:
+        from planning_medecin.scenarios import generer_scenario
+
+        return generer_scenario(nb_medecins, nb_jours, densite, nb_vacances, duree_vacances, max_gardes, graine)
     medecins, vacances = get_data()
+    return medecins, vacances, 10, 3
+
+
+@app.command()
+def demo(
+    medecins: int = 0,
+    jours: int = 10,
+    densite: float = 0.3,
+    vacances: int = 2,
+    duree_vacances: int = 7,
+    max_gardes: str = "large",
+    graine: int = 0,
+    sortie: str = "demonstration.json"
+):
+    """
+    Génère un fichier demonstration.json contenant les critères.
+
+    Avec --medecins N, les critères sont un scénario synthétique reproductible (voir --jours, --densite, --vacances,
+    --duree-vacances, --max-gardes serre|large et --graine).
+    """
+    liste_medecins, liste_vacances, nb_jours, plafond = get_scenario(
+        medecins, jours, densite, vacances, duree_vacances, max_gardes, graine
+    )
     data = {
         "medecins": [
             {"id": med.id, "disponibilites": list(med.disponibilites)}
-            for med in medecins
+            for med in liste_medecins
         ],
         "vacances": [
-            {"nom": vac.nom, "debut": vac.debut, "duree": vac.duree} for vac in vacances
+            {"nom": vac.nom, "debut": vac.debut, "duree": vac.duree} for vac in liste_vacances
         ],
+        "nb_jours": nb_jours,
+        "max_gardes": plafond,
     }
-    with open("demonstration.json", "w") as file:
+    with open(sortie, "w") as file:
         json.dump(data, file, indent=2)
 
 
+def est_ndjson(chemin: str) -> bool:
+    """Indique si le fichier de critères est au format NDJSON (un objet JSON par ligne)."""
+    return chemin.endswith((".ndjson", ".jsonl"))
+
+
 @app.command()
-def view(chemin: str):
-    """Visualise les critères à partir d'un fichier JSON."""
+def view(chemin: str, debut: int = 1, fin: int = 0):
+    """
+    Visualise les critères à partir d'un fichier JSON ou NDJSON.
+
+    Si `chemin` est un planning enregistré par `solve --format npy --sortie DOSSIER`, affiche ses gardes des jours
+    --debut à --fin (par défaut, tout l'horizon) ; l'archive est projetée en mémoire et seuls ces jours sont lus.
+    """
+    from planning_medecin.archive import est_archive
+
+    if est_archive(chemin):
+        from planning_medecin.archive import ouvrir_planning
+
+        with ouvrir_planning(chemin) as archive:
+            get_console().print(archive.to_rich(debut, fin or None))
+        return
+    if est_ndjson(chemin):
+        from planning_medecin.flux import lire_criteres_ndjson
+
+        with open(chemin, "r") as file:
+            medecins, vacances, nb_jours, max_gardes, _ = lire_criteres_ndjson(file)
+        display_criteria(
+            [{"id": med.id, "disponibilites": med.disponibilites} for med in medecins],
+            [{"nom": vac.nom, "debut": vac.debut, "duree": vac.duree} for vac in vacances],
+            nb_jours,
+            max_gardes,
+        )
+        return
     with open(chemin, "r") as file:
         data = json.load(file)
     medecins = data["medecins"]
     vacances = data["vacances"]
-    display_criteria(medecins, vacances, 10, 3)
+    display_criteria(medecins, vacances, data.get("nb_jours", 10), data.get("max_gardes", 3))
 
 
 @app.command()
-def solve(chemin: str):
-    """Résout le planning des gardes à partir d'un fichier JSON."""
+def solve(
+    chemin: str,
+    format: str = "table",
+    sortie: str = "-",
+    verifier: bool = False,
+    solver: str = "glouton",
+    cache: bool = True,
+    profile: bool = False,
+    profile_json: str = "",
+    minimiser: bool = False,
+    fenetre: int = 0,
+    count: int = 1,
+    symetries: bool = False,
+    workers: int = 0,
+    service: str = typer.Option("", envvar="PLANNING_MEDECIN_SERVICE")
+):
+    """
+    Résout le planning des gardes à partir d'un fichier JSON ou NDJSON.
+
+    Avec --format csv ou ndjson, le planning est écrit jour par jour (dans --sortie, ou sur la sortie standard)
+    au fur et à mesure de la résolution, sans construire de tableau complet : la première ligne est écrite aussitôt
+    et la mémoire reste faible. Si la résolution échoue en cours de route, les jours déjà écrits restent dans la
+    sortie ; avec --verifier, l'instance est d'abord vérifiée sur tout l'horizon, si bien qu'aucune ligne n'est
+    écrite pour une instance infaisable, au prix d'un délai et d'une mémoire proportionnels à l'horizon.
+
+    Avec --format npy, le planning est enregistré au format colonne dans le dossier --sortie (voir
+    `enregistrer_planning`), que `view DOSSIER` relit par plages de jours. Les plannings déjà résolus sont
+    relus depuis le cache disque (voir PLANNING_MEDECIN_CACHE), sauf avec --no-cache.
+
+    L'algorithme glouton est lancé directement ; s'il échoue, le calcul de flot de `verifier_faisabilite` indique
+    si l'instance est infaisable (et quels jours sont en défaut) ou si un autre solveur peut aboutir. Avec --verifier,
+    ce calcul est fait avant toute résolution (et avant l'écriture de la première ligne), quel que soit le mode :
+    environ 2 s pour 2000 médecins sur 730 jours disponibles un jour sur trois, contre 0,1 s pour l'algorithme glouton.
+
+    Avec --profile, le cache est ignoré et la durée, le pic mémoire de chaque phase et les candidats examinés
+    par jour sont affichés sur la sortie d'erreur ; --profile-json FICHIER les enregistre aussi en JSON.
+
+    Avec --minimiser, le max_gardes du fichier est ignoré : le plus petit plafond admettant un planning est
+    calculé (voir `minimiser_max_gardes`) et affiché avec l'écart de charge entre médecins.
+
+    Avec --fenetre N, l'horizon est planifié par fenêtres de N jours (voir `iterer_fenetres`) : chaque fenêtre est
+    affichée ou écrite dès qu'elle est terminée, sans passer par le cache. Le planning est celui du solveur glouton.
+    La mémoire ne dépend que de la taille des fenêtres : aucun calcul de flot n'est fait sur tout l'horizon, ni
+    avant la résolution ni pour expliquer un échec, sauf avec --verifier.
+
+    Avec --count N (N > 1), jusqu'à N emplois du temps distincts sont produits l'un après l'autre par la recherche
+    exacte (voir `iter_emplois_du_temps`) ; --symetries ne produit qu'une fois les plannings qui ne diffèrent que
+    par l'échange de médecins aux disponibilités identiques. En CSV et NDJSON, chaque ligne porte le numéro du planning.
+
+    Avec --service URL (ou PLANNING_MEDECIN_SERVICE), un fichier JSON est résolu par le service lancé par `serve`,
+    sans importer numpy ni la bibliothèque ; la résolution est locale si le service est injoignable, ou si l'une
+    des options --minimiser, --fenetre, --count ou --profile est utilisée.
+
+    Si les médecins du fichier JSON déclarent des lignes de garde ("lignes"), un médecin est affecté chaque jour à
+    chaque ligne (voir `planifier_par_lignes`) : les lignes sans médecin commun sont résolues en parallèle sur
+    --workers processus, et la durée de chaque composante est affichée sur la sortie d'erreur. Les options --solver,
+    --verifier, --no-cache, --minimiser, --profile, --fenetre et --count sont alors refusées.
+
+    Si le fichier JSON précise des "effectifs" (voir `charger_effectifs`), plusieurs médecins sont de garde chaque
+    jour (voir `planifier_effectifs`) ; en CSV et NDJSON, chaque garde occupe une ligne.
+    """
+    if service and format != "npy" and not (est_ndjson(chemin) or minimiser or fenetre or count > 1 or profile or profile_json):
+        if resoudre_par_service(chemin, service, format, sortie, verifier, solver):
+            return
+    from rich.console import Console
+    from planning_medecin.cache import CacheSolutions, EchecMemorise, cle_canonique, dossier_cache_par_defaut
+    from planning_medecin.lib_hp import Planning, charger_criteres, planifier
+
+    index = None
+    if est_ndjson(chemin):
+        from planning_medecin.flux import lire_criteres_ndjson
+
+        with open(chemin, "r") as file:
+            medecins, vacances, nb_jours, max_gardes, index = lire_criteres_ndjson(file)
+    else:
+        with open(chemin, "r") as file:
+            data = json.load(file)
+        medecins, vacances, nb_jours, max_gardes = charger_criteres(data)
+        if any("lignes" in record for record in data["medecins"]):
+            from planning_medecin.lignes import charger_lignes
+
+            if "effectifs" in data:
+                raise typer.BadParameter("Les effectifs par jour ne sont pas pris en charge avec des lignes de garde.")
+            refuser_options(
+                "avec des lignes de garde",
+                **{"--solver": solver != "glouton", "--verifier": verifier, "--no-cache": not cache, "--minimiser": minimiser,
+                   "--profile": profile or bool(profile_json), "--fenetre": bool(fenetre), "--count": count > 1},
+            )
+            resoudre_par_lignes(medecins, charger_lignes(data), vacances, nb_jours, max_gardes, format, sortie, workers)
+            return
+        if "effectifs" in data:
+            from planning_medecin.effectifs import charger_effectifs, planifier_effectifs
+
+            if format == "npy":
+                raise typer.BadParameter("Le format npy n'enregistre qu'un médecin par jour : utilisez table, csv ou ndjson.")
+            refuser_options(
+                "avec des effectifs par jour",
+                **{"--solver": solver != "glouton", "--verifier": verifier, "--no-cache": not cache, "--minimiser": minimiser,
+                   "--profile": profile or bool(profile_json), "--fenetre": bool(fenetre), "--count": count > 1},
+            )
+            effectifs = charger_effectifs(data, vacances, nb_jours)
+            ecrire_planning(planifier_effectifs(medecins, vacances, nb_jours, max_gardes, effectifs), format, sortie)
+            return
+    if minimiser:
+        from planning_medecin.minimisation import minimiser_max_gardes
+
+        resultat = minimiser_max_gardes(medecins, vacances, nb_jours)
+        Console(stderr=True).print(
+            f"Plafond minimal : {resultat.max_gardes} gardes par médecin ({resultat.verifications} vérifications) ; "
+            f"charge de {resultat.charge_min} à {resultat.charge_max} gardes (écart {resultat.ecart})"
+        )
+        ecrire_planning(resultat.planning, format, sortie)
+        return
+    if count > 1:
+        resoudre_plusieurs(medecins, vacances, nb_jours, max_gardes, count, symetries, format, sortie)
+        return
+    if fenetre:
+        resoudre_par_fenetres(medecins, vacances, nb_jours, max_gardes, fenetre, format, sortie, verifier, solver)
+        return
+    if profile or profile_json:
+        resoudre_avec_profil(medecins, vacances, nb_jours, max_gardes, format, sortie, verifier, solver, profile_json)
+        return
+    solutions = CacheSolutions(dossier=dossier_cache_par_defaut()) if cache else CacheSolutions(taille_memoire=0)
+
+    if format in ("table", "npy"):
+        try:
+            planning = solutions.planifier(medecins, vacances, nb_jours, max_gardes, verifier=verifier, solver=solver)
+        except ValueError as erreur:
+            if verifier or solver != "glouton":
+                raise
+            raise expliquer_echec(medecins, vacances, nb_jours, max_gardes, erreur) from erreur
+        ecrire_planning(planning, format, sortie)
+        return
+    if format not in ("csv", "ndjson"):
+        raise typer.BadParameter(f"Format inconnu : {format} (attendu : table, csv, ndjson ou npy)")
+
+    from planning_medecin.flux import ecrire_planning_csv, ecrire_planning_ndjson, planifier_en_flux
+
+    ecrire = ecrire_planning_csv if format == "csv" else ecrire_planning_ndjson
+    cle = cle_canonique(medecins, vacances, nb_jours, max_gardes, verifier=verifier, solver=solver)
+    memorise = solutions.lire(cle)
+    if isinstance(memorise, EchecMemorise):
+        raise ValueError(memorise.message)
+    if memorise is not None:
+        gardes = memorise.gardes_par_jour()
+    elif solver != "glouton":
+        planning = planifier(medecins, vacances, nb_jours, max_gardes, verifier=verifier, solver=solver)
+        solutions.ecrire(cle, planning)
+        gardes = planning.gardes_par_jour()
+    else:
+        if verifier:
+            from planning_medecin.faisabilite import verifier_faisabilite
+
+            faisabilite = verifier_faisabilite(medecins, vacances, nb_jours, max_gardes)
+            if not faisabilite.faisable:
+                raise ValueError(faisabilite.message())
+        gardes = memoriser_gardes(
+            planifier_en_flux(medecins, vacances, nb_jours, max_gardes, index),
+            lambda affectation: solutions.ecrire(cle, Planning(medecins, vacances, nb_jours, max_gardes, affectation)),
+            {med.id: i for i, med in enumerate(medecins)},
+        )
+    try:
+        if sortie == "-":
+            ecrire(gardes, sys.stdout)
+        else:
+            with open(sortie, "w", newline="") as file:
+                ecrire(gardes, file)
+    except ValueError as erreur:
+        if verifier or solver != "glouton":
+            raise
+        raise expliquer_echec(medecins, vacances, nb_jours, max_gardes, erreur) from erreur
+
+
+def refuser_options(mode, **options):
+    """Refuse les options de `solve` (nommées par leur drapeau) qui seraient sans effet dans le mode de résolution `mode`."""
+    actives = [drapeau for drapeau, active in options.items() if active]
+    if actives:
+        raise typer.BadParameter(f"{', '.join(actives)} : option(s) non prise(s) en charge {mode}.")
+
+
+def expliquer_echec(medecins, vacances, nb_jours, max_gardes, erreur):
+    """Après un échec de l'algorithme glouton, renvoie l'erreur à afficher, précisée par le calcul de flot."""
+    from planning_medecin.faisabilite import verifier_faisabilite
+
+    faisabilite = verifier_faisabilite(medecins, vacances, nb_jours, max_gardes)
+    if not faisabilite.faisable:
+        return ValueError(faisabilite.message())
+    return ValueError(f"{erreur} Un emploi du temps existe pourtant : essayez --solver exact ou --solver portfolio.")
+
+
+def resoudre_avec_profil(medecins, vacances, nb_jours, max_gardes, format, sortie, verifier, solver, profile_json):
+    """Résout sans cache en mesurant chaque phase, y compris l'affichage ou l'écriture du planning."""
+    from rich.console import Console
+    from planning_medecin.lib_hp import planifier
+    from planning_medecin.profilage import Profil
+
+    if format not in ("table", "csv", "ndjson", "npy"):
+        raise typer.BadParameter(f"Format inconnu : {format} (attendu : table, csv, ndjson ou npy)")
+    profil = Profil()
+    try:
+        planning = planifier(medecins, vacances, nb_jours, max_gardes, verifier=verifier, solver=solver, profil=profil)
+        with profil.phase("rendu" if format == "table" else "ecriture"):
+            ecrire_planning(planning, format, sortie)
+    finally:
+        Console(stderr=True).print(profil.to_rich())
+        if profile_json:
+            with open(profile_json, "w") as file:
+                json.dump(profil.to_dict(), file, indent=2)
+
+
+def resoudre_par_service(chemin, service, format, sortie, verifier, solver):
+    """Client léger : fait résoudre le fichier par le service ; renvoie False si le service est injoignable."""
+    from rich.console import Console
+    from planning_medecin.service import resoudre_via_service
+
+    if format not in ("table", "csv", "ndjson"):
+        raise typer.BadParameter(f"Format inconnu : {format} (attendu : table, csv ou ndjson)")
     with open(chemin, "r") as file:
         data = json.load(file)
-    medecins = [
-        Medecin(med["id"], set(med["disponibilites"])) for med in data["medecins"]
-    ]
-    vacances = [
-        PeriodeVacance(vac["nom"], vac["debut"], vac["duree"])
-        for vac in data["vacances"]
-    ]
-    emploi_du_temps_df = trouver_emploi_du_temps(medecins, vacances, 10, 3)
-    display_planning(emploi_du_temps_df)
+    if "effectifs" in data or any("lignes" in record for record in data["medecins"]):
+        return False
+    try:
+        reponse = resoudre_via_service(service, data, solver, verifier)
+    except OSError as erreur:
+        Console(stderr=True).print(f"Service injoignable ({erreur}), résolution locale.")
+        return False
+    ecrire_gardes([med["id"] for med in data["medecins"]], reponse["gardes"], format, sortie)
+    return True
+
+
+def ecrire_gardes(ids, gardes, format, sortie):
+    """Affiche ou écrit des triplets (jour, vacance, médecin) sans numpy, pour les plannings reçus du service."""
+    if format == "table":
+        from rich.table import Table
+
+        table = Table(title="Planning des Gardes")
+        for col in ["Jour"] + ids:
+            table.add_column(col)
+        for jour, vacance, medecin in gardes:
+            table.add_row(f"Jour {jour} {vacance}" if vacance else f"Jour {jour}", *["X" if id == medecin else "-" for id in ids])
+        get_console().print(table)
+        return
+    with (open(sortie, "w", newline="") if sortie != "-" else contextlib.nullcontext(sys.stdout)) as file:
+        if format == "csv":
+            writer = csv.writer(file)
+            writer.writerow(["jour", "vacance", "medecin"])
+            writer.writerows(gardes)
+        else:
+            for jour, vacance, medecin in gardes:
+                file.write(json.dumps({"jour": jour, "vacance": vacance, "medecin": medecin}, ensure_ascii=False) + "\n")
+
+
+def resoudre_plusieurs(medecins, vacances, nb_jours, max_gardes, count, symetries, format, sortie):
+    """Affiche ou écrit jusqu'à `count` emplois du temps distincts, chacun dès qu'il est trouvé."""
+    from itertools import islice
+    from rich.console import Console
+    from planning_medecin.lib_hp import iter_emplois_du_temps
+    from planning_medecin.solveur_exact import StatistiquesRecherche
+
+    if format not in ("table", "csv", "ndjson"):
+        raise typer.BadParameter(f"Format inconnu : {format} (attendu : table, csv ou ndjson)")
+    recherche = StatistiquesRecherche()
+    plannings = islice(iter_emplois_du_temps(medecins, vacances, nb_jours, max_gardes, symetries=symetries, statistiques=recherche), count)
+    trouves = 0
+    if format == "table":
+        for trouves, planning in enumerate(plannings, start=1):
+            table = planning.to_rich()
+            table.title = f"Planning des Gardes n°{trouves}"
+            get_console().print(table)
+    else:
+        with (open(sortie, "w", newline="") if sortie != "-" else contextlib.nullcontext(sys.stdout)) as file:
+            writer = csv.writer(file) if format == "csv" else None
+            if writer is not None:
+                writer.writerow(["planning", "jour", "vacance", "medecin"])
+            for trouves, planning in enumerate(plannings, start=1):
+                for jour, vacance, medecin in planning.gardes_par_jour():
+                    if writer is not None:
+                        writer.writerow([trouves, jour, vacance, medecin])
+                    else:
+                        file.write(json.dumps({"planning": trouves, "jour": jour, "vacance": vacance, "medecin": medecin}, ensure_ascii=False) + "\n")
+                file.flush()
+    budget = recherche.statut == "budget"
+    if not trouves:
+        if budget:
+            raise ValueError(f"Budget de recherche épuisé sans emploi du temps ({recherche.noeuds} noeuds, {recherche.duree:.2f} s).")
+        raise ValueError("Aucun emploi du temps ne respecte les contraintes, impossible de compléter l'emploi du temps.")
+    if trouves < count:
+        cause = "budget de recherche épuisé" if budget else "il n'en existe pas d'autre"
+        Console(stderr=True).print(f"{trouves} emploi(s) du temps distinct(s) trouvé(s) sur {count} demandés ({cause}).")
+
+
+def resoudre_par_fenetres(medecins, vacances, nb_jours, max_gardes, taille_fenetre, format, sortie, verifier, solver):
+    """Résout fenêtre par fenêtre et affiche ou écrit chaque fenêtre dès qu'elle est terminée."""
+    from planning_medecin.fenetres import iterer_fenetres
+    from planning_medecin.flux import ecrire_planning_csv, ecrire_planning_ndjson
+
+    if solver != "glouton":
+        raise typer.BadParameter(f"--fenetre n'est disponible qu'avec le solveur glouton, reçu : {solver}")
+    if format not in ("table", "csv", "ndjson"):
+        raise typer.BadParameter(f"Format inconnu : {format} (attendu : table, csv ou ndjson)")
+    if verifier:
+        from planning_medecin.faisabilite import verifier_faisabilite
+
+        faisabilite = verifier_faisabilite(medecins, vacances, nb_jours, max_gardes)
+        if not faisabilite.faisable:
+            raise ValueError(faisabilite.message())
+    fenetres = iterer_fenetres(medecins, vacances, nb_jours, max_gardes, taille_fenetre)
+    if format == "table":
+        for fenetre in fenetres:
+            get_console().print(fenetre.to_rich())
+        return
+    ecrire = ecrire_planning_csv if format == "csv" else ecrire_planning_ndjson
+    gardes = (garde for fenetre in fenetres for garde in fenetre.gardes_par_jour())
+    if sortie == "-":
+        ecrire(gardes, sys.stdout)
+    else:
+        with open(sortie, "w", newline="") as file:
+            ecrire(gardes, file)
+
+
+def resoudre_par_lignes(medecins, lignes, vacances, nb_jours, max_gardes, format, sortie, workers):
+    """Planifie chaque ligne de garde, affiche la durée de chaque composante et affiche ou écrit le planning."""
+    from rich.console import Console
+    from rich.table import Table
+    from planning_medecin.lignes import planifier_par_lignes
+
+    if format not in ("table", "csv", "ndjson"):
+        raise typer.BadParameter(f"Format inconnu : {format} (attendu : table, csv ou ndjson)")
+    planning = planifier_par_lignes(medecins, lignes, vacances, nb_jours, max_gardes, workers=workers or None)
+    durees = Table(title="Composantes résolues")
+    for col in ["Lignes", "Médecins", "Durée (ms)"]:
+        durees.add_column(col)
+    for composante in planning.composantes:
+        durees.add_row(", ".join(composante.lignes), str(len(composante.medecins)), f"{composante.duree * 1000:.1f}")
+    Console(stderr=True).print(durees)
+    if format == "table":
+        get_console().print(planning.to_rich())
+        return
+    with (open(sortie, "w", newline="") if sortie != "-" else contextlib.nullcontext(sys.stdout)) as file:
+        if format == "csv":
+            writer = csv.writer(file)
+            writer.writerow(["jour", "ligne", "vacance", "medecin"])
+            writer.writerows(planning.gardes_par_jour())
+        else:
+            for jour, ligne, vacance, medecin in planning.gardes_par_jour():
+                file.write(json.dumps({"jour": jour, "ligne": ligne, "vacance": vacance, "medecin": medecin}, ensure_ascii=False) + "\n")
+
+
+def ecrire_planning(planning, format, sortie):
+    """
+    Affiche un planning déjà calculé en table, l'écrit en CSV ou NDJSON dans `sortie` ("-" : sortie standard),
+    ou l'enregistre au format colonne (npy) dans le dossier `sortie`.
+    """
+    from planning_medecin.flux import ecrire_planning_csv, ecrire_planning_ndjson
+
+    if format == "table":
+        display_planning(planning)
+        return
+    if format == "npy":
+        from planning_medecin.archive import enregistrer_planning
+
+        if sortie == "-":
+            raise typer.BadParameter("Le format npy s'enregistre dans un dossier : précisez --sortie DOSSIER")
+        enregistrer_planning(planning, sortie)
+        return
+    if format not in ("csv", "ndjson"):
+        raise typer.BadParameter(f"Format inconnu : {format} (attendu : table, csv, ndjson ou npy)")
+    ecrire = ecrire_planning_csv if format == "csv" else ecrire_planning_ndjson
+    if sortie == "-":
+        ecrire(planning.gardes_par_jour(), sys.stdout)
+    else:
+        with open(sortie, "w", newline="") as file:
+            ecrire(planning.gardes_par_jour(), file)
+
+
+def memoriser_gardes(gardes, enregistrer, position):
+    """Relaie les gardes produites en flux et transmet l'affectation complète à `enregistrer` une fois terminée."""
+    import numpy as np
+
+    affectation = []
+    for garde in gardes:
+        affectation.append(position[garde[2]])
+        yield garde
+    enregistrer(np.array(affectation, dtype=np.int64))
+
+
+@app.command("solve-batch")
+def solve_batch(motif: str, sortie: str = "resultats", workers: int = 0, solver: str = "glouton"):
+    """Résout en parallèle tous les fichiers de critères d'un dossier ou d'un motif glob."""
+    from planning_medecin.lot import lister_scenarios, resoudre_lot
+
+    chemins = lister_scenarios(motif)
+    if not chemins:
+        get_console().print(f"Aucun fichier de critères trouvé pour {motif}")
+        return
+    resume = resoudre_lot(chemins, sortie, workers or None, solver)
+    display_resume(resume)
+
+
+@app.command()
+def serve(hote: str = "127.0.0.1", port: int = 8765, workers: int = 0, delai_lot_ms: float = 2.0, cache: bool = True):
+    """
+    Lance le service local de planification (HTTP/JSON) avec un pool de processus gardé chaud.
+
+    POST /solve?solver=glouton&verifier=0 avec des critères au format de `demo` renvoie le planning en JSON ;
+    GET /sante renvoie les compteurs du service et du cache. Les requêtes simultanées sont regroupées en lots
+    (--delai-lot-ms) et le cache disque est partagé avec `solve` (sauf avec --no-cache).
+    Les commandes `solve --service http://{hote}:{port}` et l'application (PLANNING_MEDECIN_SERVICE) en sont clientes.
+    """
+    from planning_medecin.cache import dossier_cache_par_defaut
+    from planning_medecin.service import servir
+
+    get_console().print(f"Service de planification sur http://{hote}:{port} (Ctrl+C pour arrêter)")
+    servir(hote, port, workers or None, delai_lot_ms / 1000, dossier_cache_par_defaut() if cache else None)
 
 
 @app.command()
@@ -72,6 +557,8 @@ def appli():
 
 def display_criteria(medecins, vacances, nb_jours, max_gardes):
     """Affiche les critères de planification dans une table formatée."""
+    from rich.table import Table
+
     table = Table(title="Critères de la Planification des Gardes")
     table.add_column("Type", justify="right", style="cyan", no_wrap=True)
     table.add_column("Détails", style="magenta")
@@ -88,18 +575,27 @@ def display_criteria(medecins, vacances, nb_jours, max_gardes):
     table.add_row("Vacances", vacances_details)
     table.add_row("Nombre total de jours", str(nb_jours))
     table.add_row("Max gardes par médecin", str(max_gardes))
-    console.print(table)
+    get_console().print(table)
+
+
+def display_resume(resume):
+    """Affiche le résumé d'une résolution par lot dans une table formatée."""
+    from rich.table import Table
+
+    table = Table(title="Résolution par lot")
+    table.add_column("Fichier", style="cyan")
+    table.add_column("Statut")
+    table.add_column("Durée (s)", justify="right")
+    table.add_column("Sortie / erreur", style="magenta")
+    for ligne in resume:
+        statut = "[green]ok[/green]" if ligne["statut"] == "ok" else "[red]échec[/red]"
+        table.add_row(ligne["fichier"], statut, f"{ligne['duree']:.3f}", ligne.get("sortie", ligne.get("erreur", "")))
+    get_console().print(table)
 
 
-def display_planning(emploi_du_temps_df):
+def display_planning(planning):
     """Affiche le planning des gardes dans une table formatée."""
-    table = Table(title="Planning des Gardes")
-    columns = ["Jour"] + list(emploi_du_temps_df.columns)
-    for col in columns:
-        table.add_column(col)
-    for index, row in emploi_du_temps_df.iterrows():
-        table.add_row(index, *[str(val) for val in row.values])
-    console.print(table)
+    get_console().print(planning.to_rich())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,223 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from planning_medecin.lib_hp import (
+    Medecin,
+    PeriodeVacance,
+    MatriceDisponibilites,
+    Planning,
+    _verifier_medecins,
+)
+from planning_medecin.calendrier import CalendrierVacances
+
+
+@dataclass
+class AjoutMedecin:
+    """Un nouveau médecin rejoint le service."""
+    medecin: Medecin
+
+
+@dataclass
+class RetraitMedecin:
+    """Un médecin quitte le service : toutes ses gardes sont à réattribuer."""
+    id: str
+
+
+@dataclass
+class AjoutDisponibilites:
+    """Un médecin devient disponible des jours supplémentaires."""
+    id: str
+    jours: Set[int] = field(default_factory=set)
+
+
+@dataclass
+class RetraitDisponibilites:
+    """Un médecin n'est plus disponible certains jours (arrêt maladie, échange...)."""
+    id: str
+    jours: Set[int] = field(default_factory=set)
+
+
+@dataclass
+class AjoutVacance:
+    """Une nouvelle période de vacances est déclarée."""
+    vacance: PeriodeVacance
+
+
+Changement = Union[AjoutMedecin, RetraitMedecin, AjoutDisponibilites, RetraitDisponibilites, AjoutVacance]
+
+
+def _appliquer(
+    medecins: List[Medecin],
+    vacances: List[PeriodeVacance],
+    changements: List[Changement]
+) -> Tuple[List[Medecin], List[PeriodeVacance]]:
+    """Renvoie de nouvelles listes de médecins et de vacances, sans modifier celles du planning d'origine."""
+    disponibilites: Dict[str, Set[int]] = {med.id: set(med.disponibilites) for med in medecins}
+    vacances = list(vacances)
+    for changement in changements:
+        if isinstance(changement, AjoutMedecin):
+            if changement.medecin.id in disponibilites:
+                raise ValueError(f"Le médecin {changement.medecin.id} fait déjà partie du planning")
+            disponibilites[changement.medecin.id] = set(changement.medecin.disponibilites)
+        elif isinstance(changement, AjoutVacance):
+            vacances.append(changement.vacance)
+        elif changement.id not in disponibilites:
+            raise ValueError(f"Médecin inconnu : {changement.id}")
+        elif isinstance(changement, RetraitMedecin):
+            del disponibilites[changement.id]
+        elif isinstance(changement, AjoutDisponibilites):
+            disponibilites[changement.id] |= set(changement.jours)
+        elif isinstance(changement, RetraitDisponibilites):
+            disponibilites[changement.id] -= set(changement.jours)
+        else:
+            raise TypeError(f"Changement non pris en charge : {type(changement).__name__}")
+    # Un médecin qui n'a plus aucune disponibilité est retiré du planning.
+    return [Medecin(id, jours) for id, jours in disponibilites.items() if jours], vacances
+
+
+class _Reparation:
+    """État courant d'une affectation en cours de réparation : gardes de chaque médecin et jour pris par période."""
+
+    def __init__(self, index: MatriceDisponibilites, noms_vacances: List[str], affectation: np.ndarray, max_gardes: int):
+        self.index = index
+        self.max_gardes = max_gardes
+        self.vacance = noms_vacances
+        self.affectation = affectation
+        self.jours_du_medecin: List[Set[int]] = [set() for _ in index.ids]
+        self.jour_de_vacance: Dict[Tuple[int, str], int] = {}
+        for jour, medecin in enumerate(affectation.tolist()):
+            if medecin >= 0:
+                self._ajouter(jour, medecin)
+
+    def _ajouter(self, jour: int, medecin: int) -> None:
+        self.affectation[jour] = medecin
+        self.jours_du_medecin[medecin].add(jour)
+        if self.vacance[jour]:
+            self.jour_de_vacance[(medecin, self.vacance[jour])] = jour
+
+    def liberer(self, jour: int) -> None:
+        medecin = int(self.affectation[jour])
+        self.affectation[jour] = -1
+        self.jours_du_medecin[medecin].discard(jour)
+        if self.vacance[jour]:
+            del self.jour_de_vacance[(medecin, self.vacance[jour])]
+
+    def reparer(self, jour_libre: int) -> bool:
+        """
+        Couvre `jour_libre` par la plus courte chaîne de réaffectations (parcours en largeur).
+
+        La chaîne est un chemin augmentant du réseau de flot de `verifier_faisabilite` (médecin → (médecin, période)
+        → jour) : un médecin disponible prend le jour directement s'il lui reste des gardes et n'a pas déjà de garde
+        dans la même période de vacances ; sinon il libère son jour de la même période s'il en a un, ou l'un de ses
+        jours s'il n'a plus de gardes, et ce jour devient à son tour le jour à couvrir. Chaque noeud du réseau (jour,
+        médecin, couple médecin et période) n'est visité qu'une fois, ce qui suffit à trouver une chaîne dès qu'il
+        en existe une : le jour ne reste libre que si aucun planning complet n'existe.
+        """
+        parent: Dict[Tuple, Optional[Tuple]] = {("jour", jour_libre): None}
+        file = deque([("jour", jour_libre)])
+        while file:
+            noeud = file.popleft()
+            for suivant in self._voisins(noeud):
+                if suivant in parent:
+                    continue
+                parent[suivant] = noeud
+                if suivant[0] == "medecin" and len(self.jours_du_medecin[suivant[1]]) < self.max_gardes:
+                    self._appliquer_chaine(suivant, parent)
+                    return True
+                file.append(suivant)
+        return False
+
+    def _voisins(self, noeud: Tuple) -> List[Tuple]:
+        """Noeuds d'où une garde peut être reportée sur `noeud` dans le réseau résiduel."""
+        if noeud[0] == "jour":
+            jour = noeud[1]
+            nom = self.vacance[jour]
+            occupant = int(self.affectation[jour])
+            candidats = sorted(self.index.medecins_disponibles(jour + 1).tolist(), key=lambda i: len(self.jours_du_medecin[i]))
+            return [("periode", medecin, nom) if nom else ("medecin", medecin) for medecin in candidats if medecin != occupant]
+        if noeud[0] == "periode":
+            _, medecin, nom = noeud
+            conflit = self.jour_de_vacance.get((medecin, nom))
+            return [("medecin", medecin)] if conflit is None else [("jour", conflit)]
+        return [("jour", jour) for jour in sorted(self.jours_du_medecin[noeud[1]])]
+
+    def _appliquer_chaine(self, noeud: Tuple, parent: Dict[Tuple, Optional[Tuple]]) -> None:
+        """
+        Applique la chaîne de `noeud` (un médecin à qui il reste des gardes) jusqu'au jour libre : chaque jour de la
+        chaîne est repris par le médecin qui le précède, après que celui-ci a libéré le jour suivant.
+        """
+        while parent[noeud] is not None:
+            suivant = parent[noeud]
+            if suivant[0] == "jour" and noeud[0] != "jour":
+                jour = suivant[1]
+                if self.affectation[jour] >= 0:
+                    self.liberer(jour)
+                self._ajouter(jour, noeud[1])
+            noeud = suivant
+
+
+def ajuster_planning(
+    planning: Planning,
+    changements: List[Changement]
+) -> Tuple[Planning, List[Tuple[int, Optional[str], str]]]:
+    """
+    Répare un planning existant après des changements, en ne modifiant que les jours concernés.
+
+    Les gardes devenues invalides (médecin retiré ou indisponible, deuxième garde d'un médecin dans une nouvelle
+    période de vacances) sont libérées, puis chaque jour libre est recouvert par la plus courte chaîne de
+    réaffectations possible : le reste du planning n'est pas touché.
+
+    ## Parameters:
+        planning (Planning): Le planning à ajuster, tel que renvoyé par `planifier`.
+        changements (List[Changement]): Les changements à appliquer, dans l'ordre : `AjoutMedecin`, `RetraitMedecin`,
+            `AjoutDisponibilites`, `RetraitDisponibilites` ou `AjoutVacance`.
+
+    ## Raises:
+        ValueError: Si un changement désigne un médecin inconnu ou ajoute un médecin déjà présent.
+        ValueError: Si certains jours ne peuvent être recouverts par aucune chaîne de réaffectations.
+
+    ## Returns:
+        Tuple[Planning, List[Tuple[int, Optional[str], str]]]: Le nouveau planning et les cellules modifiées,
+        sous forme de triplets (jour, ancien médecin ou None s'il a été retiré, nouveau médecin).
+
+    ## Example:
+        >>> planning = planifier([Medecin("A", {1, 2}), Medecin("B", {1, 2})], [PeriodeVacance("Noel", 1, 1)], 2, 1)
+        >>> nouveau, modifications = ajuster_planning(planning, [RetraitDisponibilites("A", {1})])
+        >>> modifications
+        [(1, 'A', 'B'), (2, 'B', 'A')]
+    """
+    medecins, vacances = _appliquer(planning.medecins, planning.vacances, changements)
+    _verifier_medecins(medecins)
+    noms_vacances = CalendrierVacances(vacances, planning.nb_jours).noms_par_jour()
+    index = MatriceDisponibilites.depuis_medecins(medecins, planning.nb_jours)
+    position = {med.id: i for i, med in enumerate(medecins)}
+
+    anciens = [planning.medecins[i].id for i in planning.affectation.tolist()]
+    affectation = np.array([position.get(id, -1) for id in anciens], dtype=np.int64)
+    valides = affectation >= 0
+    affectation[valides & ~index.matrice[np.maximum(affectation, 0), np.arange(planning.nb_jours)]] = -1
+
+    # Une seule garde par médecin et par période : seule la première est conservée.
+    vues: Set[Tuple[int, str]] = set()
+    for jour, medecin in enumerate(affectation.tolist()):
+        nom = noms_vacances[jour]
+        if medecin >= 0 and nom:
+            if (medecin, nom) in vues:
+                affectation[jour] = -1
+            vues.add((medecin, nom))
+
+    reparation = _Reparation(index, noms_vacances, affectation, planning.max_gardes)
+    impossibles = [jour + 1 for jour in np.flatnonzero(affectation < 0).tolist() if not reparation.reparer(jour)]
+    if impossibles:
+        raise ValueError(f"Impossible de réparer le planning : aucun médecin ne peut couvrir les jours {impossibles}.")
+
+    nouveau = Planning(medecins, vacances, planning.nb_jours, planning.max_gardes, reparation.affectation)
+    modifications = [
+        (jour + 1, ancien if ancien in position else None, medecins[medecin].id)
+        for jour, (ancien, medecin) in enumerate(zip(anciens, reparation.affectation.tolist()))
+        if ancien != medecins[medecin].id
+    ]
+    return nouveau, modifications
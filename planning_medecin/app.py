@@ -1,5 +1,18 @@
+import os
+
 import streamlit as st
-from planning_medecin.lib_hp import Medecin, PeriodeVacance, trouver_emploi_du_temps
+from planning_medecin.cache import CacheSolutions, cle_canonique, dossier_cache_par_defaut
+from planning_medecin.lib_hp import Medecin, PeriodeVacance, iter_emplois_du_temps
+from planning_medecin.solveur_exact import StatistiquesRecherche
+from planning_medecin.minimisation import minimiser_max_gardes
+from planning_medecin.service import planifier_via_service
+
+
+@st.cache_resource
+def obtenir_cache():
+    """Cache de plannings partagé par toutes les sessions et toutes les réexécutions du script."""
+    return CacheSolutions(dossier=dossier_cache_par_defaut())
+
 
 st.title("Planification des gardes de médecins")
 
@@ -23,11 +36,60 @@ for i in range(int(nb_vacances)):
         duree_vacance = st.number_input(f"Durée de {nom_vacance} (en jours)", min_value=1, value=5, step=1)
         vacances.append(PeriodeVacance(nom_vacance, debut_vacance, duree_vacance))
 
-max_gardes = st.number_input("Nombre maximal de gardes par médecin pendant la période", min_value=1, value=5, step=1)
+minimiser = st.checkbox("Calculer le plus petit nombre maximal de gardes par médecin")
+if not minimiser:
+    max_gardes = st.number_input("Nombre maximal de gardes par médecin pendant la période", min_value=1, value=5, step=1)
 
 if st.button('Générer le planning'):
-    planning = trouver_emploi_du_temps(medecins, vacances, nb_jours, max_gardes)
-    st.dataframe(planning)
+    if minimiser:
+        resultat = minimiser_max_gardes(medecins, vacances, nb_jours)
+        st.dataframe(resultat.planning.to_dataframe())
+        st.caption(
+            f"Plafond minimal : {resultat.max_gardes} gardes par médecin ; "
+            f"charge de {resultat.charge_min} à {resultat.charge_max} gardes (écart {resultat.ecart})"
+        )
+    else:
+        # Avec PLANNING_MEDECIN_SERVICE, le planning est calculé par le service `serve` s'il répond.
+        planning, service = None, os.environ.get("PLANNING_MEDECIN_SERVICE")
+        if service:
+            try:
+                planning = planifier_via_service(service, medecins, vacances, nb_jours, max_gardes)
+            except OSError:
+                st.caption(f"Service {service} injoignable, résolution locale.")
+        if planning is not None:
+            st.dataframe(planning.to_dataframe())
+            st.caption(f"Planning calculé par le service {service}")
+        else:
+            cache = obtenir_cache()
+            planning = cache.planifier(medecins, vacances, nb_jours, max_gardes)
+            st.dataframe(planning.to_dataframe())
+            st.caption(f"Cache : {cache.succes_memoire + cache.succes_disque} plannings réutilisés, {cache.defauts} calculés")
+
+if not minimiser and st.checkbox("Comparer plusieurs plannings possibles"):
+    # Le générateur et les plannings déjà produits sont conservés entre deux réexécutions du script :
+    # chaque clic sur « Planning suivant » ne calcule qu'un planning de plus.
+    cle = cle_canonique(medecins, vacances, nb_jours, max_gardes)
+    if st.session_state.get("cle_alternatives") != cle:
+        st.session_state.cle_alternatives = cle
+        st.session_state.alternatives = []
+        st.session_state.recherche = StatistiquesRecherche()
+        st.session_state.generateur = iter_emplois_du_temps(
+            medecins, vacances, nb_jours, max_gardes, symetries=True, statistiques=st.session_state.recherche
+        )
+    alternatives, recherche = st.session_state.alternatives, st.session_state.recherche
+    if st.button("Planning suivant") or not alternatives:
+        suivant = next(st.session_state.generateur, None)
+        if suivant is not None:
+            alternatives.append(suivant)
+        elif recherche.statut == "budget":
+            st.info(f"Budget de recherche épuisé ({recherche.noeuds} noeuds, {recherche.duree:.1f} s) : d'autres plannings peuvent exister.")
+        elif alternatives:
+            st.info("Tous les plannings distincts ont été affichés.")
+    if alternatives:
+        numero = st.number_input("Planning n°", min_value=1, max_value=len(alternatives), value=len(alternatives), step=1)
+        st.dataframe(alternatives[int(numero) - 1].to_dataframe())
+    elif recherche.statut != "budget":
+        st.warning("Aucun emploi du temps ne respecte les contraintes.")
 
 
 
@@ -0,0 +1,164 @@
+import ast
+import json
+import mmap
+import os
+import sys
+from collections import namedtuple
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+from planning_medecin.calendrier import CalendrierVacances
+
+if TYPE_CHECKING:
+    from planning_medecin.lib_hp import Planning
+
+# Une archive de planning est un dossier : l'affectation jour → indice du médecin en colonne `.npy` (int32) et
+# les métadonnées (médecins, vacances, paramètres) en JSON. La lecture n'importe ni numpy ni pandas.
+FORMAT_ARCHIVE = 1
+FICHIER_AFFECTATION = "affectation.npy"
+FICHIER_METADONNEES = "planning.json"
+
+Periode = namedtuple("Periode", ["nom", "debut", "duree"])
+
+
+def est_archive(chemin: str) -> bool:
+    """Indique si `chemin` est un dossier d'archive de planning écrit par `enregistrer_planning`."""
+    return os.path.isfile(os.path.join(chemin, FICHIER_METADONNEES))
+
+
+def enregistrer_planning(planning: "Planning", dossier: str) -> None:
+    """
+    Enregistre un planning dans le dossier `dossier` (créé si besoin) au format colonne, lisible par `ouvrir_planning`.
+
+    ## Example:
+        >>> enregistrer_planning(planifier(medecins, vacances, 3650, 400), "planning_10ans")
+        >>> os.listdir("planning_10ans")
+        ['affectation.npy', 'planning.json']
+    """
+    import numpy as np
+
+    os.makedirs(dossier, exist_ok=True)
+    np.save(os.path.join(dossier, FICHIER_AFFECTATION), np.ascontiguousarray(planning.affectation, dtype="<i4"))
+    metadonnees = {
+        "format": FORMAT_ARCHIVE,
+        "nb_jours": planning.nb_jours,
+        "max_gardes": planning.max_gardes,
+        "medecins": [med.id for med in planning.medecins],
+        "vacances": [[vac.nom, vac.debut, vac.duree] for vac in planning.vacances],
+    }
+    with open(os.path.join(dossier, FICHIER_METADONNEES), "w") as file:
+        json.dump(metadonnees, file, ensure_ascii=False)
+
+
+def _projeter_npy(chemin: str) -> Tuple[mmap.mmap, memoryview]:
+    """
+    Projette en mémoire un fichier `.npy` d'entiers 32 bits petit-boutistes à une dimension, sans numpy :
+    l'en-tête est analysé (format .npy version 1 à 3) et les données sont exposées par une `memoryview`.
+    À une dimension, l'ordre C et l'ordre Fortran décrivent les mêmes octets : les deux sont acceptés.
+    """
+    with open(chemin, "rb") as file:
+        if os.fstat(file.fileno()).st_size < 10:
+            raise ValueError(f"{chemin} n'est pas un fichier .npy")
+        projection = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if projection[:6] != b"\x93NUMPY":
+        projection.close()
+        raise ValueError(f"{chemin} n'est pas un fichier .npy")
+    version = projection[6]
+    taille_longueur = 2 if version == 1 else 4
+    longueur = int.from_bytes(projection[8:8 + taille_longueur], "little")
+    debut = 8 + taille_longueur + longueur
+    try:
+        entete = ast.literal_eval(projection[8 + taille_longueur:debut].decode("latin1"))
+        descr, forme = entete["descr"], tuple(entete["shape"])
+    except (SyntaxError, ValueError, TypeError, KeyError):
+        projection.close()
+        raise ValueError(f"En-tête .npy illisible pour {chemin}") from None
+    if descr != "<i4" or len(forme) != 1 or sys.byteorder != "little":
+        projection.close()
+        raise ValueError(f"Format inattendu pour {chemin} : {entete}")
+    if len(projection) < debut + 4 * forme[0]:
+        taille = len(projection)
+        projection.close()
+        raise ValueError(f"{chemin} est tronqué : {taille} octets pour {forme[0]} entiers après un en-tête de {debut} octets")
+    donnees = memoryview(projection)[debut:debut + 4 * forme[0]].cast("i")
+    return projection, donnees
+
+
+class PlanningArchive:
+    """
+    Planning relu depuis une archive : l'affectation est projetée en mémoire (mmap), si bien qu'ouvrir l'archive
+    et afficher une plage de jours ne lit que les pages concernées, quelle que soit la longueur de l'horizon.
+
+    ## Attributes:
+        ids (List[str]): Identifiants des médecins ; `affectation` référence leurs positions.
+        vacances (List[Periode]): Les périodes de vacances (nom, debut, duree).
+        nb_jours (int): Le nombre total de jours planifiés.
+        max_gardes (int): Le nombre maximum de gardes par médecin utilisé pour la planification.
+        affectation (memoryview): Entiers de longueur nb_jours ; l'élément j est l'indice du médecin de garde
+            le jour j + 1 (`np.asarray(archive.affectation)` en donne une vue numpy sans copie).
+
+    ## Example:
+        >>> with ouvrir_planning("planning_10ans") as archive:
+        ...     list(archive.gardes_par_jour(1800, 1801))
+        [(1800, '', 'Dr. SENGEL'), (1801, 'Noel', 'Dr. VIDAL')]
+    """
+
+    def __init__(self, dossier: str):
+        with open(os.path.join(dossier, FICHIER_METADONNEES), "r") as file:
+            metadonnees = json.load(file)
+        if metadonnees.get("format") != FORMAT_ARCHIVE:
+            raise ValueError(f"Version d'archive non prise en charge : {metadonnees.get('format')}")
+        self.ids: List[str] = metadonnees["medecins"]
+        self.vacances: List[Periode] = [Periode(*vac) for vac in metadonnees["vacances"]]
+        self.nb_jours: int = metadonnees["nb_jours"]
+        self.max_gardes: int = metadonnees["max_gardes"]
+        self._projection, self.affectation = _projeter_npy(os.path.join(dossier, FICHIER_AFFECTATION))
+        if len(self.affectation) != self.nb_jours:
+            nb_jours_ecrits = len(self.affectation)
+            self.fermer()
+            raise ValueError(f"L'archive {dossier} est incomplète : {nb_jours_ecrits} jours sur {self.nb_jours}")
+        self._calendrier = CalendrierVacances(self.vacances, self.nb_jours)
+
+    def medecin_de_garde(self, jour: int) -> str:
+        """Identifiant du médecin de garde le jour donné (numéroté à partir de 1)."""
+        if not 1 <= jour <= self.nb_jours:
+            raise IndexError(f"Jour {jour} hors de l'horizon (1 à {self.nb_jours})")
+        return self.ids[self.affectation[jour - 1]]
+
+    def gardes_par_jour(self, debut: int = 1, fin: Optional[int] = None) -> Iterator[Tuple[int, str, str]]:
+        """Génère les triplets (jour, vacance, médecin) des jours `debut` à `fin` inclus (par défaut, tout l'horizon)."""
+        for segment_debut, segment_fin, nom in self._calendrier.segments(debut, fin):
+            for jour, idx in enumerate(self.affectation[segment_debut - 1:segment_fin], start=segment_debut):
+                yield jour, nom, self.ids[idx]
+
+    def to_rich(self, debut: int = 1, fin: Optional[int] = None):
+        """Table rich (jour, vacance, médecin) des jours `debut` à `fin` inclus."""
+        from rich.table import Table
+
+        debut, fin = max(debut, 1), self.nb_jours if fin is None else min(fin, self.nb_jours)
+        table = Table(title=f"Planning des Gardes : jours {debut} à {fin} sur {self.nb_jours}")
+        for col in ["Jour", "Vacance", "Médecin"]:
+            table.add_column(col)
+        for jour, vacance, medecin in self.gardes_par_jour(debut, fin):
+            table.add_row(str(jour), vacance, medecin)
+        return table
+
+    def fermer(self) -> None:
+        self.affectation.release()
+        self._projection.close()
+
+    def __enter__(self) -> "PlanningArchive":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+
+def ouvrir_planning(dossier: str) -> PlanningArchive:
+    """
+    Ouvre une archive écrite par `enregistrer_planning` (ou `solve --format npy --sortie DOSSIER`) sans la charger.
+
+    ## Raises:
+        OSError: Si le dossier ou l'un de ses fichiers est absent.
+        ValueError: Si l'archive est d'une autre version, incomplète ou d'un format inattendu.
+    """
+    return PlanningArchive(dossier)
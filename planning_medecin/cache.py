@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from planning_medecin.lib_hp import Medecin, PeriodeVacance, Planning, _aplatir_disponibilites, planifier
+
+# Version du format des entrées mémorisées, incluse dans les clés : à incrémenter quand les tableaux des fichiers
+# .npz changent de structure ou que les solveurs changent de résultat, pour que les anciennes entrées du cache
+# disque soient ignorées.
+FORMAT_CACHE = 4
+
+# Après un dépassement de `taille_disque_max`, le niveau disque est ramené à cette fraction de la limite, pour que
+# les écritures suivantes ne déclenchent pas chacune un nouveau parcours du dossier.
+_MARGE_EVICTION = 0.9
+
+
+def cle_canonique(
+    medecins: List[Medecin],
+    vacances: List[PeriodeVacance],
+    nb_jours: int,
+    max_gardes: int,
+    **options
+) -> str:
+    """
+    Empreinte SHA-256 d'un scénario : deux scénarios de même empreinte ont le même planning.
+
+    Les disponibilités sont triées, mais l'ordre des médecins et des vacances est conservé : il départage
+    les médecins à charge égale et détermine la période retenue pour les jours de vacances qui se chevauchent.
+
+    ## Example:
+        >>> cle_canonique([Medecin("Dr. VIDAL", {2, 1})], [], 2, 1) == cle_canonique([Medecin("Dr. VIDAL", {1, 2})], [], 2, 1)
+        True
+    """
+    contenu = {
+        "medecins": [[med.id, sorted(med.disponibilites)] for med in medecins],
+        "vacances": [[vac.nom, vac.debut, vac.duree] for vac in vacances],
+        "nb_jours": nb_jours,
+        "max_gardes": max_gardes,
+        "options": options,
+        "format": FORMAT_CACHE,
+    }
+    texte = json.dumps(contenu, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(texte.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class EchecMemorise:
+    """Erreur mémorisée pour un scénario infaisable, relevée à chaque accès."""
+    message: str
+
+
+def _vers_tableaux(valeur: Union[Planning, EchecMemorise]) -> Dict[str, np.ndarray]:
+    """Tableaux d'une entrée du niveau disque : l'affectation et le scénario, ou le message d'un échec."""
+    if isinstance(valeur, EchecMemorise):
+        return {"echec": np.array(valeur.message)}
+    lignes, jours = _aplatir_disponibilites(valeur.medecins)
+    return {
+        "affectation": np.asarray(valeur.affectation, dtype=np.int64),
+        "ids": np.array([med.id for med in valeur.medecins], dtype=str),
+        "nb_disponibilites": np.bincount(lignes, minlength=len(valeur.medecins)),
+        "jours": jours,
+        "noms_vacances": np.array([vac.nom for vac in valeur.vacances], dtype=str),
+        "vacances": np.array([[vac.debut, vac.duree] for vac in valeur.vacances], dtype=np.int64).reshape(-1, 2),
+        "parametres": np.array([valeur.nb_jours, valeur.max_gardes], dtype=np.int64),
+    }
+
+
+def _depuis_tableaux(tableaux) -> Union[Planning, EchecMemorise]:
+    """Reconstruit l'entrée écrite par `_vers_tableaux` (les statistiques du solveur ne sont pas conservées)."""
+    if "echec" in tableaux.files:
+        return EchecMemorise(str(tableaux["echec"]))
+    decoupes = np.split(tableaux["jours"], np.cumsum(tableaux["nb_disponibilites"])[:-1])
+    medecins = [Medecin(id, set(jours.tolist())) for id, jours in zip(tableaux["ids"].tolist(), decoupes)]
+    vacances = [
+        PeriodeVacance(nom, debut, duree)
+        for nom, (debut, duree) in zip(tableaux["noms_vacances"].tolist(), tableaux["vacances"].tolist())
+    ]
+    nb_jours, max_gardes = tableaux["parametres"].tolist()
+    return Planning(medecins, vacances, nb_jours, max_gardes, tableaux["affectation"])
+
+
+class CacheSolutions:
+    """
+    Cache des plannings résolus, indexé par `cle_canonique`, avec un niveau mémoire et un niveau disque optionnel.
+
+    Le niveau mémoire est un LRU de `taille_memoire` entrées. Le niveau disque (si `dossier` est donné) stocke un fichier
+    .npz par scénario (affectation et scénario en tableaux NumPy, relus sans pickle : un fichier du dossier ne peut pas
+    exécuter de code) et tient le compte des octets écrits ; quand ce compte dépasse `taille_disque_max`, le dossier
+    est parcouru et les entrées les moins récemment utilisées sont supprimées jusqu'à 90 % de la limite. Le compte
+    est mesuré au premier écrit puis recalé à chaque éviction, les autres processus pouvant écrire dans le même dossier.
+    Les statistiques du solveur (`Planning.statistiques`) ne sont conservées que dans le niveau mémoire.
+    Les scénarios sur lesquels l'algorithme glouton échoue sont aussi mémorisés : leur erreur est relevée à nouveau
+    sans recalcul (les échecs du solveur exact, qui peuvent dépendre de son budget de temps, ne le sont pas).
+
+    ## Attributes:
+        succes_memoire (int): Nombre de plannings trouvés dans le niveau mémoire.
+        succes_disque (int): Nombre de plannings trouvés dans le niveau disque.
+        defauts (int): Nombre de défauts de cache (scénarios absents, donc à résoudre).
+
+    ## Example:
+        >>> cache = CacheSolutions(dossier=".cache_planning")
+        >>> planning = cache.planifier(medecins, vacances, 10, 3)
+        >>> planning = cache.planifier(medecins, vacances, 10, 3)
+        >>> cache.succes_memoire, cache.defauts
+        (1, 1)
+    """
+
+    def __init__(self, taille_memoire: int = 128, dossier: Optional[str] = None, taille_disque_max: int = 100 * 1024 * 1024):
+        self.taille_memoire = taille_memoire
+        self.dossier = dossier
+        self.taille_disque_max = taille_disque_max
+        self._memoire: "OrderedDict[str, object]" = OrderedDict()
+        self.succes_memoire = 0
+        self.succes_disque = 0
+        self.defauts = 0
+        self._octets_disque: Optional[int] = None
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+
+    def _chemin(self, cle: str) -> str:
+        return os.path.join(self.dossier, cle + ".npz")
+
+    def _memoriser(self, cle: str, valeur: object) -> None:
+        self._memoire[cle] = valeur
+        self._memoire.move_to_end(cle)
+        while len(self._memoire) > self.taille_memoire:
+            self._memoire.popitem(last=False)
+
+    def lire(self, cle: str) -> Optional[object]:
+        """Renvoie le planning (ou l'échec) mémorisé pour `cle`, ou None ; met à jour les compteurs."""
+        if cle in self._memoire:
+            self._memoire.move_to_end(cle)
+            self.succes_memoire += 1
+            return self._memoire[cle]
+        if self.dossier:
+            chemin = self._chemin(cle)
+            try:
+                with np.load(chemin, allow_pickle=False) as tableaux:
+                    valeur = _depuis_tableaux(tableaux)
+            except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+                pass
+            else:
+                os.utime(chemin)
+                self.succes_disque += 1
+                self._memoriser(cle, valeur)
+                return valeur
+        self.defauts += 1
+        return None
+
+    def ecrire(self, cle: str, valeur: object) -> None:
+        """Mémorise `valeur` dans les deux niveaux, puis applique la limite de taille du niveau disque."""
+        self._memoriser(cle, valeur)
+        if not self.dossier:
+            return
+        descripteur, temporaire = tempfile.mkstemp(dir=self.dossier, suffix=".tmp")
+        with os.fdopen(descripteur, "wb") as file:
+            np.savez(file, **_vers_tableaux(valeur))
+            taille = file.tell()
+        os.replace(temporaire, self._chemin(cle))
+        if self._octets_disque is None:
+            self._octets_disque = sum(taille for _, taille, _ in self._entrees_disque())
+        else:
+            self._octets_disque += taille
+        if self._octets_disque > self.taille_disque_max:
+            self._evincer()
+
+    def _entrees_disque(self) -> List[tuple]:
+        """(date de dernier accès, taille, chemin) de chaque entrée du niveau disque."""
+        fichiers = []
+        for entree in os.scandir(self.dossier):
+            if entree.name.endswith(".npz"):
+                info = entree.stat()
+                fichiers.append((info.st_mtime, info.st_size, entree.path))
+        return fichiers
+
+    def _evincer(self) -> None:
+        fichiers = self._entrees_disque()
+        total = sum(taille for _, taille, _ in fichiers)
+        for _, taille, chemin in sorted(fichiers):
+            if total <= self.taille_disque_max * _MARGE_EVICTION:
+                break
+            try:
+                os.remove(chemin)
+            except FileNotFoundError:  # déjà supprimée par un autre processus
+                pass
+            total -= taille
+        self._octets_disque = total
+
+    def planifier(
+        self,
+        medecins: List[Medecin],
+        vacances: List[PeriodeVacance],
+        nb_jours: int,
+        max_gardes: int,
+        **options
+    ) -> Planning:
+        """`planifier` avec cache : un scénario déjà résolu (ou déjà en échec) est renvoyé sans calcul."""
+        cle = cle_canonique(medecins, vacances, nb_jours, max_gardes, **options)
+        valeur = self.lire(cle)
+        if valeur is None:
+            try:
+                valeur = planifier(medecins, vacances, nb_jours, max_gardes, **options)
+            except ValueError as erreur:
+                if options.get("solver", "glouton") != "glouton":
+                    raise
+                valeur = EchecMemorise(str(erreur))
+            self.ecrire(cle, valeur)
+        if isinstance(valeur, EchecMemorise):
+            raise ValueError(valeur.message)
+        return valeur
+
+
+def dossier_cache_par_defaut() -> str:
+    """Dossier du cache disque partagé : $PLANNING_MEDECIN_CACHE, ou ~/.cache/planning_medecin."""
+    return os.environ.get("PLANNING_MEDECIN_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "planning_medecin"))
@@ -0,0 +1,129 @@
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from planning_medecin.lib_hp import PeriodeVacance
+
+
+class CalendrierVacances:
+    """
+    Calendrier des vacances sur l'horizon [1, nb_jours], représenté par des segments triés plutôt que jour par jour.
+
+    Les bornes des périodes découpent l'horizon en segments élémentaires, couverts chacun par le même ensemble
+    de périodes ; la période d'un jour est retrouvée par recherche dichotomique, en O(log V) pour V périodes,
+    et la mémoire ne dépend que du nombre de périodes, pas de la longueur de l'horizon.
+
+    Les périodes peuvent se chevaucher : `vacances_du_jour` les renvoie toutes. Un jour de garde ne relève
+    cependant que d'une seule période pour la contrainte « une garde par médecin et par période » : celle
+    déclarée en dernier, comme dans `jours_de_gardes`. Les jours hors de l'horizon sont ignorés et la liste
+    des périodes peut être vide.
+
+    ## Attributes:
+        vacances (List[PeriodeVacance]): Les périodes, dans l'ordre de déclaration.
+        nb_jours (int): Le nombre de jours de l'horizon.
+
+    ## Raises:
+        ValueError: Si le nombre de jours est inférieur ou égal à zéro ou est infini.
+
+    ## Example:
+        >>> calendrier = CalendrierVacances([PeriodeVacance("Noel", 3, 4), PeriodeVacance("Gel", 5, 4)], 10)
+        >>> list(calendrier.segments())
+        [(1, 2, ''), (3, 4, 'Noel'), (5, 8, 'Gel'), (9, 10, '')]
+        >>> [vac.nom for vac in calendrier.vacances_du_jour(6)]
+        ['Noel', 'Gel']
+        >>> calendrier.nom_du_jour(6)
+        'Gel'
+    """
+    __slots__ = ("vacances", "nb_jours", "_debuts", "_fins", "_couvrantes")
+
+    def __init__(self, vacances: List["PeriodeVacance"], nb_jours: int):
+        if nb_jours <= 0 or nb_jours == float("inf"):
+            raise ValueError(f"Le nombre de jours doit être un entier positif, reçu: {nb_jours}")
+        self.vacances = list(vacances)
+        self.nb_jours = nb_jours
+
+        # Événements (jour, +1/-1, période) ramenés à l'horizon ; une période vide ou hors horizon n'en produit pas.
+        evenements: List[Tuple[int, int, int]] = []
+        for numero, vacance in enumerate(self.vacances):
+            debut, fin = max(vacance.debut, 1), min(vacance.debut + vacance.duree - 1, nb_jours)
+            if debut <= fin:
+                evenements.append((debut, 1, numero))
+                evenements.append((fin + 1, -1, numero))
+        evenements.sort()
+
+        self._debuts: List[int] = [1]
+        self._fins: List[int] = []
+        self._couvrantes: List[Tuple[int, ...]] = [()]
+        actives: Dict[int, None] = {}
+        for jour, sens, numero in evenements:
+            if sens > 0:
+                actives[numero] = None
+            else:
+                del actives[numero]
+            if jour > nb_jours:
+                continue
+            couvrantes = tuple(sorted(actives))
+            if jour == self._debuts[-1]:
+                self._couvrantes[-1] = couvrantes
+            else:
+                self._fins.append(jour - 1)
+                self._debuts.append(jour)
+                self._couvrantes.append(couvrantes)
+        self._fins.append(nb_jours)
+
+    def _segment(self, jour: int) -> Optional[int]:
+        if not 1 <= jour <= self.nb_jours:
+            return None
+        return bisect_right(self._debuts, jour) - 1
+
+    def vacances_du_jour(self, jour: int) -> List["PeriodeVacance"]:
+        """Toutes les périodes couvrant `jour`, dans l'ordre de déclaration."""
+        segment = self._segment(jour)
+        return [] if segment is None else [self.vacances[numero] for numero in self._couvrantes[segment]]
+
+    def vacance_du_jour(self, jour: int) -> Optional["PeriodeVacance"]:
+        """La période dont relève la garde du jour `jour` (la dernière déclarée qui le couvre), ou None."""
+        segment = self._segment(jour)
+        if segment is None or not self._couvrantes[segment]:
+            return None
+        return self.vacances[self._couvrantes[segment][-1]]
+
+    def nom_du_jour(self, jour: int) -> str:
+        """Le nom de la période dont relève `jour`, ou une chaîne vide si ce n'est pas un jour de vacances."""
+        vacance = self.vacance_du_jour(jour)
+        return vacance.nom if vacance is not None else ""
+
+    def segments(self, debut: int = 1, fin: Optional[int] = None) -> Iterator[Tuple[int, int, str]]:
+        """
+        Parcourt les jours de `debut` à `fin` (par défaut tout l'horizon) par segments maximaux
+        (premier jour, dernier jour, nom de la période ou "") : deux segments consécutifs n'ont jamais le même nom.
+        """
+        debut, fin = max(debut, 1), self.nb_jours if fin is None else min(fin, self.nb_jours)
+        if debut > fin:
+            return
+        courant = None
+        premier = bisect_right(self._debuts, debut) - 1
+        for k in range(premier, len(self._debuts)):
+            if self._debuts[k] > fin:
+                break
+            couvrantes = self._couvrantes[k]
+            nom = self.vacances[couvrantes[-1]].nom if couvrantes else ""
+            segment_fin = min(self._fins[k], fin)
+            if courant is not None and courant[2] == nom:
+                courant = (courant[0], segment_fin, nom)
+                continue
+            if courant is not None:
+                yield courant
+            courant = (max(self._debuts[k], debut), segment_fin, nom)
+        yield courant
+
+    def noms_par_jour(self) -> List[str]:
+        """Le nom de la période de chaque jour (élément j pour le jour j + 1), construit segment par segment."""
+        noms: List[str] = []
+        for debut, fin, nom in self.segments():
+            noms.extend([nom] * (fin - debut + 1))
+        return noms
+
+    def to_dict(self) -> Dict[int, str]:
+        """Le dictionnaire jour → nom de la période (ou "") de `jours_de_gardes`."""
+        return dict(enumerate(self.noms_par_jour(), start=1))
@@ -0,0 +1,272 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from planning_medecin.calendrier import CalendrierVacances
+from planning_medecin.lib_hp import (
+    CriteresInvalides,
+    Medecin,
+    PeriodeVacance,
+    IndexParJour,
+    _iterer_gardes,
+    _verifier_medecins,
+    _verifier_vacances,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass
+class PlanningEffectifs:
+    """
+    Emploi du temps avec plusieurs médecins de garde par jour, stocké à plat : les médecins de garde du jour j + 1
+    sont `affectation[debuts[j]:debuts[j + 1]]`, par charge croissante au moment du choix.
+
+    ## Attributes:
+        medecins (List[Medecin]): Les médecins planifiés ; `affectation` référence leurs positions dans cette liste.
+        vacances (List[PeriodeVacance]): Les périodes de vacances prises en compte.
+        nb_jours (int): Le nombre total de jours planifiés.
+        max_gardes (int): Le nombre maximum de gardes par médecin utilisé pour la planification.
+        effectifs (np.ndarray): Nombre de médecins de garde requis chaque jour (longueur nb_jours).
+        affectation (np.ndarray): Indices des médecins de garde, jour après jour (longueur `effectifs.sum()`).
+
+    ## Example:
+        >>> effectifs = effectifs_par_jour(vacances, 10, 2, par_vacance={"Ete": 1})
+        >>> planning = planifier_effectifs(medecins, vacances, 10, 6, effectifs)
+        >>> planning.medecins_de_garde(1)
+        ['Dr. MACHECOURT', 'Dr. SENGEL']
+    """
+    medecins: List[Medecin]
+    vacances: List[PeriodeVacance]
+    nb_jours: int
+    max_gardes: int
+    effectifs: np.ndarray
+    affectation: np.ndarray
+
+    @property
+    def debuts(self) -> np.ndarray:
+        """Position, dans `affectation`, des gardes de chaque jour (longueur nb_jours + 1)."""
+        return np.concatenate(([0], np.cumsum(self.effectifs)))
+
+    @property
+    def gardes(self) -> np.ndarray:
+        """Nombre de gardes de chaque médecin, dans l'ordre de `medecins`."""
+        return np.bincount(self.affectation, minlength=len(self.medecins))
+
+    def medecins_de_garde(self, jour: int) -> List[str]:
+        """Identifiants des médecins de garde le jour donné (numéroté à partir de 1)."""
+        debuts = self.debuts
+        return [self.medecins[idx].id for idx in self.affectation[debuts[jour - 1]:debuts[jour]].tolist()]
+
+    def _libelles(self) -> List[str]:
+        noms = CalendrierVacances(self.vacances, self.nb_jours).noms_par_jour()
+        return [f"Jour {j} {nom}" if nom else f"Jour {j}" for j, nom in enumerate(noms, start=1)]
+
+    def gardes_par_jour(self) -> Iterator[Tuple[int, str, str]]:
+        """Génère les triplets (jour, vacance, médecin), une ligne par garde, jour après jour."""
+        noms = CalendrierVacances(self.vacances, self.nb_jours).noms_par_jour()
+        jours = np.repeat(np.arange(1, self.nb_jours + 1), self.effectifs).tolist()
+        for jour, idx in zip(jours, self.affectation.tolist()):
+            yield jour, noms[jour - 1], self.medecins[idx].id
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """Tableau jours × médecins de "X" et "-", comme `Planning.to_dataframe`."""
+        import pandas as pd
+
+        cellules = np.full((self.nb_jours, len(self.medecins)), "-", dtype=object)
+        cellules[np.repeat(np.arange(self.nb_jours), self.effectifs), self.affectation] = "X"
+        return pd.DataFrame(cellules, index=self._libelles(), columns=[med.id for med in self.medecins])
+
+    def to_rich(self, debut: int = 1, fin: Optional[int] = None):
+        """Table rich (jour, effectif, médecins de garde) pour les jours de `debut` à `fin` inclus."""
+        from rich.table import Table
+
+        fin = self.nb_jours if fin is None else min(fin, self.nb_jours)
+        table = Table(title="Planning des Gardes")
+        for col in ["Jour", "Effectif", "Médecins"]:
+            table.add_column(col)
+        libelles, debuts = self._libelles(), self.debuts.tolist()
+        for jour in range(debut, fin + 1):
+            ids = [self.medecins[idx].id for idx in self.affectation[debuts[jour - 1]:debuts[jour]].tolist()]
+            table.add_row(libelles[jour - 1], str(int(self.effectifs[jour - 1])), ", ".join(ids))
+        return table
+
+
+def effectifs_par_jour(
+    vacances: List[PeriodeVacance],
+    nb_jours: int,
+    par_defaut: int = 1,
+    hebdomadaire: Optional[Sequence[int]] = None,
+    par_vacance: Optional[Dict[str, int]] = None,
+    par_jour: Optional[Dict[int, int]] = None
+) -> np.ndarray:
+    """
+    Construit le tableau des effectifs requis, jour par jour, en appliquant dans l'ordre : l'effectif par défaut,
+    l'effectif de chaque jour de la semaine (le jour 1 étant le premier), celui des périodes de vacances (un jour
+    couvert par plusieurs périodes relève de la dernière déclarée) puis les effectifs fixés jour par jour.
+
+    ## Parameters:
+        vacances (List[PeriodeVacance]): Les périodes de vacances.
+        nb_jours (int): Le nombre total de jours.
+        par_defaut (int): Effectif des jours sans autre précision.
+        hebdomadaire (Optional[Sequence[int]]): Sept effectifs, pour les jours 1, 2, ..., 7 de chaque semaine.
+        par_vacance (Optional[Dict[str, int]]): Effectif de chaque période de vacances, par nom.
+        par_jour (Optional[Dict[int, int]]): Effectif de jours particuliers (numérotés à partir de 1).
+
+    ## Returns:
+        np.ndarray: Tableau d'entiers de longueur nb_jours.
+
+    ## Example:
+        >>> effectifs_par_jour([PeriodeVacance("Noel", 8, 2)], 10, 2, hebdomadaire=[2, 2, 2, 2, 2, 3, 3], par_jour={10: 4})
+        array([2, 2, 2, 2, 2, 3, 3, 2, 2, 4])
+    """
+    effectifs = np.full(nb_jours, par_defaut, dtype=np.int64)
+    if hebdomadaire is not None:
+        effectifs[:] = np.resize(np.asarray(hebdomadaire, dtype=np.int64), nb_jours)
+    if par_vacance:
+        for debut, fin, nom in CalendrierVacances(vacances, nb_jours).segments():
+            if nom in par_vacance:
+                effectifs[debut - 1:fin] = par_vacance[nom]
+    if par_jour:
+        jours = np.fromiter(par_jour, dtype=np.int64, count=len(par_jour))
+        valeurs = np.fromiter(par_jour.values(), dtype=np.int64, count=len(par_jour))
+        dans_horizon = (jours >= 1) & (jours <= nb_jours)
+        effectifs[jours[dans_horizon] - 1] = valeurs[dans_horizon]
+    return effectifs
+
+
+def charger_effectifs(data: dict, vacances: List[PeriodeVacance], nb_jours: int) -> np.ndarray:
+    """
+    Lit les effectifs d'un fichier de critères : la clé "effectifs" est soit un entier (le même chaque jour),
+    soit un objet {"par_defaut": 2, "hebdomadaire": [2, 2, 2, 2, 2, 3, 3], "vacances": {"Noel": 4}, "jours": {"100": 3}}
+    dont toutes les clés sont facultatives (voir `effectifs_par_jour`). Sans clé "effectifs", un médecin par jour.
+
+    ## Raises:
+        CriteresInvalides: Si un effectif n'est pas un entier positif ou nul, ou si la clé "hebdomadaire" n'a pas sept valeurs.
+
+    ## Example:
+        >>> charger_effectifs({"effectifs": {"par_defaut": 2, "jours": {"3": 3}}}, [], 4)
+        array([2, 2, 3, 2])
+    """
+    brut = data.get("effectifs", 1)
+    if not isinstance(brut, dict):
+        brut = {"par_defaut": brut}
+    erreurs = []
+
+    def entier(valeur, libelle: str) -> int:
+        if not isinstance(valeur, int) or isinstance(valeur, bool) or valeur < 0:
+            erreurs.append(f"Effectif {libelle} : un entier positif ou nul est attendu, reçu: {valeur!r}")
+            return 0
+        return valeur
+
+    par_defaut = entier(brut.get("par_defaut", 1), "par défaut")
+    hebdomadaire = brut.get("hebdomadaire")
+    if hebdomadaire is not None:
+        if not isinstance(hebdomadaire, list) or len(hebdomadaire) != 7:
+            erreurs.append(f"Effectif hebdomadaire : une liste de 7 effectifs est attendue, reçu: {hebdomadaire!r}")
+            hebdomadaire = None
+        else:
+            hebdomadaire = [entier(valeur, f"du jour {i} de la semaine") for i, valeur in enumerate(hebdomadaire, start=1)]
+    par_vacance = {nom: entier(valeur, f"de la période {nom!r}") for nom, valeur in brut.get("vacances", {}).items()}
+    par_jour = {}
+    for jour, valeur in brut.get("jours", {}).items():
+        if not str(jour).isdigit():
+            erreurs.append(f"Effectif du jour {jour!r} : le jour doit être un entier positif")
+            continue
+        par_jour[int(jour)] = entier(valeur, f"du jour {jour}")
+    if erreurs:
+        raise CriteresInvalides(erreurs)
+    return effectifs_par_jour(vacances, nb_jours, par_defaut, hebdomadaire, par_vacance, par_jour)
+
+
+def _verifier_effectifs(
+    index: IndexParJour,
+    calendrier: CalendrierVacances,
+    effectifs: np.ndarray,
+    max_gardes: int
+) -> None:
+    """Contrôles vectorisés préalables : capacité totale, disponibilités de chaque jour, médecins par période."""
+    nb_medecins = len(index.ids)
+    if int(effectifs.sum()) > nb_medecins * max_gardes:
+        raise ValueError(f"{int(effectifs.sum())} gardes à pourvoir pour {nb_medecins} médecins d'au plus {max_gardes} gardes, impossible de compléter l'emploi du temps.")
+    en_defaut = np.flatnonzero(index.candidats_par_jour() < effectifs)
+    if en_defaut.size:
+        jour = int(en_defaut[0]) + 1
+        raise ValueError(f"Moins de {int(effectifs[jour - 1])} médecins disponibles pour le jour {jour}, impossible de compléter l'emploi du temps.")
+    par_periode: Dict[str, int] = {}
+    for debut, fin, nom in calendrier.segments():
+        if nom:
+            par_periode[nom] = par_periode.get(nom, 0) + int(effectifs[debut - 1:fin].sum())
+    for nom, besoin in par_periode.items():
+        if besoin > nb_medecins:
+            raise ValueError(f"Nombre de médecins insuffisant pour couvrir les {besoin} gardes de la période {nom}.")
+
+
+def _affecter_effectifs(
+    index: IndexParJour,
+    calendrier: CalendrierVacances,
+    effectifs: np.ndarray,
+    max_gardes: int
+) -> np.ndarray:
+    """
+    Algorithme glouton de `planifier` étendu à plusieurs gardes par jour : chaque jour, les `effectifs[j]` médecins
+    disponibles ayant le moins de gardes (à égalité, les premiers dans l'ordre d'entrée) et n'ayant pas déjà assuré
+    la période de vacances en cours sont choisis ensemble. Les choix sont ceux du coeur glouton partagé
+    (`_iterer_gardes`) : avec un effectif de 1 chaque jour, ce sont exactement ceux de `planifier`.
+    """
+    gardes = _iterer_gardes(index, calendrier, max_gardes, effectifs=effectifs)
+    return np.fromiter((choisi for _, choisi in gardes), dtype=np.int64, count=int(effectifs.sum()))
+
+
+def planifier_effectifs(
+    medecins: List[Medecin],
+    vacances: List[PeriodeVacance],
+    nb_jours: int,
+    max_gardes: int,
+    effectifs: Union[int, Sequence[int], np.ndarray] = 1
+) -> PlanningEffectifs:
+    """
+    Planifie plusieurs médecins de garde par jour, selon un effectif requis jour par jour (voir `effectifs_par_jour`
+    et `charger_effectifs` pour des effectifs par jour de la semaine ou par période de vacances).
+
+    Un médecin n'assure qu'une garde par jour, au plus `max_gardes` au total et une seule par période de vacances.
+    Avant l'affectation, la capacité totale des médecins, le nombre de médecins disponibles chaque jour et le nombre
+    de médecins nécessaires à chaque période sont contrôlés sur les tableaux d'effectifs et de disponibilités.
+
+    ## Parameters:
+        medecins (List[Medecin]): Liste des médecins avec leurs identifiants et disponibilités.
+        vacances (List[PeriodeVacance]): Liste des périodes de vacances.
+        nb_jours (int): Le nombre total de jours sur lesquels l'emploi du temps est planifié.
+        max_gardes (int): Le nombre maximum de gardes qu'un médecin peut avoir pendant la période spécifiée.
+        effectifs (Union[int, Sequence[int], np.ndarray]): Effectif requis chaque jour, ou tableau de longueur nb_jours.
+
+    ## Raises:
+        TypeError: Si 'medecins' est None.
+        ValueError: Si 'medecins' est une liste vide, si `effectifs` n'a pas nb_jours valeurs positives ou nulles,
+            ou si les contrôles préalables échouent.
+        ValueError: Si un jour ne peut pas être pourvu : moins de médecins disponibles, sous `max_gardes` et n'ayant
+            pas déjà assuré la période de vacances en cours que l'effectif du jour.
+
+    ## Returns:
+        PlanningEffectifs: Les médecins de garde de chaque jour.
+
+    ## Example:
+        >>> effectifs = effectifs_par_jour(vacances, 10, 2, par_vacance={"Ete": 1})
+        >>> planning = planifier_effectifs(medecins, vacances, 10, 6, effectifs)
+        >>> planning.gardes
+        array([3, 4, 3, 4, 4])
+    """
+    _verifier_medecins(medecins)
+    _verifier_vacances(len(medecins), vacances)
+    effectifs = np.asarray(effectifs, dtype=np.int64)
+    if effectifs.ndim == 0:
+        effectifs = np.full(nb_jours, effectifs, dtype=np.int64)
+    if effectifs.shape != (nb_jours,) or (effectifs < 0).any():
+        raise ValueError(f"Les effectifs doivent être {nb_jours} entiers positifs ou nuls, un par jour.")
+    calendrier = CalendrierVacances(vacances, nb_jours)
+    index = IndexParJour.depuis_medecins(medecins, nb_jours)
+    _verifier_effectifs(index, calendrier, effectifs, max_gardes)
+    affectation = _affecter_effectifs(index, calendrier, effectifs, max_gardes)
+    return PlanningEffectifs(medecins, vacances, nb_jours, max_gardes, effectifs, affectation)
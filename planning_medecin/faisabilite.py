@@ -0,0 +1,257 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+from planning_medecin.lib_hp import (
+    Medecin,
+    PeriodeVacance,
+    MatriceDisponibilites,
+    _verifier_medecins,
+)
+from planning_medecin.calendrier import CalendrierVacances
+
+
+@dataclass
+class Faisabilite:
+    """
+    Résultat de `verifier_faisabilite`.
+
+    ## Attributes:
+        faisable (bool): Vrai si un emploi du temps respectant toutes les contraintes existe.
+        jours_couverts (int): Nombre maximal de jours pouvant être couverts simultanément (valeur du flot maximal).
+        jours_en_defaut (List[int]): Si l'instance est infaisable, un ensemble de jours violant la condition de Hall :
+            les médecins pouvant les couvrir disposent, toutes contraintes confondues, de moins de gardes qu'il n'y a de jours.
+            Liste vide si l'instance est faisable.
+        gardes_disponibles (int): Nombre de gardes que les médecins peuvent offrir aux jours en défaut (0 si faisable).
+        affectation (List[int]): Pour chaque jour, l'indice (dans la liste d'entrée) d'un médecin de garde dans une
+            affectation maximale, ou -1 si le jour reste sans médecin.
+    """
+    faisable: bool
+    jours_couverts: int
+    jours_en_defaut: List[int] = field(default_factory=list)
+    gardes_disponibles: int = 0
+    affectation: List[int] = field(default_factory=list)
+
+    def message(self) -> str:
+        """Explication lisible d'une infaisabilité, utilisée comme message d'erreur."""
+        return (
+            f"Aucun emploi du temps possible : les jours {self.jours_en_defaut} ne disposent que de "
+            f"{self.gardes_disponibles} gardes possibles au total."
+        )
+
+
+class _Reseau:
+    """Réseau de flot en listes d'adjacence ; l'arc `e ^ 1` est toujours l'arc résiduel inverse de `e`."""
+
+    def __init__(self, nb_noeuds: int, origines: np.ndarray, extremites: np.ndarray, capacites: np.ndarray):
+        nb_arcs = len(origines)
+        vers = np.empty(2 * nb_arcs, dtype=np.int64)
+        vers[0::2] = extremites
+        vers[1::2] = origines
+        cap = np.zeros(2 * nb_arcs, dtype=np.int64)
+        cap[0::2] = capacites
+        depart = np.empty(2 * nb_arcs, dtype=np.int64)
+        depart[0::2] = origines
+        depart[1::2] = extremites
+        ordre = np.argsort(depart, kind="stable")
+        bornes = np.searchsorted(depart[ordre], np.arange(nb_noeuds + 1))
+        ordre = ordre.tolist()
+        self.adj: List[List[int]] = [ordre[bornes[u]:bornes[u + 1]] for u in range(nb_noeuds)]
+        self.vers: List[int] = vers.tolist()
+        self.cap: List[int] = cap.tolist()
+
+    def flot_max(self, source: int, puits: int) -> int:
+        """Algorithme de Dinic : O(E·√V) ici, toutes les capacités vers le puits valant 1."""
+        flot = 0
+        while True:
+            niveau = self._niveaux(source)
+            if niveau[puits] < 0:
+                return flot
+            iterateurs = [0] * len(self.adj)
+            while True:
+                f = self._augmenter(source, puits, niveau, iterateurs)
+                if not f:
+                    break
+                flot += f
+
+    def _niveaux(self, source: int) -> List[int]:
+        niveau = [-1] * len(self.adj)
+        niveau[source] = 0
+        file = deque([source])
+        while file:
+            u = file.popleft()
+            for e in self.adj[u]:
+                v = self.vers[e]
+                if self.cap[e] > 0 and niveau[v] < 0:
+                    niveau[v] = niveau[u] + 1
+                    file.append(v)
+        return niveau
+
+    def _augmenter(self, source: int, puits: int, niveau: List[int], iterateurs: List[int]) -> int:
+        adj, vers, cap = self.adj, self.vers, self.cap
+        chemin: List[int] = []
+        u = source
+        while True:
+            if u == puits:
+                f = min(cap[e] for e in chemin)
+                for e in chemin:
+                    cap[e] -= f
+                    cap[e ^ 1] += f
+                return f
+            arcs = adj[u]
+            while iterateurs[u] < len(arcs):
+                e = arcs[iterateurs[u]]
+                if cap[e] > 0 and niveau[vers[e]] == niveau[u] + 1:
+                    break
+                iterateurs[u] += 1
+            else:
+                if not chemin:
+                    return 0
+                niveau[u] = -1
+                u = vers[chemin.pop() ^ 1]
+                iterateurs[u] += 1
+                continue
+            chemin.append(e)
+            u = vers[e]
+
+    def atteignent(self, puits: int) -> List[bool]:
+        """Noeuds depuis lesquels le puits reste atteignable dans le graphe résiduel."""
+        atteint = [False] * len(self.adj)
+        atteint[puits] = True
+        file = deque([puits])
+        while file:
+            v = file.popleft()
+            for e in self.adj[v]:
+                u = self.vers[e]
+                if not atteint[u] and self.cap[e ^ 1] > 0:
+                    atteint[u] = True
+                    file.append(u)
+        return atteint
+
+
+def _construire_reseau(
+    index: MatriceDisponibilites,
+    calendrier: CalendrierVacances,
+    max_gardes: int
+) -> Tuple[_Reseau, np.ndarray, np.ndarray]:
+    """
+    Modélise le problème en réseau : source → médecin (capacité max_gardes) → jour → puits (capacité 1).
+
+    Un jour de vacances passe par un noeud intermédiaire (médecin, vacance) de capacité 1, ce qui impose
+    au plus une garde par médecin et par période. Les arcs vers les jours ont une capacité non limitante
+    afin que toute coupe minimale ne sépare un jour que de ses prédécesseurs (ce qui en fait un témoin de Hall).
+
+    Noeuds : 0 source, 1 puits, puis les médecins, les jours et enfin les noeuds (médecin, vacance), dont
+    les propriétaires sont renvoyés avec les indices des arcs jour → puits.
+    """
+    nb_medecins, nb_jours = index.matrice.shape
+    premier_jour = 2 + nb_medecins
+    segments = [(debut, fin, nom) for debut, fin, nom in calendrier.segments() if nom]
+    noms = sorted({nom for _, _, nom in segments})
+    numero_vacance = np.full(nb_jours, -1, dtype=np.int64)
+    for debut, fin, nom in segments:
+        numero_vacance[debut - 1:fin] = noms.index(nom)
+
+    lignes, colonnes = np.nonzero(index.matrice)
+    vacance = numero_vacance[colonnes]
+    direct = vacance < 0
+    cles, noeud_vacance = np.unique(lignes[~direct] * max(len(noms), 1) + vacance[~direct], return_inverse=True)
+    proprietaires = cles // max(len(noms), 1)
+    premier_noeud_vacance = premier_jour + nb_jours
+
+    medecins = np.arange(2, premier_jour)
+    jours = np.arange(premier_jour, premier_noeud_vacance)
+    noeuds_vacance = np.arange(premier_noeud_vacance, premier_noeud_vacance + len(cles))
+    origines = np.concatenate([
+        np.zeros(nb_medecins, dtype=np.int64),
+        2 + proprietaires,
+        2 + lignes[direct],
+        premier_noeud_vacance + noeud_vacance,
+        jours,
+    ])
+    extremites = np.concatenate([
+        medecins,
+        noeuds_vacance,
+        premier_jour + colonnes[direct],
+        premier_jour + colonnes[~direct],
+        np.ones(nb_jours, dtype=np.int64),
+    ])
+    capacites = np.concatenate([
+        np.full(nb_medecins, max(max_gardes, 0), dtype=np.int64),
+        np.ones(len(cles), dtype=np.int64),
+        np.full(len(lignes), nb_jours + 1, dtype=np.int64),
+        np.ones(nb_jours, dtype=np.int64),
+    ])
+    reseau = _Reseau(premier_noeud_vacance + len(cles), origines, extremites, capacites)
+    arcs_puits = 2 * (len(origines) - nb_jours + np.arange(nb_jours))
+    return reseau, arcs_puits, proprietaires
+
+
+def verifier_faisabilite(
+    medecins: List[Medecin],
+    vacances: List[PeriodeVacance],
+    nb_jours: int,
+    max_gardes: int
+) -> Faisabilite:
+    """
+    Détermine en temps polynomial s'il existe un emploi du temps couvrant tous les jours, par un calcul de flot maximal.
+
+    Les contraintes modélisées sont exactement celles de `trouver_emploi_du_temps` : un médecin par jour parmi les
+    disponibles, au plus `max_gardes` gardes par médecin et au plus une garde par médecin et par période de vacances.
+    Contrairement à l'algorithme glouton, la réponse est exacte : une instance déclarée faisable admet un planning.
+
+    ## Parameters:
+        medecins (List[Medecin]): Liste des médecins avec leurs identifiants et disponibilités.
+        vacances (List[PeriodeVacance]): Liste des périodes de vacances (éventuellement vide).
+        nb_jours (int): Le nombre total de jours sur lesquels l'emploi du temps est planifié.
+        max_gardes (int): Le nombre maximum de gardes qu'un médecin peut avoir pendant la période spécifiée.
+
+    ## Raises:
+        TypeError: Si 'medecins' est None.
+        ValueError: Si 'medecins' est une liste vide.
+        ValueError: Si le nombre de jours est inférieur ou égal à zéro ou est infini.
+
+    ## Returns:
+        Faisabilite: Le verdict, et si l'instance est infaisable un ensemble de jours en défaut (témoin de Hall).
+
+    ## Example:
+        >>> medecins = [Medecin("Dr. VIDAL", {1, 2, 3}), Medecin("Dr. SENGEL", {2, 3})]
+        >>> vacances = [PeriodeVacance("Noel", 1, 3)]
+        >>> resultat = verifier_faisabilite(medecins, vacances, 3, 3)
+        >>> resultat.faisable, resultat.jours_en_defaut, resultat.gardes_disponibles
+        (False, [1, 2, 3], 2)
+    """
+    _verifier_medecins(medecins)
+    calendrier = CalendrierVacances(vacances, nb_jours)
+    index = MatriceDisponibilites.depuis_medecins(medecins, nb_jours)
+    reseau, arcs_puits, proprietaires = _construire_reseau(index, calendrier, max_gardes)
+    jours_couverts = reseau.flot_max(0, 1)
+
+    premier_jour = 2 + len(medecins)
+    premier_noeud_vacance = premier_jour + nb_jours
+    affectation = [-1] * nb_jours
+    for j, e in enumerate(arcs_puits.tolist()):
+        if reseau.cap[e]:
+            continue
+        for arc in reseau.adj[premier_jour + j]:
+            # L'arc inverse d'un arc entrant porte le flot reçu par le jour.
+            if arc & 1 and reseau.cap[arc] > 0:
+                origine = reseau.vers[arc]
+                if origine >= premier_noeud_vacance:
+                    affectation[j] = int(proprietaires[origine - premier_noeud_vacance])
+                else:
+                    affectation[j] = origine - 2
+                break
+
+    if jours_couverts == nb_jours:
+        return Faisabilite(True, jours_couverts, affectation=affectation)
+
+    atteint = reseau.atteignent(1)
+    jours_en_defaut = [j + 1 for j in range(nb_jours) if atteint[premier_jour + j]]
+    gardes_disponibles = sum(max(max_gardes, 0) for i in range(len(medecins)) if atteint[2 + i])
+    gardes_disponibles += sum(
+        1 for k, i in enumerate(proprietaires.tolist()) if atteint[premier_noeud_vacance + k] and not atteint[2 + i]
+    )
+    return Faisabilite(False, jours_couverts, jours_en_defaut, gardes_disponibles, affectation)
@@ -0,0 +1,147 @@
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from planning_medecin.calendrier import CalendrierVacances
+from planning_medecin.lib_hp import (
+    Medecin,
+    PeriodeVacance,
+    IndexParJour,
+    _EtatGlouton,
+    _aplatir_disponibilites,
+    _iterer_gardes,
+    _verifier_medecins,
+    _verifier_vacances,
+)
+
+
+@dataclass
+class Fenetre:
+    """
+    Une fenêtre terminée de la planification par fenêtres : les gardes des jours `debut` à `fin` inclus.
+
+    ## Attributes:
+        debut (int): Premier jour de la fenêtre.
+        fin (int): Dernier jour de la fenêtre.
+        affectation (np.ndarray): L'élément k est l'indice du médecin de garde le jour `debut + k`.
+        vacances (List[str]): L'élément k est le nom de la période du jour `debut + k`, ou "".
+        ids (List[str]): Identifiants des médecins (liste partagée par toutes les fenêtres).
+    """
+    debut: int
+    fin: int
+    affectation: np.ndarray
+    vacances: List[str]
+    ids: List[str]
+
+    def gardes_par_jour(self) -> Iterator[Tuple[int, str, str]]:
+        """Génère les triplets (jour, vacance, médecin) de la fenêtre."""
+        for jour, (vacance, idx) in enumerate(zip(self.vacances, self.affectation.tolist()), start=self.debut):
+            yield jour, vacance, self.ids[idx]
+
+    def to_rich(self):
+        """Table rich (jour, vacance, médecin) de la fenêtre."""
+        from rich.table import Table
+
+        table = Table(title=f"Planning des Gardes : jours {self.debut} à {self.fin}")
+        for col in ["Jour", "Vacance", "Médecin"]:
+            table.add_column(col)
+        for jour, vacance, medecin in self.gardes_par_jour():
+            table.add_row(str(jour), vacance, medecin)
+        return table
+
+
+def iterer_fenetres(
+    medecins: List[Medecin],
+    vacances: List[PeriodeVacance],
+    nb_jours: int,
+    max_gardes: int,
+    taille_fenetre: int = 28
+) -> Iterator[Fenetre]:
+    """
+    Planifie l'horizon par fenêtres de `taille_fenetre` jours et produit chaque fenêtre dès qu'elle est terminée.
+
+    Le planning obtenu est exactement celui de l'algorithme glouton de `planifier` : la charge de chaque médecin
+    et les périodes de vacances déjà assurées passent d'une fenêtre à l'autre. Seul l'index des disponibilités
+    de la fenêtre courante est construit (`IndexParJour`), à partir des disponibilités triées par jour ;
+    l'état d'une période de vacances est libéré dès qu'elle est terminée. La mémoire de travail est donc bornée
+    par la taille de la fenêtre et non par celle de l'horizon.
+
+    ## Parameters:
+        medecins (List[Medecin]): Liste des médecins avec leurs identifiants et disponibilités.
+        vacances (List[PeriodeVacance]): Liste des périodes de vacances (éventuellement vide).
+        nb_jours (int): Le nombre total de jours sur lesquels l'emploi du temps est planifié.
+        max_gardes (int): Le nombre maximum de gardes qu'un médecin peut avoir sur tout l'horizon.
+        taille_fenetre (int): Nombre de jours par fenêtre.
+
+    ## Raises:
+        ValueError: Si `taille_fenetre` n'est pas strictement positive.
+        ValueError: Mêmes erreurs que `planifier` (solveur glouton) ; une erreur survient dans la fenêtre du jour
+            concerné, après que les fenêtres précédentes ont été produites.
+
+    ## Example:
+        >>> for fenetre in iterer_fenetres(medecins, vacances, 10, 3, taille_fenetre=4):
+        ...     print(fenetre.debut, fenetre.fin, fenetre.affectation)
+        1 4 [0 1 2 3]
+        5 8 [4 1 2 0]
+        9 10 [3 4]
+    """
+    if taille_fenetre <= 0:
+        raise ValueError(f"La taille de fenêtre doit être strictement positive, reçu: {taille_fenetre}")
+    _verifier_vacances(len(medecins), vacances)
+    calendrier = CalendrierVacances(vacances, nb_jours)
+    _verifier_medecins(medecins)
+
+    ids = [med.id for med in medecins]
+    lignes, jours = _aplatir_disponibilites(medecins)
+    dans_horizon = jours <= nb_jours
+    lignes, jours = lignes[dans_horizon].astype(np.int32), jours[dans_horizon].astype(np.int32)
+    # Tri par jour : sur des clés de 16 bits, le tri stable de NumPy est un tri par base, linéaire.
+    ordre = np.argsort(jours.astype(np.uint16) if nb_jours < 2**16 else jours, kind="stable")
+    lignes, jours = lignes[ordre], jours[ordre]
+    del ordre
+    fin_des_periodes = {nom: fin for _, fin, nom in calendrier.segments() if nom}
+    etat = _EtatGlouton(len(medecins))
+
+    debuts = np.arange(1, nb_jours + 1, taille_fenetre, dtype=np.int32)
+    bornes = np.searchsorted(jours, np.append(debuts, np.int32(nb_jours + 1))).tolist()
+    for numero, debut in enumerate(debuts.tolist()):
+        fin = min(debut + taille_fenetre - 1, nb_jours)
+        bas, haut = bornes[numero], bornes[numero + 1]
+        index = IndexParJour._depuis_tableaux(
+            ids, lignes[bas:haut], jours[bas:haut] - (debut - 1), fin - debut + 1
+        )
+        affectation = np.empty(fin - debut + 1, dtype=np.int64)
+        for jour, choisi in _iterer_gardes(index, calendrier, max_gardes, etat=etat, premier_jour=debut):
+            affectation[jour - debut] = choisi
+        noms = [nom for d, f, nom in calendrier.segments(debut, fin) for _ in range(d, f + 1)]
+        for nom in [nom for nom in etat.deja_de_garde if fin_des_periodes[nom] <= fin]:
+            del etat.deja_de_garde[nom]
+        yield Fenetre(debut, fin, affectation, noms, ids)
+
+
+def planifier_par_fenetres(
+    medecins: List[Medecin],
+    vacances: List[PeriodeVacance],
+    nb_jours: int,
+    max_gardes: int,
+    taille_fenetre: int = 28,
+    sink: Optional[Callable[[Fenetre], None]] = None
+) -> np.ndarray:
+    """
+    Planifie l'horizon par fenêtres (voir `iterer_fenetres`) et transmet chaque fenêtre terminée à `sink`.
+
+    ## Returns:
+        np.ndarray: Le nombre de gardes de chaque médecin sur tout l'horizon.
+
+    ## Example:
+        >>> with open("planning.csv", "w", newline="") as file:
+        ...     writer = csv.writer(file)
+        ...     planifier_par_fenetres(medecins, vacances, 365, 10, 31, lambda f: writer.writerows(f.gardes_par_jour()))
+    """
+    gardes = np.zeros(len(medecins), dtype=np.int64)
+    for fenetre in iterer_fenetres(medecins, vacances, nb_jours, max_gardes, taille_fenetre):
+        gardes += np.bincount(fenetre.affectation, minlength=len(medecins))
+        if sink is not None:
+            sink(fenetre)
+    return gardes
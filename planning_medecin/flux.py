@@ -0,0 +1,131 @@
+import csv
+import json
+from array import array
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from planning_medecin.calendrier import CalendrierVacances
+from planning_medecin.lib_hp import (
+    Medecin,
+    PeriodeVacance,
+    IndexParJour,
+    _iterer_gardes,
+    _verifier_medecins,
+    _verifier_vacances,
+)
+
+
+def lire_criteres_ndjson(
+    lignes: Iterable[str],
+    nb_jours: int = 10,
+    max_gardes: int = 3
+) -> Tuple[List[Medecin], List[PeriodeVacance], int, int, IndexParJour]:
+    """
+    Lit des critères au format NDJSON (un objet JSON par ligne) sans charger le fichier entier en mémoire.
+
+    Une ligne contenant "disponibilites" décrit un médecin, une ligne contenant "duree" une période de vacances,
+    et une ligne contenant "nb_jours" et/ou "max_gardes" les paramètres de la planification. Les lignes vides
+    sont ignorées. Les disponibilités sont accumulées au fil de la lecture dans deux tableaux d'entiers compacts,
+    à partir desquels l'index des disponibilités est construit en une seule fois à la fin.
+
+    ## Parameters:
+        lignes (Iterable[str]): Les lignes du fichier (typiquement le fichier ouvert lui-même).
+        nb_jours (int): Nombre de jours utilisé si aucune ligne ne le précise.
+        max_gardes (int): Nombre maximal de gardes utilisé si aucune ligne ne le précise.
+
+    ## Raises:
+        ValueError: Si une ligne n'est pas un objet JSON valide ou si un médecin ou une période n'est pas valide.
+
+    ## Returns:
+        Tuple: Les médecins, les vacances, le nombre de jours, le nombre maximal de gardes et l'index des disponibilités.
+
+    ## Example:
+        >>> lignes = ['{"nb_jours": 3, "max_gardes": 2}', '{"id": "Dr. VIDAL", "disponibilites": [1, 2, 3]}']
+        >>> medecins, vacances, nb_jours, max_gardes, index = lire_criteres_ndjson(lignes)
+        >>> index.candidats_par_jour()
+        array([1, 1, 1])
+    """
+    medecins: List[Medecin] = []
+    vacances: List[PeriodeVacance] = []
+    indices, jours = array("q"), array("q")
+    for numero, ligne in enumerate(lignes, start=1):
+        if not ligne.strip():
+            continue
+        try:
+            enregistrement = json.loads(ligne)
+        except json.JSONDecodeError as erreur:
+            raise ValueError(f"Ligne {numero} : JSON invalide ({erreur.msg})") from None
+        if not isinstance(enregistrement, dict):
+            raise ValueError(f"Ligne {numero} : objet JSON attendu, reçu {type(enregistrement).__name__}")
+        if "disponibilites" in enregistrement:
+            medecin = Medecin(enregistrement["id"], set(enregistrement["disponibilites"]))
+            indices.extend([len(medecins)] * len(medecin.disponibilites))
+            jours.extend(medecin.disponibilites)
+            medecins.append(medecin)
+        elif "duree" in enregistrement:
+            vacances.append(PeriodeVacance(enregistrement["nom"], enregistrement["debut"], enregistrement["duree"]))
+        else:
+            nb_jours = enregistrement.get("nb_jours", nb_jours)
+            max_gardes = enregistrement.get("max_gardes", max_gardes)
+
+    index = IndexParJour._depuis_tableaux(
+        [med.id for med in medecins], np.frombuffer(indices, dtype=np.int64), np.frombuffer(jours, dtype=np.int64), nb_jours
+    )
+    return medecins, vacances, nb_jours, max_gardes, index
+
+
+def planifier_en_flux(
+    medecins: List[Medecin],
+    vacances: List[PeriodeVacance],
+    nb_jours: int,
+    max_gardes: int,
+    index: Optional[IndexParJour] = None
+) -> Iterator[Tuple[int, str, str]]:
+    """
+    Génère l'emploi du temps de `trouver_emploi_du_temps` jour par jour, sous forme de triplets (jour, vacance, médecin).
+
+    Aucun DataFrame ni tableau jours × médecins n'est construit : chaque jour est produit dès qu'il est décidé.
+    Les erreurs sont les mêmes que celles de l'algorithme glouton, mais elles surviennent au jour concerné,
+    après que les jours précédents ont été produits.
+
+    ## Example:
+        >>> list(planifier_en_flux([Medecin("Dr. VIDAL", {1, 2})], [PeriodeVacance("Noel", 2, 1)], 2, 2))
+        [(1, '', 'Dr. VIDAL'), (2, 'Noel', 'Dr. VIDAL')]
+    """
+    _verifier_vacances(len(medecins), vacances)
+    calendrier = CalendrierVacances(vacances, nb_jours)
+    _verifier_medecins(medecins)
+    if index is None:
+        index = IndexParJour.depuis_medecins(medecins, nb_jours)
+    for jour, choisi in _iterer_gardes(index, calendrier, max_gardes):
+        yield jour, calendrier.nom_du_jour(jour), medecins[choisi].id
+
+
+def ecrire_planning_csv(gardes: Iterable[Tuple[int, str, str]], fichier: IO[str], taille_lot: int = 1024) -> None:
+    """
+    Écrit les gardes au format CSV long (jour, vacance, medecin), une ligne par jour, au fur et à mesure.
+
+    Le fichier est vidé (`flush`) toutes les `taille_lot` lignes et à la fin, y compris si `gardes` lève une
+    erreur en cours de route : les jours déjà produits sont alors bien dans le fichier.
+    """
+    writer = csv.writer(fichier)
+    writer.writerow(["jour", "vacance", "medecin"])
+    try:
+        for numero, garde in enumerate(gardes, start=1):
+            writer.writerow(garde)
+            if numero % taille_lot == 0:
+                fichier.flush()
+    finally:
+        fichier.flush()
+
+
+def ecrire_planning_ndjson(gardes: Iterable[Tuple[int, str, str]], fichier: IO[str], taille_lot: int = 1024) -> None:
+    """Écrit les gardes au format NDJSON, un objet par jour, au fur et à mesure (vidé comme `ecrire_planning_csv`)."""
+    try:
+        for numero, (jour, vacance, medecin) in enumerate(gardes, start=1):
+            fichier.write(json.dumps({"jour": jour, "vacance": vacance, "medecin": medecin}, ensure_ascii=False) + "\n")
+            if numero % taille_lot == 0:
+                fichier.flush()
+    finally:
+        fichier.flush()
@@ -1,8 +1,57 @@
-import pandas as pd
-from typing import List, Set, Dict
+import csv
+import gc
+from contextlib import contextmanager
+from itertools import chain
+
+import numpy as np
+from typing import IO, Iterable, List, Mapping, Set, Dict, Tuple, Optional, Iterator, Union, TYPE_CHECKING
 from dataclasses import dataclass
 
-@dataclass
+from planning_medecin.calendrier import CalendrierVacances
+from planning_medecin.profilage import Profil, _phase
+
+if TYPE_CHECKING:
+    # pandas n'est importé qu'à la construction d'un DataFrame (`Planning.to_dataframe`).
+    import pandas as pd
+
+    from planning_medecin.solveur_exact import StatistiquesRecherche
+
+
+class CriteresInvalides(ValueError):
+    """
+    Erreur levée par le chargement groupé des critères : elle liste tous les enregistrements invalides à la fois.
+
+    ## Attributes:
+        erreurs (List[str]): Un message par enregistrement invalide, dans l'ordre du fichier.
+    """
+
+    def __init__(self, erreurs: List[str]):
+        self.erreurs = erreurs
+        lignes = erreurs[:20] + ([f"... et {len(erreurs) - 20} autres"] if len(erreurs) > 20 else [])
+        super().__init__(f"{len(erreurs)} enregistrement(s) invalide(s) :\n- " + "\n- ".join(lignes))
+
+
+def _regrouper_erreurs(problemes: Dict[int, List[str]], libelle) -> List[str]:
+    """Un message par enregistrement fautif : `libelle(i)` suivi de tous ses problèmes."""
+    return [f"{libelle(i)} : {' ; '.join(problemes[i])}" for i in sorted(problemes)]
+
+
+@contextmanager
+def _ramasse_miettes_suspendu() -> Iterator[None]:
+    """
+    Suspend le ramasse-miettes cyclique pendant la création en masse d'objets sans cycles (médecins et ensembles de
+    jours) : sinon, ses passages successifs sur des objets tous vivants dominent le temps de chargement.
+    """
+    actif = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if actif:
+            gc.enable()
+
+
+@dataclass(slots=True)
 class PeriodeVacance:
     """
     Classe représentant une période de vacances avec un nom, un jour de début, et une durée.
@@ -34,8 +83,57 @@ class PeriodeVacance:
         if self.debut < 0 or self.debut == float("inf"):
             raise ValueError(f"Le jours de debut de la période {self} n'est pas valide")
 
-
-@dataclass
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> List["PeriodeVacance"]:
+        """
+        Construit les périodes à partir d'enregistrements {"nom", "debut", "duree"} en validant toutes les colonnes
+        à la fois ; tous les enregistrements invalides sont signalés ensemble.
+
+        ## Raises:
+            CriteresInvalides: Si au moins un enregistrement est invalide : ce n'est pas un objet, ou "debut" ou "duree"
+                n'est pas un entier positif ou nul.
+
+        ## Example:
+            >>> PeriodeVacance.from_records([{"nom": "Noel", "debut": 3, "duree": 2}])
+            [PeriodeVacance(nom='Noel', debut=3, duree=2)]
+        """
+        vacances, erreurs = cls._depuis_enregistrements(records)
+        if erreurs:
+            raise CriteresInvalides(erreurs)
+        return vacances
+
+    @classmethod
+    def _depuis_enregistrements(cls, records: Iterable[dict]) -> Tuple[List["PeriodeVacance"], List[str]]:
+        records = list(records)
+        objets = [isinstance(rec, Mapping) for rec in records]
+        noms = [rec.get("nom") if objet else rec for rec, objet in zip(records, objets)]
+        problemes: Dict[int, List[str]] = {
+            i: [f"un objet {{\"nom\", \"debut\", \"duree\"}} est attendu, reçu: {type(noms[i]).__name__}"]
+            for i, objet in enumerate(objets) if not objet
+        }
+        colonnes = {}
+        for champ in ("debut", "duree"):
+            valeurs = [rec.get(champ) if objet else 0 for rec, objet in zip(records, objets)]
+            entiers = np.fromiter(
+                (isinstance(v, int) and not isinstance(v, bool) for v in valeurs), dtype=bool, count=len(valeurs)
+            )
+            for i in np.flatnonzero(~entiers).tolist():
+                problemes.setdefault(i, []).append(f"{champ} doit être un entier, reçu: {valeurs[i]!r}")
+            colonne = np.array([v if ok else 0 for v, ok in zip(valeurs, entiers.tolist())], dtype=np.float64)
+            for i in np.flatnonzero(colonne < 0).tolist():
+                problemes.setdefault(i, []).append(f"{champ} n'est pas valide ({valeurs[i]!r})")
+            colonnes[champ] = valeurs
+        if problemes:
+            return [], _regrouper_erreurs(problemes, lambda i: f"Période n°{i + 1} ({noms[i]!r})")
+        vacances = []
+        for nom, debut, duree in zip(noms, colonnes["debut"], colonnes["duree"]):
+            vacance = object.__new__(cls)
+            vacance.nom, vacance.debut, vacance.duree = nom, debut, duree
+            vacances.append(vacance)
+        return vacances, []
+
+
+@dataclass(slots=True)
 class Medecin:
     """
     Classe représentant un médecin avec un identifiant unique et un ensemble de jours où il est disponible pour les gardes.
@@ -73,6 +171,307 @@ class Medecin:
         if any(jour < 0 for jour in self.disponibilites):
             raise ValueError(f"Le medecin {self} ne peut pas avoir de valeurs négatives dans les disponibilités")
 
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> List["Medecin"]:
+        """
+        Construit les médecins à partir d'enregistrements {"id", "disponibilites"} (format JSON de la commande `demo`).
+
+        Les contrôles de `__post_init__` sont faits colonne par colonne plutôt qu'objet par objet : les disponibilités
+        de tous les médecins sont aplaties dans un seul tableau NumPy, sur lequel les jours négatifs sont détectés en
+        une opération. Un ID déjà porté par un médecin précédent est refusé. Tous les enregistrements invalides sont
+        signalés ensemble.
+
+        ## Parameters:
+            records (Iterable[dict]): Les enregistrements ; "disponibilites" est une liste (ou un ensemble) d'entiers.
+
+        ## Raises:
+            CriteresInvalides: Si au moins un enregistrement est invalide ; `erreurs` contient un message par enregistrement.
+
+        ## Returns:
+            List[Medecin]: Les médecins, dans l'ordre des enregistrements.
+
+        ## Example:
+            >>> Medecin.from_records([{"id": "Dr. VIDAL", "disponibilites": [2, 1]}])
+            [Medecin(id='Dr. VIDAL', disponibilites={1, 2})]
+            >>> Medecin.from_records([{"id": "A", "disponibilites": []}, {"id": 7, "disponibilites": [-1]}])
+            Traceback (most recent call last):
+            CriteresInvalides: 2 enregistrement(s) invalide(s) :
+            - Médecin n°1 ('A') : aucun jour de disponibilité
+            - Médecin n°2 (7) : l'ID doit être une chaîne de caractères ; jours négatifs dans les disponibilités
+        """
+        medecins, erreurs = cls._depuis_enregistrements(records)
+        if erreurs:
+            raise CriteresInvalides(erreurs)
+        return medecins
+
+    @classmethod
+    def _depuis_enregistrements(cls, records: Iterable[dict]) -> Tuple[List["Medecin"], List[str]]:
+        records = list(records)
+        objets = [isinstance(rec, Mapping) for rec in records]
+        ids = [rec.get("id") if objet else rec for rec, objet in zip(records, objets)]
+        disponibilites = [rec.get("disponibilites") if objet else () for rec, objet in zip(records, objets)]
+        problemes: Dict[int, List[str]] = {}
+
+        for i, (id, objet) in enumerate(zip(ids, objets)):
+            if not objet:
+                problemes[i] = [f"un objet {{\"id\", \"disponibilites\"}} est attendu, reçu: {type(id).__name__}"]
+            elif not isinstance(id, str):
+                problemes[i] = ["l'ID doit être une chaîne de caractères"]
+        premiers: Dict[str, int] = {}
+        for i, id in enumerate(ids):
+            if i in problemes:
+                continue
+            if id in premiers:
+                problemes[i] = [f"l'ID est déjà celui du médecin n°{premiers[id] + 1}"]
+            else:
+                premiers[id] = i
+        for i, jours in enumerate(disponibilites):
+            if not isinstance(jours, (list, tuple, set, frozenset)):
+                problemes.setdefault(i, []).append(f"les disponibilités doivent être une liste d'entiers, reçu: {type(jours).__name__}")
+                disponibilites[i] = ()
+
+        longueurs = np.fromiter(map(len, disponibilites), dtype=np.int64, count=len(disponibilites))
+        aplaties = list(chain.from_iterable(disponibilites))
+        proprietaires = np.repeat(np.arange(len(disponibilites)), longueurs)
+        if all(issubclass(t, int) for t in set(map(type, aplaties))):
+            jours = np.array(aplaties, dtype=np.int64)
+        else:
+            entiers = np.fromiter((isinstance(j, int) for j in aplaties), dtype=bool, count=len(aplaties))
+            for i in np.unique(proprietaires[~entiers]).tolist():
+                problemes.setdefault(i, []).append("toutes les disponibilités doivent être des entiers")
+            jours = np.array([j if ok else 0 for j, ok in zip(aplaties, entiers.tolist())], dtype=np.int64)
+        for i in np.flatnonzero(longueurs == 0).tolist():
+            if i not in problemes:
+                problemes[i] = ["aucun jour de disponibilité"]
+        for i in np.unique(proprietaires[jours < 0]).tolist():
+            problemes.setdefault(i, []).append("jours négatifs dans les disponibilités")
+
+        if problemes:
+            return [], _regrouper_erreurs(problemes, lambda i: f"Médecin n°{i + 1} ({ids[i]!r})")
+        medecins = []
+        with _ramasse_miettes_suspendu():
+            for id, jours_medecin in zip(ids, disponibilites):
+                medecin = object.__new__(cls)
+                medecin.id, medecin.disponibilites = id, set(jours_medecin)
+                medecins.append(medecin)
+        return medecins, []
+
+
+@dataclass
+class MatriceDisponibilites:
+    """
+    Index compact des disponibilités : une matrice booléenne médecins × jours construite une seule fois.
+
+    La ligne `i` correspond au médecin `ids[i]` (ordre de la liste d'entrée) et la colonne `j` au jour `j + 1`.
+    La matrice est stockée colonne par colonne pour que les requêtes par jour soient contiguës en mémoire.
+
+    ## Attributes:
+        ids (List[str]): Identifiants des médecins, dans l'ordre de la liste d'entrée.
+        matrice (np.ndarray): Matrice booléenne de forme (nombre de médecins, nb_jours).
+
+    ## Example:
+        >>> index = MatriceDisponibilites.depuis_medecins([Medecin("Dr. VIDAL", {1, 3}), Medecin("Dr. SENGEL", {2, 3})], 3)
+        >>> index.candidats_par_jour()
+        array([1, 1, 2])
+        >>> index.medecins_disponibles(3)
+        array([0, 1])
+    """
+    ids: List[str]
+    matrice: np.ndarray
+
+    @classmethod
+    def depuis_medecins(cls, medecins: List[Medecin], nb_jours: int) -> "MatriceDisponibilites":
+        """Construit l'index en un seul remplissage vectorisé à partir des disponibilités aplaties."""
+        lignes, jours = _aplatir_disponibilites(medecins)
+        return cls._depuis_tableaux([med.id for med in medecins], lignes, jours, nb_jours)
+
+    @classmethod
+    def _depuis_tableaux(cls, ids: List[str], lignes: np.ndarray, jours: np.ndarray, nb_jours: int) -> "MatriceDisponibilites":
+        matrice = np.zeros((len(ids), nb_jours), dtype=bool, order="F")
+        dans_horizon = (jours >= 1) & (jours <= nb_jours)
+        matrice[lignes[dans_horizon], jours[dans_horizon] - 1] = True
+        return cls(ids, matrice)
+
+    @property
+    def nb_jours(self) -> int:
+        return self.matrice.shape[1]
+
+    def colonne(self, k: int) -> np.ndarray:
+        """Indices (croissants) des médecins disponibles dans la colonne k, soit le jour k + 1."""
+        return np.flatnonzero(self.matrice[:, k])
+
+    def medecins_disponibles(self, jour: int) -> np.ndarray:
+        """Indices (croissants) des médecins disponibles le jour donné."""
+        return np.flatnonzero(self.matrice[:, jour - 1])
+
+    def candidats_par_jour(self) -> np.ndarray:
+        """Nombre de médecins disponibles pour chaque jour de 1 à nb_jours."""
+        return self.matrice.sum(axis=0)
+
+    def charge(self) -> np.ndarray:
+        """Nombre de jours de disponibilité de chaque médecin dans l'horizon."""
+        return self.matrice.sum(axis=1)
+
+    def jours_communs(self, indices: List[int]) -> np.ndarray:
+        """Jours (numérotés à partir de 1) où tous les médecins donnés sont disponibles."""
+        return np.flatnonzero(self.matrice[indices].all(axis=0)) + 1
+
+    def jours_sans_medecin(self) -> np.ndarray:
+        """Jours (numérotés à partir de 1) où aucun médecin n'est disponible."""
+        return np.flatnonzero(~self.matrice.any(axis=0)) + 1
+
+
+@dataclass
+class IndexParJour:
+    """
+    Index creux des disponibilités, jour par jour (format CSR) : les médecins disponibles le jour j + 1 sont
+    `medecins[debuts[j]:debuts[j + 1]]`, par indice croissant.
+
+    Sa taille est proportionnelle au nombre d'entrées de disponibilité et non au produit médecins × jours :
+    c'est l'index de l'algorithme glouton. Les solveurs qui raisonnent sur toute la matrice (calcul de flot,
+    recherche exacte, portfolio) utilisent `MatriceDisponibilites`.
+
+    ## Attributes:
+        ids (List[str]): Identifiants des médecins, dans l'ordre de la liste d'entrée.
+        debuts (np.ndarray): Position, dans `medecins`, des disponibilités de chaque jour (longueur nb_jours + 1).
+        medecins (np.ndarray): Indices des médecins disponibles, jour après jour.
+
+    ## Example:
+        >>> index = IndexParJour.depuis_medecins([Medecin("Dr. VIDAL", {1, 3}), Medecin("Dr. SENGEL", {2, 3})], 3)
+        >>> index.candidats_par_jour()
+        array([1, 1, 2])
+        >>> index.medecins_disponibles(3)
+        array([0, 1], dtype=int32)
+    """
+    ids: List[str]
+    debuts: np.ndarray
+    medecins: np.ndarray
+
+    @classmethod
+    def depuis_medecins(cls, medecins: List[Medecin], nb_jours: int) -> "IndexParJour":
+        """Construit l'index à partir des disponibilités aplaties, par un tri stable sur le jour."""
+        lignes, jours = _aplatir_disponibilites(medecins)
+        return cls._depuis_tableaux([med.id for med in medecins], lignes, jours, nb_jours)
+
+    @classmethod
+    def _depuis_tableaux(cls, ids: List[str], lignes: np.ndarray, jours: np.ndarray, nb_jours: int) -> "IndexParJour":
+        dans_horizon = (jours >= 1) & (jours <= nb_jours)
+        lignes, jours = lignes[dans_horizon], jours[dans_horizon]
+        # Tri stable par jour : les médecins de chaque jour restent dans l'ordre d'entrée. Sur des clés de 16 bits,
+        # le tri stable de NumPy est un tri par base, linéaire.
+        ordre = np.argsort(jours.astype(np.uint16) if nb_jours < 2**16 else jours, kind="stable")
+        debuts = np.searchsorted(jours[ordre], np.arange(1, nb_jours + 2))
+        return cls(ids, debuts, lignes[ordre].astype(np.int32))
+
+    @property
+    def nb_jours(self) -> int:
+        return self.debuts.size - 1
+
+    def colonne(self, k: int) -> np.ndarray:
+        """Indices (croissants) des médecins disponibles dans la colonne k, soit le jour k + 1."""
+        return self.medecins[self.debuts[k]:self.debuts[k + 1]]
+
+    def medecins_disponibles(self, jour: int) -> np.ndarray:
+        """Indices (croissants) des médecins disponibles le jour donné."""
+        return self.colonne(jour - 1)
+
+    def candidats_par_jour(self) -> np.ndarray:
+        """Nombre de médecins disponibles pour chaque jour de 1 à nb_jours."""
+        return np.diff(self.debuts)
+
+
+@dataclass
+class Planning:
+    """
+    Emploi du temps compact : l'indice du médecin de garde pour chaque jour et le nombre de gardes de chaque médecin.
+
+    Les vues (DataFrame, table rich, CSV) ne sont construites qu'à la demande ; aucune cellule jours × médecins
+    n'est allouée tant que `to_dataframe` ou `to_rich` n'est pas appelé.
+
+    ## Attributes:
+        medecins (List[Medecin]): Les médecins planifiés ; `affectation` référence leurs positions dans cette liste.
+        vacances (List[PeriodeVacance]): Les périodes de vacances prises en compte.
+        nb_jours (int): Le nombre total de jours planifiés.
+        max_gardes (int): Le nombre maximum de gardes par médecin utilisé pour la planification.
+        affectation (np.ndarray): Tableau d'entiers de longueur nb_jours ; l'élément j est l'indice du médecin de garde le jour j + 1.
+        statistiques (Optional[object]): Statistiques éventuelles du solveur (par exemple `StatistiquesRecherche`).
+
+    ## Example:
+        >>> planning = planifier([Medecin("Dr. VIDAL", {1, 2}), Medecin("Dr. SENGEL", {2})], [PeriodeVacance("Noel", 2, 1)], 2, 2)
+        >>> planning.affectation, planning.gardes
+        (array([0, 1]), array([1, 1]))
+        >>> planning.medecin_de_garde(2)
+        'Dr. SENGEL'
+    """
+    medecins: List[Medecin]
+    vacances: List[PeriodeVacance]
+    nb_jours: int
+    max_gardes: int
+    affectation: np.ndarray
+    statistiques: Optional[object] = None
+
+    @property
+    def gardes(self) -> np.ndarray:
+        """Nombre de gardes de chaque médecin, dans l'ordre de `medecins`."""
+        return np.bincount(self.affectation[self.affectation >= 0], minlength=len(self.medecins))
+
+    def medecin_de_garde(self, jour: int) -> str:
+        """Identifiant du médecin de garde le jour donné (numéroté à partir de 1)."""
+        return self.medecins[int(self.affectation[jour - 1])].id
+
+    def _libelles(self) -> List[str]:
+        noms = CalendrierVacances(self.vacances, self.nb_jours).noms_par_jour()
+        return [f"Jour {j} {nom}" if nom else f"Jour {j}" for j, nom in enumerate(noms, start=1)]
+
+    def gardes_par_jour(self) -> Iterator[Tuple[int, str, str]]:
+        """Génère les triplets (jour, vacance, médecin), jour après jour."""
+        noms = CalendrierVacances(self.vacances, self.nb_jours).noms_par_jour()
+        for jour, (nom, idx) in enumerate(zip(noms, self.affectation.tolist()), start=1):
+            yield jour, nom, self.medecins[idx].id
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """Tableau jours × médecins de "X" et "-", identique au retour historique de `trouver_emploi_du_temps`."""
+        import pandas as pd
+
+        emploi_du_temps = {med.id: ["-"] * (self.nb_jours) for med in self.medecins}
+        for jour, idx in enumerate(self.affectation.tolist()):
+            emploi_du_temps[self.medecins[idx].id][jour] = "X"
+        df = pd.DataFrame(emploi_du_temps, index=self._libelles())
+        if self.statistiques is not None:
+            df.attrs["statistiques"] = self.statistiques
+        return df
+
+    def to_rich(self, debut: int = 1, fin: Optional[int] = None):
+        """Table rich jours × médecins pour les jours de `debut` à `fin` inclus (par défaut, toute la période)."""
+        from rich.table import Table
+
+        fin = self.nb_jours if fin is None else min(fin, self.nb_jours)
+        table = Table(title="Planning des Gardes")
+        for col in ["Jour"] + [med.id for med in self.medecins]:
+            table.add_column(col)
+        libelles = self._libelles()
+        for jour in range(debut, fin + 1):
+            ligne = ["-"] * len(self.medecins)
+            ligne[int(self.affectation[jour - 1])] = "X"
+            table.add_row(libelles[jour - 1], *ligne)
+        return table
+
+    def to_csv(self, fichier: IO[str]) -> None:
+        """Écrit le planning au format CSV long (jour, vacance, medecin), une ligne par jour."""
+        writer = csv.writer(fichier)
+        writer.writerow(["jour", "vacance", "medecin"])
+        writer.writerows(self.gardes_par_jour())
+
+
+def _aplatir_disponibilites(medecins: List[Medecin]) -> Tuple[np.ndarray, np.ndarray]:
+    """Renvoie deux tableaux parallèles (indice du médecin, jour) couvrant toutes les disponibilités."""
+    longueurs = np.fromiter((len(med.disponibilites) for med in medecins), dtype=np.int64, count=len(medecins))
+    jours = np.fromiter(
+        (jour for med in medecins for jour in med.disponibilites), dtype=np.int64, count=int(longueurs.sum())
+    )
+    lignes = np.repeat(np.arange(len(medecins)), longueurs)
+    return lignes, jours
+
 
 def jours_de_gardes(vacances: List[PeriodeVacance], nb_jours: int) -> Dict[int, str]:
     """
@@ -82,8 +481,10 @@ def jours_de_gardes(vacances: List[PeriodeVacance], nb_jours: int) -> Dict[int,
         vacances (List[PeriodeVacance]): Liste des périodes de vacances, chacune avec un nom, un jour de début et une durée.
         nb_jours (int): Le nombre total de jours considérés pour l'analyse, ce nombre doit être positif.
 
+    Le dictionnaire est construit à partir de `CalendrierVacances`, qui représente les mêmes informations par segments ;
+    seuls les jours de l'horizon y figurent, et un jour couvert par plusieurs périodes porte le nom de la dernière déclarée.
+
     ## Raises:
-        ValueError: Si la liste des périodes de vacances est vide.
         ValueError: Si le nombre de jours est inférieur ou égal à zéro ou est infini.
 
     ## Returns:
@@ -96,17 +497,7 @@ def jours_de_gardes(vacances: List[PeriodeVacance], nb_jours: int) -> Dict[int,
         >>> print(jours_vacances)
         {1: '', 2: '', 3: '', 4: '', 5: 'Noel', 6: 'Noel', 7: '', 8: '', 9: 'Ete', 10: 'Ete', 11: 'Ete', 12: '', 13: '', 14: '', 15: ''}
     """
-    if not vacances:
-        raise ValueError("La liste des périodes de vacances ne peut pas être vide.")
-    
-    if nb_jours <= 0 or nb_jours == float("inf"):
-        raise ValueError(f"Le nombre de jours doit être un entier positif, reçu: {nb_jours}")
-
-    jdg = {i + 1: "" for i in range(nb_jours)}
-    for vacance in vacances:
-        for i in range(vacance.debut, vacance.debut + vacance.duree):
-            jdg[i] = vacance.nom
-    return jdg
+    return CalendrierVacances(vacances, nb_jours).to_dict()
 
 
 def dispo_medecin(medecins: List[Medecin], nb_jours :int) -> Dict[int, List[int]]:
@@ -130,26 +521,282 @@ def dispo_medecin(medecins: List[Medecin], nb_jours :int) -> Dict[int, List[int]
         >>> print(disponibilites)
         {1: ["Dr. VIDAL"], 2: ["Dr. SENGEL"], 3: ["Dr. VIDAL", "Dr. SENGEL"], 5: ["Dr. VIDAL"]}
     """
+    _verifier_medecins(medecins)
+
+    lignes, jours = _aplatir_disponibilites(medecins)
+    ids = np.array([med.id for med in medecins], dtype=object)
+    index = IndexParJour._depuis_tableaux(ids.tolist(), lignes, jours, nb_jours)
+
+    dispo_med = {j: ids[index.medecins_disponibles(j)].tolist() for j in range(1, nb_jours + 1)}
+    hors_horizon = (jours < 1) | (jours > nb_jours)
+    for i, jour in zip(lignes[hors_horizon].tolist(), jours[hors_horizon].tolist()):
+        dispo_med.setdefault(jour, []).append(ids[i])
+    return dispo_med
+
+
+def charger_criteres(data: dict, nb_jours: int = 10, max_gardes: int = 3) -> Tuple[List[Medecin], List[PeriodeVacance], int, int]:
+    """
+    Construit les critères de planification à partir du contenu d'un fichier JSON (format produit par la commande `demo`).
+
+    ## Parameters:
+        data (dict): Dictionnaire avec les clés "medecins" et "vacances", et éventuellement "nb_jours" et "max_gardes".
+        nb_jours (int): Nombre de jours utilisé si le fichier ne le précise pas.
+        max_gardes (int): Nombre maximal de gardes utilisé si le fichier ne le précise pas.
+
+    Les médecins et les périodes sont validés en bloc (`Medecin.from_records`, `PeriodeVacance.from_records`) :
+    tous les enregistrements invalides du fichier sont signalés dans une seule erreur.
+
+    ## Raises:
+        KeyError: Si la clé "medecins" ou "vacances" est absente.
+        CriteresInvalides: Si des médecins ou des périodes de vacances ne sont pas valides (sous-classe de ValueError).
+
+    ## Returns:
+        Tuple[List[Medecin], List[PeriodeVacance], int, int]: Les médecins, les vacances, le nombre de jours et le nombre maximal de gardes.
+
+    ## Example:
+        >>> data = {"medecins": [{"id": "Dr. VIDAL", "disponibilites": [1, 2]}], "vacances": [], "nb_jours": 2}
+        >>> charger_criteres(data)
+        ([Medecin(id='Dr. VIDAL', disponibilites={1, 2})], [], 2, 3)
+    """
+    medecins, erreurs_medecins = Medecin._depuis_enregistrements(data["medecins"])
+    vacances, erreurs_vacances = PeriodeVacance._depuis_enregistrements(data["vacances"])
+    if erreurs_medecins or erreurs_vacances:
+        raise CriteresInvalides(erreurs_medecins + erreurs_vacances)
+    return medecins, vacances, data.get("nb_jours", nb_jours), data.get("max_gardes", max_gardes)
+
+
+def _verifier_medecins(medecins: List[Medecin]) -> None:
     if medecins is None:
         raise TypeError("La liste des médecins doit être de type List[Medecin], reçu None")
     if not medecins:
         raise ValueError("La liste des médecins ne peut pas être vide.")
 
-    dispo_med = {j : [] for j in range(1, nb_jours + 1)}
-    for medecin in medecins:
-        for jour in medecin.disponibilites:
-            if jour not in dispo_med:
-                dispo_med[jour] = []
-            dispo_med[jour].append(medecin.id)
-    return dispo_med
+
+def _verifier_vacances(nb_medecins: int, vacances: List[PeriodeVacance], precision: str = "") -> None:
+    """Refuse une période de vacances plus longue que le nombre de médecins : chacun n'en assure qu'un jour."""
+    duree_max_vac = max(v.duree for v in vacances) if vacances else 0
+    if nb_medecins < duree_max_vac:
+        raise ValueError(f"Nombre de médecins insuffisant{precision} pour couvrir la plus longue période de vacances de {duree_max_vac} jours.")
+
+
+class _EtatGlouton:
+    """Charge de chaque médecin et, pour chaque période, les médecins l'ayant déjà assurée."""
+    __slots__ = ("gardes_count", "deja_de_garde")
+
+    def __init__(self, nb_medecins: int):
+        self.gardes_count = np.zeros(nb_medecins, dtype=np.int64)
+        self.deja_de_garde: Dict[str, np.ndarray] = {}
+
+
+def _libres(disponibles: np.ndarray, gardes_count: np.ndarray, max_gardes: int, deja: Optional[np.ndarray]) -> np.ndarray:
+    """Masque des médecins pouvant prendre une garde : disponibles, sous `max_gardes` et sans garde dans la période en cours."""
+    libres = disponibles & (gardes_count < max_gardes)
+    if deja is not None:
+        libres &= ~deja
+    return libres
+
+
+def _choisir_medecins(candidats: np.ndarray, gardes_count: np.ndarray, besoin: int) -> np.ndarray:
+    """
+    Les `besoin` candidats (indices croissants) ayant le moins de gardes, à égalité dans l'ordre d'entrée, par charge
+    croissante. Un seul choix est un argmin ; plusieurs, une sélection partielle (`np.argpartition`) sur la clé
+    charge × nombre de médecins + indice, sans tri de tous les candidats.
+    """
+    if besoin == 1:
+        return candidats[[np.argmin(gardes_count[candidats])]]
+    cle = gardes_count[candidats] * gardes_count.size + candidats
+    if besoin < candidats.size:
+        selection = np.argpartition(cle, besoin - 1)[:besoin]
+        return candidats[selection[np.argsort(cle[selection])]]
+    return candidats[np.argsort(cle)]
+
+
+def _jour_impossible(jour: int, vacance_nom: str, sous_plafond: int, besoin: int) -> ValueError:
+    """
+    Erreur d'un jour sans assez de candidats ; la période de vacances en est la cause si, sans elle, il y en aurait eu
+    assez (`sous_plafond` : nombre de médecins disponibles ce jour-là et sous `max_gardes`).
+    """
+    if vacance_nom and sous_plafond >= besoin:
+        return ValueError(f"Les médecins disponibles pour {vacance_nom} ont déjà réalisé leur jour de garde et des jours sont encore sans médecins.")
+    return ValueError(f"Aucun médecin disponible pour le jour {jour}, impossible de compléter l'emploi du temps.")
+
+
+def _iterer_gardes(
+    index: Union[IndexParJour, MatriceDisponibilites],
+    calendrier: CalendrierVacances,
+    max_gardes: int,
+    profil: Optional[Profil] = None,
+    etat: Optional[_EtatGlouton] = None,
+    premier_jour: int = 1,
+    effectifs: Optional[np.ndarray] = None
+) -> Iterator[Tuple[int, int]]:
+    """
+    Coeur glouton de tous les solveurs gloutons : génère, jour après jour, les couples (jour, indice du médecin de garde).
+
+    Chaque jour est attribué au médecin disponible ayant le moins de gardes (à égalité, le premier dans
+    l'ordre d'entrée), soit le premier élément du tri stable de l'implémentation d'origine. Pendant une période
+    de vacances, les médecins l'ayant déjà assurée sont écartés des candidats. Les candidats du jour sont lus dans
+    la colonne du jour de l'index (`IndexParJour.colonne`) et filtrés sur le tableau des gardes, sans tri ni parcours
+    de l'emploi du temps déjà construit : chaque jour coûte une opération vectorisée sur ses seuls médecins
+    disponibles, et le coût total est proportionnel au nombre d'entrées de disponibilité (plus nb_jours).
+    Une `MatriceDisponibilites` est aussi acceptée (portfolio, minimisation) ; chaque colonne y coûte alors un
+    parcours de tous les médecins.
+    Avec un `profil`, le nombre de médecins disponibles et de candidats de chaque jour y est enregistré.
+
+    Avec `effectifs` (nombre de gardes de chaque jour de l'horizon, indexé par jour - 1), les `effectifs[jour - 1]`
+    candidats les moins chargés sont choisis ensemble (voir `_choisir_medecins`) et produits par charge croissante ;
+    sans, un médecin par jour.
+
+    L'horizon est parcouru segment par segment (`CalendrierVacances.segments`) : hors vacances, aucun contrôle de
+    période n'est fait ; pendant une période, les médecins l'ayant déjà assurée sont marqués dans un tableau
+    booléen propre à la période.
+
+    La planification par fenêtres appelle cette fonction fenêtre après fenêtre : les colonnes de `index` sont alors
+    les jours à partir de `premier_jour`, et l'`etat` (charges, périodes déjà assurées) passe d'une fenêtre à l'autre.
+    """
+    nb_medecins, nb_jours = len(index.ids), index.nb_jours
+    etat = _EtatGlouton(nb_medecins) if etat is None else etat
+    gardes_count, deja_de_garde = etat.gardes_count, etat.deja_de_garde
+    if profil is not None:
+        profil.compteurs_jours(nb_jours)
+
+    for debut, fin, vacance_nom in calendrier.segments(premier_jour, premier_jour + nb_jours - 1):
+        deja = deja_de_garde.setdefault(vacance_nom, np.zeros(nb_medecins, dtype=bool)) if vacance_nom else None
+        for jour in range(debut, fin + 1):
+            besoin = 1 if effectifs is None else int(effectifs[jour - 1])
+            disponibles = index.colonne(jour - premier_jour)
+            sous_plafond = disponibles[gardes_count[disponibles] < max_gardes]
+            candidats = sous_plafond if deja is None else sous_plafond[~deja[sous_plafond]]
+            if profil is not None:
+                profil.disponibles[jour - premier_jour] = disponibles.size
+                profil.candidats[jour - premier_jour] = candidats.size
+            if candidats.size < besoin:
+                raise _jour_impossible(jour, vacance_nom, sous_plafond.size, besoin)
+            if not besoin:
+                continue
+            choisis = _choisir_medecins(candidats, gardes_count, besoin)
+
+            if deja is not None:
+                deja[choisis] = True
+            gardes_count[choisis] += 1
+            for choisi in choisis.tolist():
+                yield jour, choisi
+
+
+def _affecter_gardes(
+    index: Union[IndexParJour, MatriceDisponibilites],
+    calendrier: CalendrierVacances,
+    max_gardes: int,
+    profil: Optional[Profil] = None
+) -> np.ndarray:
+    """Renvoie, pour chaque jour, l'indice du médecin de garde choisi par `_iterer_gardes`."""
+    affectation = np.full(index.nb_jours, -1, dtype=np.int64)
+    for jour, choisi in _iterer_gardes(index, calendrier, max_gardes, profil):
+        affectation[jour - 1] = choisi
+    return affectation
+
+
+def planifier(
+    medecins: List[Medecin],
+    vacances: List[PeriodeVacance],
+    nb_jours: int,
+    max_gardes: int,
+    verifier: bool = False,
+    solver: str = "glouton",
+    budget_noeuds: Optional[int] = 100_000,
+    budget_secondes: Optional[float] = 10.0,
+    profil: Optional[Profil] = None
+) -> Planning:
+    """
+    Planifie l'emploi du temps des gardes et le renvoie sous forme compacte (`Planning`), sans construire de DataFrame.
+
+    ## Parameters:
+        medecins (List[Medecin]): Liste des médecins avec leurs identifiants et disponibilités.
+        vacances (List[PeriodeVacance]): Liste des périodes de vacances, avec un nom, un jour de début, et une durée pour chaque période.
+        max_gardes (int): Le nombre maximum de gardes qu'un médecin peut avoir pendant la période spécifiée.
+        nb_jours (int): Le nombre total de jours sur lesquels l'emploi du temps est planifié.
+        verifier (bool): Si vrai, vérifie d'abord par un calcul de flot (`verifier_faisabilite`) qu'un emploi du temps existe.
+        solver (str): "glouton" (par défaut) ou "exact", une recherche avec retour arrière qui trouve un emploi du temps
+            dès qu'il en existe un, dans la limite de `budget_noeuds` affectations essayées et de `budget_secondes` secondes.
+            Les statistiques de la recherche exacte sont disponibles dans `planning.statistiques`.
+            "portfolio" exécute en parallèle des variantes de l'algorithme glouton départageant différemment les égalités
+            (voir `resoudre_portfolio`) et renvoie la première qui aboutit dans la limite de `budget_secondes`.
+        profil (Optional[Profil]): Si fourni, reçoit la durée et le pic mémoire de chaque phase (calendrier des vacances,
+            vérification, disponibilités, affectation) et les compteurs de candidats par jour du solveur glouton.
+
+    ## Raises :
+        ValueError: Si la durée de la plus grande période de vacances est supérieure au nombre de médecins.
+        ValueError: Si `verifier` est vrai et que l'instance est infaisable ; le message liste les jours en défaut.
+        ValueError: Si le solveur exact ou portfolio prouve l'instance infaisable ou épuise son budget.
+        ValueError: Si aucune variante du solveur portfolio n'aboutit.
+        ValueError: Si `solver` n'est ni "glouton", ni "exact", ni "portfolio".
+        ValueError: Si il existe un jour sans médecin disponible (soit aucun médecin n'est disponible ce jour, soit les médecins disponibles ce jour ont atteint le nombre maximal de gardes)
+
+    ## Returns:
+        Planning: L'indice du médecin de garde pour chaque jour ; `to_dataframe()`, `to_rich()` et `to_csv()` en donnent des vues.
+
+    ## Example:
+        >>> planning = planifier(medecins, vacances, 10, 3)
+        >>> planning.gardes
+        array([2, 2, 2, 2, 2])
+    """
+    _verifier_vacances(len(medecins), vacances)
+
+    if verifier:
+        from planning_medecin.faisabilite import verifier_faisabilite
+
+        with _phase(profil, "verification"):
+            faisabilite = verifier_faisabilite(medecins, vacances, nb_jours, max_gardes)
+        if not faisabilite.faisable:
+            raise ValueError(faisabilite.message())
+
+    with _phase(profil, "calendrier"):
+        calendrier = CalendrierVacances(vacances, nb_jours)
+    _verifier_medecins(medecins)
+    if solver == "glouton":
+        with _phase(profil, "disponibilites"):
+            index = IndexParJour.depuis_medecins(medecins, nb_jours)
+        with _phase(profil, "affectation"):
+            affectation = _affecter_gardes(index, calendrier, max_gardes, profil)
+        return Planning(medecins, vacances, nb_jours, max_gardes, affectation)
+    with _phase(profil, "disponibilites"):
+        index = MatriceDisponibilites.depuis_medecins(medecins, nb_jours)
+    if solver == "exact":
+        from planning_medecin.solveur_exact import resoudre_exact
+
+        with _phase(profil, "affectation"):
+            affectation, statistiques = resoudre_exact(index, calendrier, max_gardes, budget_noeuds, budget_secondes)
+        if affectation is None:
+            if statistiques.statut == "budget":
+                raise ValueError(f"Budget de recherche épuisé sans emploi du temps ({statistiques.noeuds} noeuds, {statistiques.duree:.2f} s).")
+            raise ValueError("Aucun emploi du temps ne respecte les contraintes, impossible de compléter l'emploi du temps.")
+        return Planning(medecins, vacances, nb_jours, max_gardes, np.array(affectation, dtype=np.int64), statistiques)
+    if solver == "portfolio":
+        from planning_medecin.portfolio import resoudre_portfolio
+
+        with _phase(profil, "affectation"):
+            affectation, statistiques = resoudre_portfolio(index, calendrier, max_gardes, budget_secondes)
+        if affectation is None:
+            if statistiques.statut == "budget":
+                raise ValueError(f"Budget de temps épuisé sans emploi du temps ({statistiques.essais} variantes, {statistiques.duree:.2f} s).")
+            if statistiques.statut == "echec":
+                raise ValueError(f"Aucune des {statistiques.essais} variantes de l'algorithme glouton n'a abouti, impossible de compléter l'emploi du temps.")
+            raise ValueError("Aucun emploi du temps ne respecte les contraintes, impossible de compléter l'emploi du temps.")
+        return Planning(medecins, vacances, nb_jours, max_gardes, affectation, statistiques)
+    raise ValueError(f"Solveur inconnu : {solver!r} (attendu : 'glouton', 'exact' ou 'portfolio')")
 
 
 def trouver_emploi_du_temps(
     medecins: List[Medecin],
     vacances: List[PeriodeVacance],
     nb_jours: int,
-    max_gardes: int
-) -> pd.DataFrame:
+    max_gardes: int,
+    verifier: bool = False,
+    solver: str = "glouton",
+    budget_noeuds: Optional[int] = 100_000,
+    budget_secondes: Optional[float] = 10.0,
+    profil: Optional[Profil] = None
+) -> "pd.DataFrame":
     """
     Planifie l'emploi du temps des gardes pour les médecins sur une période donnée, en prenant en compte leurs disponibilités et les périodes de vacances spécifiées.
 
@@ -158,13 +805,24 @@ def trouver_emploi_du_temps(
         vacances (List[PeriodeVacance]): Liste des périodes de vacances, avec un nom, un jour de début, et une durée pour chaque période.
         max_gardes (int): Le nombre maximum de gardes qu'un médecin peut avoir pendant la période spécifiée.
         nb_jours (int): Le nombre total de jours sur lesquels l'emploi du temps est planifié.
+        verifier (bool): Si vrai, vérifie d'abord par un calcul de flot (`verifier_faisabilite`) qu'un emploi du temps existe.
+        solver (str): "glouton" (par défaut) ou "exact", une recherche avec retour arrière qui trouve un emploi du temps
+            dès qu'il en existe un, dans la limite de `budget_noeuds` affectations essayées et de `budget_secondes` secondes.
+            Les statistiques de la recherche exacte sont disponibles dans `df.attrs["statistiques"]`.
+            "portfolio" exécute en parallèle des variantes de l'algorithme glouton départageant différemment les égalités
+            (voir `resoudre_portfolio`) et renvoie la première qui aboutit dans la limite de `budget_secondes`.
+        profil (Optional[Profil]): Si fourni, reçoit les mesures de `planifier` et la durée de construction du DataFrame.
 
     ## Raises :
         ValueError: Si la durée de la plus grande période de vacances est supérieure au nombre de médecins.
+        ValueError: Si `verifier` est vrai et que l'instance est infaisable ; le message liste les jours en défaut.
+        ValueError: Si le solveur exact ou portfolio prouve l'instance infaisable ou épuise son budget.
+        ValueError: Si aucune variante du solveur portfolio n'aboutit.
+        ValueError: Si `solver` n'est ni "glouton", ni "exact", ni "portfolio".
         ValueError: Si il existe un jour sans médecin disponible (soit aucun médecin n'est disponible ce jour, soit les médecins disponibles ce jour ont atteint le nombre maximal de gardes)
 
     ## Returns:
-        pd.DataFrame: Un DataFrame où les lignes représentent les jours et les colonnes les médecins, avec des marquages indiquant les jours où chaque médecin est en garde.
+        pd.DataFrame: Un DataFrame où les lignes représentent les jours et les colonnes les médecins, avec des marquages indiquant les jours où chaque médecin est en garde (vue `Planning.to_dataframe()` du résultat de `planifier`).
 
     ## Example:
         >>> medecins = medecins = [
@@ -191,43 +849,64 @@ def trouver_emploi_du_temps(
         Jour 9 Ete               -          -            -        X         -
         Jour 10                  -          -            -        -         X
     """
-    duree_max_vac = max(v.duree for v in vacances) if vacances else 0
-    if len(medecins) < duree_max_vac:
-        raise ValueError(f"Nombre de médecins insuffisant pour couvrir la plus longue période de vacances de {duree_max_vac} jours.")
-
-    jours_garde = jours_de_gardes(vacances, nb_jours)
-    dispo_medecins = dispo_medecin(medecins, nb_jours)
-    emploi_du_temps = {med.id: ["-"] * (nb_jours) for med in medecins}
-    gardes_vacance = {med.id: {v.nom: False for v in vacances} for med in medecins}
-    gardes_count = {med.id: 0 for med in medecins}
-
-    for jour in range(1, nb_jours + 1):
-        vacance_nom = jours_garde[jour]
-        medecins_jour = [
-            (med_id, gardes_count[med_id])
-            for med_id in dispo_medecins.get(jour, [])
-            if gardes_count[med_id] < max_gardes
-        ]
-        medecins_jour.sort(key=lambda x: x[1]) 
-
-        if not medecins_jour:
-            raise ValueError(f"Aucun médecin disponible pour le jour {jour}, impossible de compléter l'emploi du temps.")
-
-        for med_id, _ in medecins_jour:
-            if all(emploi_du_temps[m][jour - 1] == "-" for m in emploi_du_temps):
-                if vacance_nom:
-                    if not gardes_vacance[med_id][vacance_nom]:
-                        gardes_vacance[med_id][vacance_nom] = True
-                        emploi_du_temps[med_id][jour-1] = "X"
-                        gardes_count[med_id] += 1
-                        break
-                    else :
-                        raise ValueError(f"Les médecins disponibles pour {vacance_nom} ont déjà réalisé leur jour de garde et des jours sont encore sans médecins.")
-                else:
-                    emploi_du_temps[med_id][jour-1] = "X"
-                    gardes_count[med_id] += 1
-                    break
-
-    index_labels = [f"Jour {j} {jours_garde[j]}" if jours_garde[j] else f"Jour {j}" for j in range(1, nb_jours + 1)]
-    df = pd.DataFrame(emploi_du_temps, index=index_labels)
-    return df
+    planning = planifier(medecins, vacances, nb_jours, max_gardes, verifier, solver, budget_noeuds, budget_secondes, profil)
+    with _phase(profil, "dataframe"):
+        return planning.to_dataframe()
+
+
+def iter_emplois_du_temps(
+    medecins: List[Medecin],
+    vacances: List[PeriodeVacance],
+    nb_jours: int,
+    max_gardes: int,
+    symetries: bool = False,
+    budget_noeuds: Optional[int] = 100_000,
+    budget_secondes: Optional[float] = 10.0,
+    statistiques: Optional["StatistiquesRecherche"] = None
+) -> Iterator[Planning]:
+    """
+    Génère, un par un et à la demande, des emplois du temps valides deux à deux distincts.
+
+    Les emplois du temps sont ceux de la recherche exacte (`solver="exact"`), produits au fil de l'exploration :
+    seules les solutions effectivement consommées sont calculées, et le premier est celui de `planifier(..., solver="exact")`.
+    Le générateur s'arrête quand toutes les solutions ont été produites ou qu'un budget (partagé par toute
+    l'énumération) est atteint ; les statistiques de la recherche sont communes à tous les plannings produits.
+    Une fois le générateur terminé, `statistiques.statut` distingue les deux cas : "epuise" (ou "infaisable" si
+    aucun planning n'existe) quand toutes les solutions ont été produites, "budget" quand la recherche a été interrompue.
+
+    ## Parameters:
+        medecins (List[Medecin]): Liste des médecins avec leurs identifiants et disponibilités.
+        vacances (List[PeriodeVacance]): Liste des périodes de vacances (éventuellement vide).
+        nb_jours (int): Le nombre total de jours sur lesquels l'emploi du temps est planifié.
+        max_gardes (int): Le nombre maximum de gardes qu'un médecin peut avoir pendant la période spécifiée.
+        symetries (bool): Si vrai, deux emplois du temps qui ne diffèrent que par l'échange de médecins ayant
+            exactement les mêmes disponibilités ne sont produits qu'une fois.
+        budget_noeuds (Optional[int]): Nombre maximal d'affectations essayées sur toute l'énumération.
+        budget_secondes (Optional[float]): Durée maximale de recherche sur toute l'énumération ; le temps passé par
+            l'appelant entre deux plannings n'est pas compté.
+        statistiques (Optional[StatistiquesRecherche]): Si fourni, reçoit les statistiques de la recherche, y compris
+            son statut final, consultable même si aucun planning n'a été produit.
+
+    ## Raises:
+        ValueError: Si la durée de la plus grande période de vacances est supérieure au nombre de médecins.
+
+    ## Returns:
+        Iterator[Planning]: Les emplois du temps ; aucun si l'instance est infaisable.
+
+    ## Example:
+        >>> from itertools import islice
+        >>> for planning in islice(iter_emplois_du_temps(medecins, vacances, 10, 3, symetries=True), 3):
+        ...     print(planning.affectation)
+        [0 1 2 3 4 1 2 0 3 4]
+        [0 1 2 3 4 1 2 0 3 1]
+        [0 1 2 3 4 1 2 0 3 3]
+    """
+    from planning_medecin.solveur_exact import StatistiquesRecherche, enumerer_solutions
+
+    _verifier_vacances(len(medecins), vacances)
+    calendrier = CalendrierVacances(vacances, nb_jours)
+    _verifier_medecins(medecins)
+    index = MatriceDisponibilites.depuis_medecins(medecins, nb_jours)
+    statistiques = StatistiquesRecherche() if statistiques is None else statistiques
+    for affectation in enumerer_solutions(index, calendrier, max_gardes, statistiques, budget_noeuds, budget_secondes, symetries):
+        yield Planning(medecins, vacances, nb_jours, max_gardes, np.array(affectation, dtype=np.int64), statistiques)
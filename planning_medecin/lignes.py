@@ -0,0 +1,296 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from planning_medecin.calendrier import CalendrierVacances
+from planning_medecin.lib_hp import (
+    CriteresInvalides,
+    Medecin,
+    PeriodeVacance,
+    MatriceDisponibilites,
+    _EtatGlouton,
+    _choisir_medecins,
+    _jour_impossible,
+    _libres,
+    _verifier_medecins,
+    _verifier_vacances,
+)
+from planning_medecin.lot import _initialiser_worker
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass
+class Composante:
+    """
+    Sous-problème indépendant : des lignes de garde reliées par des médecins communs, résolues ensemble.
+
+    ## Attributes:
+        lignes (List[str]): Les lignes de la composante, dans l'ordre de déclaration.
+        medecins (List[int]): Positions (dans la liste complète) des médecins rattachés à ces lignes.
+        duree (float): Durée de résolution de la composante, en secondes, mesurée dans son processus.
+        erreur (Optional[str]): Message d'erreur si la composante n'a pas pu être planifiée.
+    """
+    lignes: List[str]
+    medecins: List[int]
+    duree: float = 0.0
+    erreur: Optional[str] = None
+
+
+@dataclass
+class PlanningLignes:
+    """
+    Emploi du temps de plusieurs lignes de garde : un médecin par jour et par ligne.
+
+    ## Attributes:
+        medecins (List[Medecin]): Tous les médecins ; `affectation` référence leurs positions dans cette liste.
+        vacances (List[PeriodeVacance]): Les périodes de vacances, communes à toutes les lignes.
+        nb_jours (int): Le nombre total de jours planifiés.
+        max_gardes (int): Le nombre maximum de gardes par médecin, toutes lignes confondues.
+        lignes (List[str]): Les lignes de garde ; la colonne k de `affectation` correspond à `lignes[k]`.
+        affectation (np.ndarray): Tableau (nb_jours, nombre de lignes) des indices des médecins de garde.
+        composantes (List[Composante]): Les sous-problèmes résolus et leur durée.
+    """
+    medecins: List[Medecin]
+    vacances: List[PeriodeVacance]
+    nb_jours: int
+    max_gardes: int
+    lignes: List[str]
+    affectation: np.ndarray
+    composantes: List[Composante]
+
+    @property
+    def gardes(self) -> np.ndarray:
+        """Nombre de gardes de chaque médecin, toutes lignes confondues."""
+        return np.bincount(self.affectation.ravel(), minlength=len(self.medecins))
+
+    def gardes_par_jour(self) -> Iterator[Tuple[int, str, str, str]]:
+        """Génère les quadruplets (jour, ligne, vacance, médecin), jour après jour puis ligne après ligne."""
+        noms = CalendrierVacances(self.vacances, self.nb_jours).noms_par_jour()
+        for jour, (nom, ligne_affectation) in enumerate(zip(noms, self.affectation.tolist()), start=1):
+            for ligne, idx in zip(self.lignes, ligne_affectation):
+                yield jour, ligne, nom, self.medecins[idx].id
+
+    def _libelles(self) -> List[str]:
+        noms = CalendrierVacances(self.vacances, self.nb_jours).noms_par_jour()
+        return [f"Jour {j} {nom}" if nom else f"Jour {j}" for j, nom in enumerate(noms, start=1)]
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """Tableau jours × lignes des identifiants des médecins de garde."""
+        import pandas as pd
+
+        ids = np.array([med.id for med in self.medecins], dtype=object)
+        return pd.DataFrame(ids[self.affectation], index=self._libelles(), columns=self.lignes)
+
+    def to_rich(self):
+        """Table rich jours × lignes des médecins de garde."""
+        from rich.table import Table
+
+        table = Table(title="Planning des Gardes par ligne")
+        for col in ["Jour"] + self.lignes:
+            table.add_column(col)
+        for libelle, ligne_affectation in zip(self._libelles(), self.affectation.tolist()):
+            table.add_row(libelle, *[self.medecins[idx].id for idx in ligne_affectation])
+        return table
+
+
+def charger_lignes(data: dict) -> Dict[str, List[int]]:
+    """
+    Lit les lignes de garde d'un fichier de critères : chaque enregistrement de médecin porte une clé "lignes",
+    la liste des lignes (services, départements...) auxquelles il est rattaché. Un médecin sans ligne ne serait
+    jamais planifié : dès qu'un médecin du fichier déclare des lignes, tous doivent en déclarer au moins une.
+
+    ## Raises:
+        CriteresInvalides: Si la clé "lignes" d'un médecin est absente, vide ou n'est pas une liste de noms.
+
+    ## Returns:
+        Dict[str, List[int]]: Pour chaque ligne, dans l'ordre de première apparition, les positions de ses médecins.
+
+    ## Example:
+        >>> charger_lignes({"medecins": [{"id": "A", "disponibilites": [1], "lignes": ["Cardio", "Urgences"]},
+        ...                              {"id": "B", "disponibilites": [1], "lignes": ["Urgences"]}]})
+        {'Cardio': [0], 'Urgences': [0, 1]}
+    """
+    lignes: Dict[str, List[int]] = {}
+    erreurs = []
+    for i, record in enumerate(data["medecins"]):
+        noms = record.get("lignes")
+        if noms is None or noms == []:
+            erreurs.append(f"Médecin n°{i + 1} ({record.get('id')!r}) : aucune ligne de garde, le médecin ne serait jamais planifié")
+            continue
+        if not isinstance(noms, list) or not all(isinstance(nom, str) for nom in noms):
+            erreurs.append(f"Médecin n°{i + 1} ({record.get('id')!r}) : \"lignes\" doit être une liste de noms de lignes")
+            continue
+        for nom in dict.fromkeys(noms):
+            lignes.setdefault(nom, []).append(i)
+    if erreurs:
+        raise CriteresInvalides(erreurs)
+    return lignes
+
+
+def _composantes(lignes: Dict[str, List[int]]) -> List[List[str]]:
+    """Regroupe les lignes reliées, directement ou de proche en proche, par des médecins communs (union-find)."""
+    parent = {nom: nom for nom in lignes}
+
+    def racine(nom: str) -> str:
+        while parent[nom] != nom:
+            parent[nom] = parent[parent[nom]]
+            nom = parent[nom]
+        return nom
+
+    premiere_ligne: Dict[int, str] = {}
+    for nom, membres in lignes.items():
+        for i in membres:
+            if i in premiere_ligne:
+                parent[racine(nom)] = racine(premiere_ligne[i])
+            else:
+                premiere_ligne[i] = nom
+    groupes: Dict[str, List[str]] = {}
+    for nom in lignes:
+        groupes.setdefault(racine(nom), []).append(nom)
+    return list(groupes.values())
+
+
+def _affecter_lignes(
+    index: MatriceDisponibilites,
+    membres: np.ndarray,
+    calendrier: CalendrierVacances,
+    max_gardes: int
+) -> np.ndarray:
+    """
+    Algorithme glouton de `planifier` étendu à plusieurs lignes : chaque jour, ligne après ligne, le médecin de la
+    ligne disponible ayant le moins de gardes (à égalité, le premier) est choisi. Un médecin n'assure qu'une garde
+    par jour, au plus `max_gardes` au total et une seule par période de vacances, toutes lignes confondues : les
+    règles de choix et de vacances sont celles du coeur glouton partagé (`_libres`, `_choisir_medecins`).
+    Avec une seule ligne, les choix sont exactement ceux de `planifier`.
+
+    `membres` est la matrice booléenne lignes × médecins des rattachements ; le résultat est le tableau
+    (nb_jours, nombre de lignes) des indices des médecins de garde.
+    """
+    nb_medecins, nb_jours = index.matrice.shape
+    etat = _EtatGlouton(nb_medecins)
+    gardes_count = etat.gardes_count
+    affectation = np.empty((nb_jours, membres.shape[0]), dtype=np.int64)
+
+    for debut, fin, vacance_nom in calendrier.segments():
+        deja = etat.deja_de_garde.setdefault(vacance_nom, np.zeros(nb_medecins, dtype=bool)) if vacance_nom else None
+        for jour in range(debut, fin + 1):
+            disponibles = index.matrice[:, jour - 1].copy()
+            for ligne in range(membres.shape[0]):
+                sur_la_ligne = disponibles & membres[ligne]
+                candidats = np.flatnonzero(_libres(sur_la_ligne, gardes_count, max_gardes, deja))
+                if not candidats.size:
+                    raise _jour_impossible(jour, vacance_nom, np.count_nonzero(sur_la_ligne & (gardes_count < max_gardes)), 1)
+                choisi = int(_choisir_medecins(candidats, gardes_count, 1)[0])
+                if deja is not None:
+                    deja[choisi] = True
+                gardes_count[choisi] += 1
+                disponibles[choisi] = False
+                affectation[jour - 1, ligne] = choisi
+    return affectation
+
+
+def _resoudre_composante(
+    medecins: List[Medecin],
+    lignes: List[str],
+    membres: np.ndarray,
+    vacances: List[PeriodeVacance],
+    nb_jours: int,
+    max_gardes: int
+) -> Tuple[Optional[np.ndarray], Optional[str], float]:
+    """Planifie une composante (dans un processus du pool) ; renvoie (affectation locale, erreur, durée)."""
+    debut = time.perf_counter()
+    try:
+        for ligne, rattaches in zip(lignes, membres.sum(axis=1).tolist()):
+            _verifier_vacances(rattaches, vacances, f" sur la ligne {ligne}")
+        calendrier = CalendrierVacances(vacances, nb_jours)
+        index = MatriceDisponibilites.depuis_medecins(medecins, nb_jours)
+        affectation = _affecter_lignes(index, membres, calendrier, max_gardes)
+    except ValueError as erreur:
+        return None, str(erreur), time.perf_counter() - debut
+    return affectation, None, time.perf_counter() - debut
+
+
+def planifier_par_lignes(
+    medecins: List[Medecin],
+    lignes: Dict[str, List[int]],
+    vacances: List[PeriodeVacance],
+    nb_jours: int,
+    max_gardes: int,
+    workers: Optional[int] = None
+) -> PlanningLignes:
+    """
+    Planifie plusieurs lignes de garde (un médecin par jour et par ligne) en les découpant en composantes indépendantes.
+
+    Deux lignes sans médecin commun, même de proche en proche, ne partagent aucune contrainte : chaque composante
+    est un sous-problème résolu séparément, sur la seule matrice de disponibilités de ses médecins, et les
+    composantes sont réparties sur un pool de processus (les plus grandes d'abord). Les résultats sont réunis
+    dans un seul planning, avec la durée de chaque composante. Une ligne dont tous les médecins ne sont rattachés
+    qu'à elle est planifiée exactement comme par `planifier` sur ses médecins.
+
+    ## Parameters:
+        medecins (List[Medecin]): Tous les médecins, avec leurs disponibilités.
+        lignes (Dict[str, List[int]]): Pour chaque ligne, les positions de ses médecins dans `medecins` (voir `charger_lignes`).
+        vacances (List[PeriodeVacance]): Les périodes de vacances, communes à toutes les lignes.
+        nb_jours (int): Le nombre total de jours sur lesquels l'emploi du temps est planifié.
+        max_gardes (int): Le nombre maximum de gardes d'un médecin, toutes lignes confondues.
+        workers (Optional[int]): Nombre de processus ; par défaut, le nombre de coeurs. Une seule composante, ou
+            `workers=1`, est résolue dans le processus courant.
+
+    ## Raises:
+        TypeError: Si 'medecins' est None.
+        ValueError: Si 'medecins' est une liste vide ou si aucune ligne n'est déclarée.
+        ValueError: Si au moins une composante ne peut pas être planifiée ; le message indique, pour chacune,
+            ses lignes et la cause.
+
+    ## Returns:
+        PlanningLignes: Le planning jours × lignes et les composantes résolues.
+
+    ## Example:
+        >>> medecins = [Medecin("Dr. VIDAL", {1, 2}), Medecin("Dr. SENGEL", {1, 2}), Medecin("Dr. LECH", {1, 2})]
+        >>> planning = planifier_par_lignes(medecins, {"Cardio": [0, 1], "Urgences": [2]}, [], 2, 2)
+        >>> planning.affectation
+        array([[0, 2],
+               [1, 2]])
+        >>> [(c.lignes, c.medecins) for c in planning.composantes]
+        [(['Cardio'], [0, 1]), (['Urgences'], [2])]
+    """
+    _verifier_medecins(medecins)
+    if not lignes:
+        raise ValueError("Aucune ligne de garde déclarée.")
+    composantes, taches = [], []
+    for noms in _composantes(lignes):
+        indices = sorted(set(chain.from_iterable(lignes[nom] for nom in noms)))
+        position = {i: k for k, i in enumerate(indices)}
+        membres = np.zeros((len(noms), len(indices)), dtype=bool)
+        for k, nom in enumerate(noms):
+            membres[k, [position[i] for i in lignes[nom]]] = True
+        composantes.append(Composante(noms, indices))
+        taches.append(([medecins[i] for i in indices], noms, membres, vacances, nb_jours, max_gardes))
+
+    # Les plus grandes composantes d'abord, pour que la dernière tâche du pool soit courte.
+    ordre = sorted(range(len(taches)), key=lambda k: -len(composantes[k].medecins) * len(composantes[k].lignes))
+    if len(taches) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(taches)), initializer=_initialiser_worker) as pool:
+            resultats = list(pool.map(_resoudre_composante, *zip(*(taches[k] for k in ordre))))
+    else:
+        resultats = [_resoudre_composante(*taches[k]) for k in ordre]
+
+    noms_lignes = list(lignes)
+    colonne = {nom: k for k, nom in enumerate(noms_lignes)}
+    affectation = np.empty((nb_jours, len(noms_lignes)), dtype=np.int64)
+    for k, (locale, erreur, duree) in zip(ordre, resultats):
+        composante = composantes[k]
+        composante.duree, composante.erreur = duree, erreur
+        if locale is not None:
+            affectation[:, [colonne[nom] for nom in composante.lignes]] = np.asarray(composante.medecins)[locale]
+    echecs = [c for c in composantes if c.erreur is not None]
+    if echecs:
+        raise ValueError("\n".join(f"Ligne(s) {', '.join(c.lignes)} : {c.erreur}" for c in echecs))
+    return PlanningLignes(medecins, vacances, nb_jours, max_gardes, noms_lignes, affectation, composantes)
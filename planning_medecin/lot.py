@@ -0,0 +1,91 @@
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+
+def lister_scenarios(motif: str) -> List[str]:
+    """
+    Liste les fichiers de critères désignés par un dossier (tous ses fichiers .json) ou par un motif glob.
+
+    ## Example:
+        >>> lister_scenarios("scenarios/")
+        ['scenarios/cardio_janvier.json', 'scenarios/cardio_fevrier.json']
+    """
+    if os.path.isdir(motif):
+        return sorted(glob.glob(os.path.join(motif, "*.json")))
+    return sorted(glob.glob(motif, recursive=True))
+
+
+def _initialiser_worker():
+    """Importe numpy et la bibliothèque une seule fois par processus, avant le premier scénario."""
+    import planning_medecin.lib_hp  # noqa: F401
+
+
+def _sorties(chemins: List[str], dossier_sortie: str) -> List[str]:
+    """
+    Chemin du planning CSV de chaque scénario : son chemin relatif au dossier commun à tous les scénarios, avec
+    l'extension .csv, dans `dossier_sortie`. Deux scénarios de même nom dans des dossiers différents
+    (`a/s1.json` et `b/s1.json`) donnent ainsi `a/s1.csv` et `b/s1.csv`.
+    """
+    if not chemins:
+        return []
+    racine = os.path.commonpath([os.path.dirname(os.path.abspath(chemin)) for chemin in chemins])
+    return [
+        os.path.join(dossier_sortie, str(Path(os.path.relpath(os.path.abspath(chemin), racine)).with_suffix(".csv")))
+        for chemin in chemins
+    ]
+
+
+def _resoudre_scenario(chemin: str, sortie: str, solver: str) -> dict:
+    """Résout un fichier de critères, écrit le planning en CSV dans `sortie` et renvoie la ligne du résumé correspondante."""
+    from planning_medecin.lib_hp import charger_criteres, planifier
+
+    debut = time.perf_counter()
+    try:
+        with open(chemin, "r") as file:
+            data = json.load(file)
+        medecins, vacances, nb_jours, max_gardes = charger_criteres(data)
+        planning = planifier(medecins, vacances, nb_jours, max_gardes, solver=solver)
+        os.makedirs(os.path.dirname(sortie), exist_ok=True)
+        with open(sortie, "w", newline="") as file:
+            planning.to_csv(file)
+    except Exception as erreur:  # un scénario défectueux ne doit pas interrompre le lot
+        return {"fichier": chemin, "statut": "echec", "duree": time.perf_counter() - debut, "erreur": f"{type(erreur).__name__}: {erreur}"}
+    return {"fichier": chemin, "statut": "ok", "duree": time.perf_counter() - debut, "sortie": sortie}
+
+
+def resoudre_lot(chemins: List[str], dossier_sortie: str, workers: Optional[int] = None, solver: str = "glouton") -> List[dict]:
+    """
+    Résout plusieurs fichiers de critères en parallèle sur un pool de processus.
+
+    Chaque processus importe numpy et la bibliothèque une seule fois à son démarrage puis enchaîne les scénarios.
+    Un planning CSV est écrit par scénario résolu dans `dossier_sortie`, sous le chemin du scénario relatif au
+    dossier commun à tous les scénarios (les sous-dossiers sont reproduits), ainsi qu'un fichier `resume.json`
+    regroupant la durée et le statut (ou l'erreur) de chaque scénario : l'échec d'un scénario, quelle qu'en soit
+    la cause, est consigné dans le résumé sans interrompre les autres.
+
+    ## Parameters:
+        chemins (List[str]): Fichiers de critères au format de la commande `demo`.
+        dossier_sortie (str): Dossier où écrire les plannings et le résumé (créé si besoin).
+        workers (Optional[int]): Nombre de processus ; par défaut, le nombre de coeurs.
+        solver (str): Solveur passé à `trouver_emploi_du_temps`.
+
+    ## Returns:
+        List[dict]: Une entrée par scénario, dans l'ordre de `chemins`.
+    """
+    os.makedirs(dossier_sortie, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initialiser_worker) as pool:
+        resume = list(pool.map(
+            _resoudre_scenario,
+            chemins,
+            _sorties(chemins, dossier_sortie),
+            [solver] * len(chemins),
+            chunksize=max(1, len(chemins) // (4 * (workers or os.cpu_count() or 1))),
+        ))
+    with open(os.path.join(dossier_sortie, "resume.json"), "w") as file:
+        json.dump(resume, file, indent=2)
+    return resume
@@ -0,0 +1,115 @@
+import math
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from planning_medecin.calendrier import CalendrierVacances
+from planning_medecin.faisabilite import _construire_reseau, verifier_faisabilite
+from planning_medecin.lib_hp import (
+    Medecin,
+    PeriodeVacance,
+    MatriceDisponibilites,
+    Planning,
+    _affecter_gardes,
+    _verifier_medecins,
+)
+
+
+@dataclass
+class PlafondMinimal:
+    """
+    Résultat de `minimiser_max_gardes`.
+
+    ## Attributes:
+        max_gardes (int): Le plus petit nombre maximal de gardes par médecin pour lequel un emploi du temps existe.
+        planning (Planning): Un emploi du temps respectant ce plafond.
+        verifications (int): Nombre de calculs de flot effectués par la recherche dichotomique.
+        solveur (str): "glouton" si le planning vient de l'algorithme glouton, "flot" s'il a fallu reprendre
+            l'affectation du calcul de flot (le glouton peut échouer au plafond minimal).
+    """
+    max_gardes: int
+    planning: Planning
+    verifications: int
+    solveur: str
+
+    @property
+    def charge_min(self) -> int:
+        return int(self.planning.gardes.min())
+
+    @property
+    def charge_max(self) -> int:
+        return int(self.planning.gardes.max())
+
+    @property
+    def ecart(self) -> int:
+        """Écart de charge entre le médecin le plus et le moins sollicité."""
+        return self.charge_max - self.charge_min
+
+
+def minimiser_max_gardes(
+    medecins: List[Medecin],
+    vacances: List[PeriodeVacance],
+    nb_jours: int
+) -> PlafondMinimal:
+    """
+    Cherche le plus petit `max_gardes` admettant un emploi du temps, puis renvoie un planning qui le respecte.
+
+    L'existence d'un emploi du temps est croissante avec le plafond : une recherche dichotomique entre
+    ⌈nb_jours / nb_medecins⌉ et nb_jours, où chaque étape est un calcul de flot (`verifier_faisabilite`),
+    trouve le plafond minimal en au plus log₂(nb_jours) + 2 vérifications. L'index des disponibilités et le calendrier
+    sont construits une seule fois. Le planning est celui de l'algorithme glouton à ce plafond s'il aboutit,
+    sinon l'affectation trouvée par le calcul de flot.
+
+    ## Parameters:
+        medecins (List[Medecin]): Liste des médecins avec leurs identifiants et disponibilités.
+        vacances (List[PeriodeVacance]): Liste des périodes de vacances (éventuellement vide).
+        nb_jours (int): Le nombre total de jours sur lesquels l'emploi du temps est planifié.
+
+    ## Raises:
+        TypeError: Si 'medecins' est None.
+        ValueError: Si 'medecins' est une liste vide ou si le nombre de jours n'est pas valide.
+        ValueError: Si aucun plafond ne permet de couvrir tous les jours ; le message liste les jours en défaut.
+
+    ## Returns:
+        PlafondMinimal: Le plafond minimal, le planning correspondant et l'écart de charge entre médecins.
+
+    ## Example:
+        >>> resultat = minimiser_max_gardes(medecins, vacances, 10)
+        >>> resultat.max_gardes, resultat.charge_min, resultat.charge_max, resultat.verifications
+        (2, 2, 2, 2)
+    """
+    _verifier_medecins(medecins)
+    calendrier = CalendrierVacances(vacances, nb_jours)
+    index = MatriceDisponibilites.depuis_medecins(medecins, nb_jours)
+    verifications = 0
+
+    def faisable(max_gardes: int) -> bool:
+        nonlocal verifications
+        verifications += 1
+        reseau, _, _ = _construire_reseau(index, calendrier, max_gardes)
+        return reseau.flot_max(0, 1) == nb_jours
+
+    bas, haut = max(1, math.ceil(nb_jours / len(medecins))), nb_jours
+    if not faisable(haut):
+        raise ValueError(verifier_faisabilite(medecins, vacances, nb_jours, haut).message())
+    # Le plafond minimal est souvent la borne basse elle-même (disponibilités suffisantes) : elle est testée d'abord.
+    if bas < haut:
+        if faisable(bas):
+            haut = bas
+        else:
+            bas += 1
+    while bas < haut:
+        milieu = (bas + haut) // 2
+        if faisable(milieu):
+            haut = milieu
+        else:
+            bas = milieu + 1
+
+    try:
+        affectation, solveur = _affecter_gardes(index, calendrier, haut), "glouton"
+    except ValueError:
+        faisabilite = verifier_faisabilite(medecins, vacances, nb_jours, haut)
+        affectation, solveur = np.array(faisabilite.affectation, dtype=np.int64), "flot"
+    planning = Planning(medecins, vacances, nb_jours, haut, affectation)
+    return PlafondMinimal(haut, planning, verifications, solveur)
@@ -0,0 +1,196 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from planning_medecin.calendrier import CalendrierVacances
+from planning_medecin.faisabilite import _construire_reseau
+from planning_medecin.lib_hp import MatriceDisponibilites, _affecter_gardes
+
+CRITERES = ("premier", "equite")
+
+# Contexte de chaque processus du portfolio, installé une fois par `_initialiser_worker`.
+_CONTEXTE: dict = {}
+
+
+@dataclass
+class StatistiquesPortfolio:
+    """
+    Statistiques d'une résolution par portfolio.
+
+    ## Attributes:
+        essais (int): Nombre de variantes de l'algorithme glouton exécutées.
+        variante (int): Numéro de la variante retenue (0 : l'ordre d'entrée des médecins), -1 si aucune n'a abouti.
+        ecart (int): Écart de charge entre le médecin le plus et le moins sollicité dans le planning retenu.
+        workers (int): Nombre de processus lancés (0 si la variante 0 a suffi).
+        duree (float): Durée de la résolution en secondes.
+        statut (str): "solution", "infaisable" (prouvé par le calcul de flot), "echec" (toutes les variantes ont échoué)
+            ou "budget" (budget de temps atteint).
+    """
+    essais: int = 0
+    variante: int = -1
+    ecart: int = 0
+    workers: int = 0
+    duree: float = 0.0
+    statut: str = ""
+
+
+def _ordre(graine: int, variante: int, nb_medecins: int) -> np.ndarray:
+    """Ordre des médecins de la variante : l'ordre d'entrée pour la variante 0, une permutation aléatoire sinon."""
+    if variante == 0:
+        return np.arange(nb_medecins)
+    return np.random.default_rng([graine, variante]).permutation(nb_medecins)
+
+
+def _essayer(index: MatriceDisponibilites, calendrier: CalendrierVacances, max_gardes: int, ordre: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Exécute l'algorithme glouton avec les médecins rangés dans `ordre` : les égalités de charge sont départagées
+    selon cet ordre. Renvoie l'affectation exprimée dans l'ordre d'origine, ou None si la variante échoue.
+    """
+    variante = MatriceDisponibilites([index.ids[i] for i in ordre.tolist()], np.asfortranarray(index.matrice[ordre]))
+    try:
+        affectation = _affecter_gardes(variante, calendrier, max_gardes)
+    except ValueError:
+        return None
+    return ordre[affectation]
+
+
+def _score(affectation: np.ndarray, nb_medecins: int) -> Tuple[int, int]:
+    """Score d'équité, plus petit est meilleur : écart de charge, puis somme des carrés des charges."""
+    gardes = np.bincount(affectation, minlength=nb_medecins)
+    return int(gardes.max() - gardes.min()), int(np.dot(gardes, gardes))
+
+
+def _initialiser_worker(index: MatriceDisponibilites, calendrier: CalendrierVacances, max_gardes: int, arret) -> None:
+    """Reçoit une seule fois par processus l'instance à résoudre et l'événement d'arrêt partagé."""
+    _CONTEXTE.update(index=index, calendrier=calendrier, max_gardes=max_gardes, arret=arret)
+
+
+def _essayer_lot(graine: int, variantes: List[int], critere: str, echeance: float):
+    """
+    Exécute un lot de variantes dans un processus du portfolio et renvoie (variantes exécutées, meilleur résultat),
+    le meilleur résultat étant None ou (score, variante, affectation). Le lot s'interrompt à l'échéance, quand
+    l'événement d'arrêt est levé ou, avec le critère "premier", dès qu'une variante aboutit.
+    """
+    index, arret = _CONTEXTE["index"], _CONTEXTE["arret"]
+    nb_medecins = len(index.ids)
+    executees, meilleur = 0, None
+    for variante in variantes:
+        if arret.is_set() or time.time() >= echeance:
+            break
+        executees += 1
+        affectation = _essayer(index, _CONTEXTE["calendrier"], _CONTEXTE["max_gardes"], _ordre(graine, variante, nb_medecins))
+        if affectation is None:
+            continue
+        resultat = (_score(affectation, nb_medecins), variante, affectation)
+        if meilleur is None or resultat[:2] < meilleur[:2]:
+            meilleur = resultat
+        if critere == "premier":
+            break
+    return executees, meilleur
+
+
+def resoudre_portfolio(
+    index: MatriceDisponibilites,
+    calendrier: CalendrierVacances,
+    max_gardes: int,
+    budget_secondes: Optional[float] = 10.0,
+    workers: Optional[int] = None,
+    critere: str = "premier",
+    max_essais: int = 256,
+    graine: int = 0
+) -> Tuple[Optional[np.ndarray], StatistiquesPortfolio]:
+    """
+    Exécute des variantes de l'algorithme glouton, chacune départageant les égalités de charge selon un ordre
+    différent des médecins, et renvoie la meilleure affectation trouvée (ou None) avec les statistiques.
+
+    La variante 0 (l'ordre d'entrée, soit l'algorithme glouton de `planifier`) est exécutée d'abord, sur place.
+    Les suivantes, des permutations aléatoires reproductibles (`graine`), sont réparties par lots sur un pool de
+    `workers` processus. Avec le critère "premier", la première affectation valide est renvoyée ; avec "equite",
+    toutes les variantes sont exécutées dans la limite du budget et l'affectation de plus petit écart de charge
+    est retenue. Dès que la réponse est connue ou que `budget_secondes` est écoulé, les lots en attente sont
+    annulés et les processus s'arrêtent à la fin de leur variante en cours.
+
+    Si la variante 0 échoue, le calcul de flot de `verifier_faisabilite` détecte d'abord une instance infaisable,
+    sans lancer le pool.
+
+    ## Raises:
+        ValueError: Si `critere` n'est ni "premier" ni "equite".
+    """
+    if critere not in CRITERES:
+        raise ValueError(f"Critère inconnu : {critere!r} (attendu : 'premier' ou 'equite')")
+    debut = time.perf_counter()
+    echeance = time.time() + budget_secondes if budget_secondes is not None else float("inf")
+    statistiques = StatistiquesPortfolio()
+    nb_medecins = len(index.ids)
+    try:
+        affectation = _essayer(index, calendrier, max_gardes, _ordre(graine, 0, nb_medecins))
+        statistiques.essais = 1
+        meilleur = None if affectation is None else (_score(affectation, nb_medecins), 0, affectation)
+        if meilleur is None:
+            reseau, _, _ = _construire_reseau(index, calendrier, max_gardes)
+            if reseau.flot_max(0, 1) < index.nb_jours:
+                statistiques.statut = "infaisable"
+                return None, statistiques
+        budget_atteint = False
+        if (meilleur is None or critere == "equite") and max_essais > 1:
+            meilleur, budget_atteint = _lancer_pool(
+                index, calendrier, max_gardes, statistiques, meilleur, echeance, workers, critere, max_essais, graine
+            )
+
+        if meilleur is None:
+            statistiques.statut = "budget" if budget_atteint else "echec"
+            return None, statistiques
+        statistiques.statut = "solution"
+        statistiques.ecart, statistiques.variante = meilleur[0][0], meilleur[1]
+        return meilleur[2], statistiques
+    finally:
+        statistiques.duree = time.perf_counter() - debut
+
+
+def _lancer_pool(index, calendrier, max_gardes, statistiques, meilleur, echeance, workers, critere, max_essais, graine):
+    """Répartit les variantes 1 à max_essais - 1 sur un pool de processus ; renvoie (meilleur, budget atteint)."""
+    workers = workers or os.cpu_count() or 1
+    statistiques.workers = workers
+    taille_lot = max(1, min(8, (max_essais - 1) // (4 * workers)))
+    variantes = iter(range(1, max_essais))
+    arret = multiprocessing.Event()
+    pool = ProcessPoolExecutor(
+        max_workers=workers, initializer=_initialiser_worker, initargs=(index, calendrier, max_gardes, arret)
+    )
+    en_cours = set()
+
+    def soumettre():
+        while len(en_cours) < 2 * workers:
+            lot = list(islice(variantes, taille_lot))
+            if not lot:
+                return
+            en_cours.add(pool.submit(_essayer_lot, graine, lot, critere, echeance))
+
+    try:
+        soumettre()
+        while en_cours:
+            delai = max(0.0, echeance - time.time()) if echeance != float("inf") else None
+            termines, _ = wait(en_cours, timeout=delai, return_when=FIRST_COMPLETED)
+            if not termines:
+                return meilleur, True
+            en_cours.difference_update(termines)
+            for future in termines:
+                executees, resultat = future.result()
+                statistiques.essais += executees
+                if resultat is not None and (meilleur is None or resultat[:2] < meilleur[:2]):
+                    meilleur = resultat
+            if meilleur is not None and critere == "premier":
+                return meilleur, False
+            if time.time() >= echeance:
+                return meilleur, True
+            soumettre()
+        return meilleur, False
+    finally:
+        arret.set()
+        pool.shutdown(wait=True, cancel_futures=True)
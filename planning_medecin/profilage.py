@@ -0,0 +1,150 @@
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class MesurePhase:
+    """
+    Mesure d'une phase de la planification.
+
+    ## Attributes:
+        nom (str): Nom de la phase ("calendrier", "verification", "disponibilites", "affectation", "dataframe", "rendu"...).
+        duree (float): Durée de la phase en secondes.
+        memoire_pic (int): Pic de mémoire allouée pendant la phase, en octets, au-delà de la mémoire déjà allouée au début.
+        echec (bool): Vrai si la phase s'est terminée par une exception.
+    """
+    nom: str
+    duree: float
+    memoire_pic: int = 0
+    echec: bool = False
+
+
+class Profil:
+    """
+    Instrumentation d'une planification : durée et pic mémoire de chaque phase, candidats examinés chaque jour.
+
+    Un `Profil` est passé à `planifier` (ou `trouver_emploi_du_temps`) par le paramètre `profil` ; sans profil,
+    aucune mesure n'est effectuée. Les phases sont mesurées même si la planification échoue, ce qui permet de
+    savoir où elle s'est arrêtée. Le `rappel` éventuel est appelé à la fin de chaque phase avec sa `MesurePhase`,
+    par exemple pour transmettre les mesures à un outil de supervision.
+
+    ## Attributes:
+        phases (List[MesurePhase]): Les phases mesurées, dans l'ordre d'exécution.
+        disponibles (Optional[np.ndarray]): Pour chaque jour traité, le nombre de médecins disponibles examinés.
+        candidats (Optional[np.ndarray]): Pour chaque jour traité, le nombre de médecins disponibles n'ayant pas atteint `max_gardes`.
+        memoire (bool): Si faux, le pic mémoire n'est pas mesuré (tracemalloc ralentit les allocations).
+
+    ## Example:
+        >>> profil = Profil()
+        >>> planning = planifier(medecins, vacances, 10, 3, profil=profil)
+        >>> [phase.nom for phase in profil.phases]
+        ['calendrier', 'disponibilites', 'affectation']
+        >>> profil.candidats.tolist()
+        [3, 3, 3, 3, 3, 3, 3, 3, 3, 3]
+    """
+
+    def __init__(self, rappel: Optional[Callable[[MesurePhase], None]] = None, memoire: bool = True):
+        self.rappel = rappel
+        self.memoire = memoire
+        self.phases: List[MesurePhase] = []
+        self.disponibles: Optional[np.ndarray] = None
+        self.candidats: Optional[np.ndarray] = None
+
+    @contextmanager
+    def phase(self, nom: str) -> Iterator[None]:
+        """Mesure le bloc `with` comme une phase nommée `nom`."""
+        demarre = self.memoire and not tracemalloc.is_tracing()
+        if demarre:
+            tracemalloc.start()
+        if self.memoire:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        mesure = MesurePhase(nom, 0.0)
+        debut = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            mesure.echec = True
+            raise
+        finally:
+            mesure.duree = time.perf_counter() - debut
+            if self.memoire:
+                mesure.memoire_pic = max(0, tracemalloc.get_traced_memory()[1] - base)
+            if demarre:
+                tracemalloc.stop()
+            self.phases.append(mesure)
+            if self.rappel is not None:
+                self.rappel(mesure)
+
+    def compteurs_jours(self, nb_jours: int) -> None:
+        """Prépare les compteurs par jour de la boucle d'affectation (les jours non traités restent à -1)."""
+        self.disponibles = np.full(nb_jours, -1, dtype=np.int64)
+        self.candidats = np.full(nb_jours, -1, dtype=np.int64)
+
+    @property
+    def duree(self) -> float:
+        return sum(phase.duree for phase in self.phases)
+
+    @property
+    def memoire_pic(self) -> int:
+        return max((phase.memoire_pic for phase in self.phases), default=0)
+
+    def _resume_jours(self) -> Dict[str, object]:
+        if self.candidats is None:
+            return {}
+        traites = self.candidats >= 0
+        disponibles, candidats = self.disponibles[traites], self.candidats[traites]
+        if not candidats.size:
+            return {"jours_traites": 0}
+        return {
+            "jours_traites": int(candidats.size),
+            "disponibles_examines": int(disponibles.sum()),
+            "candidats_moyenne": float(candidats.mean()),
+            "candidats_min": int(candidats.min()),
+            "candidats_max": int(candidats.max()),
+        }
+
+    def to_dict(self) -> Dict[str, object]:
+        """Mesures sous forme de dictionnaire sérialisable en JSON (compteurs par jour inclus)."""
+        return {
+            "duree": self.duree,
+            "memoire_pic": self.memoire_pic,
+            "phases": [vars(phase).copy() for phase in self.phases],
+            "jours": self._resume_jours(),
+            "disponibles_par_jour": None if self.disponibles is None else self.disponibles.tolist(),
+            "candidats_par_jour": None if self.candidats is None else self.candidats.tolist(),
+        }
+
+    def to_rich(self):
+        """Table rich résumant les phases et les compteurs de la boucle d'affectation."""
+        from rich.table import Table
+
+        table = Table(title="Profil de la planification")
+        table.add_column("Phase", style="cyan")
+        table.add_column("Durée (ms)", justify="right")
+        table.add_column("Part", justify="right")
+        table.add_column("Mémoire pic (Ko)", justify="right")
+        total = self.duree or 1.0
+        for phase in self.phases:
+            nom = f"{phase.nom} [red](échec)[/red]" if phase.echec else phase.nom
+            memoire = f"{phase.memoire_pic / 1024:.1f}" if self.memoire else "-"
+            table.add_row(nom, f"{phase.duree * 1000:.2f}", f"{phase.duree / total:.0%}", memoire)
+        table.add_row("[bold]Total[/bold]", f"{self.duree * 1000:.2f}", "", f"{self.memoire_pic / 1024:.1f}" if self.memoire else "-")
+        jours = self._resume_jours()
+        if jours.get("jours_traites"):
+            table.caption = (
+                f"{jours['jours_traites']} jours traités, {jours['disponibles_examines']} disponibilités examinées ; "
+                f"candidats par jour : {jours['candidats_moyenne']:.1f} en moyenne "
+                f"(min {jours['candidats_min']}, max {jours['candidats_max']})"
+            )
+        return table
+
+
+def _phase(profil: Optional[Profil], nom: str):
+    """`profil.phase(nom)`, ou un contexte vide sans coût de mesure quand il n'y a pas de profil."""
+    return nullcontext() if profil is None else profil.phase(nom)
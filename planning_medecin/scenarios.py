@@ -0,0 +1,61 @@
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+from planning_medecin.lib_hp import Medecin, PeriodeVacance
+
+
+def generer_scenario(
+    nb_medecins: int,
+    nb_jours: int,
+    densite: float = 0.3,
+    nb_vacances: int = 2,
+    duree_vacances: int = 7,
+    max_gardes: str = "large",
+    graine: int = 0
+) -> Tuple[List[Medecin], List[PeriodeVacance], int, int]:
+    """
+    Génère un scénario synthétique reproductible (même graine, même scénario) pour les essais et les mesures de performance.
+
+    ## Parameters:
+        nb_medecins (int): Nombre de médecins.
+        nb_jours (int): Nombre de jours de la période.
+        densite (float): Probabilité qu'un médecin soit disponible un jour donné (chaque médecin a au moins un jour).
+        nb_vacances (int): Nombre de périodes de vacances, placées au hasard dans la période.
+        duree_vacances (int): Durée de chaque période, ramenée au besoin au nombre de médecins et au nombre de jours.
+        max_gardes (str): "serre" pour le plus petit plafond compatible avec le nombre de jours (⌈nb_jours / nb_medecins⌉),
+            "large" pour le double.
+        graine (int): Graine du générateur aléatoire.
+
+    ## Raises:
+        ValueError: Si `max_gardes` n'est ni "serre" ni "large", ou si `densite` n'est pas dans ]0, 1].
+
+    ## Returns:
+        Tuple[List[Medecin], List[PeriodeVacance], int, int]: Les médecins, les vacances, le nombre de jours et le nombre maximal de gardes.
+
+    ## Example:
+        >>> medecins, vacances, nb_jours, max_gardes = generer_scenario(100, 365, densite=0.2, graine=42)
+        >>> len(medecins), nb_jours, max_gardes
+        (100, 365, 8)
+    """
+    if max_gardes not in ("serre", "large"):
+        raise ValueError(f"max_gardes doit valoir 'serre' ou 'large', reçu: {max_gardes}")
+    if not 0 < densite <= 1:
+        raise ValueError(f"La densité doit être comprise dans ]0, 1], reçu: {densite}")
+
+    rng = np.random.default_rng(graine)
+    # Nombre de jours de chaque médecin (loi binomiale, au moins un), puis tirage de ces jours sans remise : la
+    # mémoire est proportionnelle au nombre de disponibilités, sans matrice médecins × jours.
+    nb_disponibilites = np.maximum(rng.binomial(nb_jours, densite, nb_medecins), 1)
+    medecins = [
+        Medecin(f"Dr. {i + 1:0{len(str(nb_medecins))}d}", set((rng.choice(nb_jours, nombre, replace=False) + 1).tolist()))
+        for i, nombre in enumerate(nb_disponibilites.tolist())
+    ]
+
+    duree = max(1, min(duree_vacances, nb_medecins, nb_jours))
+    debuts = rng.integers(1, nb_jours - duree + 2, nb_vacances)
+    vacances = [PeriodeVacance(f"Vacances {k + 1}", int(debut), duree) for k, debut in enumerate(debuts)]
+
+    plafond = math.ceil(nb_jours / nb_medecins)
+    return medecins, vacances, nb_jours, plafond if max_gardes == "serre" else 2 * plafond
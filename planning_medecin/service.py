@@ -0,0 +1,348 @@
+import json
+import os
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as DelaiDepasse
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from planning_medecin.lot import _initialiser_worker
+
+# Le client (`resoudre_via_service`) n'utilise que la bibliothèque standard : numpy et la bibliothèque de
+# planification ne sont importées que côté service, dans `ServicePlanification` et dans ses processus.
+
+
+def _pret(_):
+    return os.getpid()
+
+
+def _resoudre_lot(demandes):
+    """
+    Résout un lot de scénarios dans un processus du pool et renvoie, pour chacun, ("ok", affectation)
+    ou ("echec", message).
+    """
+    from planning_medecin.lib_hp import planifier
+
+    resultats = []
+    for medecins, vacances, nb_jours, max_gardes, solver, verifier in demandes:
+        try:
+            planning = planifier(medecins, vacances, nb_jours, max_gardes, verifier=verifier, solver=solver)
+        except ValueError as erreur:
+            resultats.append(("echec", str(erreur)))
+        else:
+            resultats.append(("ok", planning.affectation))
+    return resultats
+
+
+class ServicePlanification:
+    """
+    Résolution de plannings pour des requêtes concurrentes, sur un pool de processus gardé chaud entre les requêtes.
+
+    Chaque requête est d'abord cherchée dans le cache partagé (`CacheSolutions`) ; les requêtes identiques en cours
+    de calcul partagent le même résultat. Les autres sont regroupées en lots : le regroupeur attend jusqu'à
+    `delai_lot` secondes après la première requête d'un lot (au plus `taille_lot_max` requêtes), puis répartit le
+    lot en une tâche par processus, ce qui amortit les échanges entre processus quand les requêtes affluent.
+    Si le pool est interrompu (processus tué...), les requêtes du lot reçoivent une erreur, rien n'est mémorisé, et
+    le pool est recréé pour les lots suivants ; une requête qui attend plus de `delai_reponse` secondes reçoit aussi
+    une erreur, sans interrompre le calcul, dont le résultat reste mémorisé.
+
+    ## Attributes:
+        workers (int): Nombre de processus du pool.
+        cache (CacheSolutions): Cache des plannings, partagé par toutes les requêtes.
+        requetes (int): Nombre de requêtes reçues.
+        lots (int): Nombre de lots envoyés au pool.
+        calculs (int): Nombre de scénarios résolus par le pool.
+
+    ## Example:
+        >>> service = ServicePlanification(workers=2, cache=CacheSolutions(dossier=dossier_cache_par_defaut()))
+        >>> service.resoudre(json.load(open("demonstration.json")))["affectation"]
+        [0, 1, 2, 3, 4, 1, 2, 0, 3, 4]
+        >>> service.fermer()
+    """
+
+    def __init__(self, workers: Optional[int] = None, cache=None, delai_lot: float = 0.002, taille_lot_max: int = 64, delai_reponse: float = 300.0):
+        from planning_medecin.cache import CacheSolutions
+
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache if cache is not None else CacheSolutions()
+        self.delai_lot = delai_lot
+        self.taille_lot_max = taille_lot_max
+        self.delai_reponse = delai_reponse
+        self.requetes = self.lots = self.calculs = 0
+        self._verrou = threading.Lock()
+        self._en_cours: Dict[str, Future] = {}
+        self._file: "queue.Queue" = queue.Queue()
+        self._pool = self._nouveau_pool()
+        self._pool_interrompu = False
+        self._regroupeur = threading.Thread(target=self._regrouper, name="regroupeur", daemon=True)
+        self._regroupeur.start()
+
+    def _nouveau_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_initialiser_worker)
+        # Démarre tous les processus maintenant, pour que la première requête ne paie pas leur lancement.
+        list(pool.map(_pret, range(self.workers)))
+        return pool
+
+    def _recreer_pool(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = self._nouveau_pool()
+        self._pool_interrompu = False
+
+    def resoudre(self, data: dict, solver: str = "glouton", verifier: bool = False) -> dict:
+        """
+        Résout des critères au format de la commande `demo` et renvoie la réponse JSON du service.
+
+        ## Raises:
+            CriteresInvalides, KeyError, TypeError: Si les critères sont mal formés.
+
+        ## Returns:
+            dict: {"statut": "ok", "source": "cache" | "calcul", "duree", "affectation", "gardes"} où "gardes" liste
+                les triplets [jour, vacance, médecin], {"statut": "echec", "erreur", "duree"} si aucun planning
+                n'existe, ou {"statut": "erreur", "erreur", "duree"} si le pool est interrompu ou si le calcul
+                dépasse `delai_reponse`.
+        """
+        from planning_medecin.cache import EchecMemorise, cle_canonique
+        from planning_medecin.lib_hp import charger_criteres
+
+        debut = time.perf_counter()
+        medecins, vacances, nb_jours, max_gardes = charger_criteres(data)
+        cle = cle_canonique(medecins, vacances, nb_jours, max_gardes, verifier=verifier, solver=solver)
+        with self._verrou:
+            self.requetes += 1
+            valeur, source = self.cache.lire(cle), "cache"
+            if valeur is None:
+                future, source = self._en_cours.get(cle), "calcul"
+                if future is None:
+                    future = self._en_cours[cle] = Future()
+                    self._file.put((cle, (medecins, vacances, nb_jours, max_gardes, solver, verifier), future))
+        if valeur is None:
+            try:
+                valeur = future.result(timeout=self.delai_reponse)
+            except DelaiDepasse:
+                erreur = f"Délai de réponse dépassé ({self.delai_reponse:g} s), le calcul continue"
+                return {"statut": "erreur", "erreur": erreur, "duree": time.perf_counter() - debut}
+            except Exception as erreur:
+                return {"statut": "erreur", "erreur": f"{type(erreur).__name__}: {erreur}", "duree": time.perf_counter() - debut}
+        duree = time.perf_counter() - debut
+        if isinstance(valeur, EchecMemorise):
+            return {"statut": "echec", "erreur": valeur.message, "duree": duree}
+        return {
+            "statut": "ok",
+            "source": source,
+            "duree": duree,
+            "affectation": valeur.affectation.tolist(),
+            "gardes": [list(garde) for garde in valeur.gardes_par_jour()],
+        }
+
+    def _regrouper(self) -> None:
+        while True:
+            demande = self._file.get()
+            if demande is None:
+                return
+            lot = [demande]
+            echeance = time.monotonic() + self.delai_lot
+            while len(lot) < self.taille_lot_max:
+                try:
+                    demande = self._file.get(timeout=max(0.0, echeance - time.monotonic()))
+                except queue.Empty:
+                    break
+                if demande is None:
+                    self._file.put(None)
+                    break
+                lot.append(demande)
+            with self._verrou:
+                self.lots += 1
+            if self._pool_interrompu:
+                self._recreer_pool()
+            for k in range(min(self.workers, len(lot))):
+                morceau = lot[k::self.workers]
+                try:
+                    tache = self._pool.submit(_resoudre_lot, [scenario for _, scenario, _ in morceau])
+                except Exception as erreur:  # pool déjà interrompu : il est recréé pour la suite du lot
+                    self._echouer(morceau, erreur)
+                    self._recreer_pool()
+                else:
+                    tache.add_done_callback(partial(self._terminer, morceau))
+
+    def _terminer(self, morceau, tache) -> None:
+        """Mémorise les résultats d'une tâche du pool et les transmet aux requêtes en attente."""
+        from planning_medecin.cache import EchecMemorise
+        from planning_medecin.lib_hp import Planning
+
+        try:
+            resultats = tache.result()
+        except Exception as erreur:
+            self._echouer(morceau, erreur)
+            return
+        with self._verrou:
+            for (cle, scenario, future), (statut, valeur) in zip(morceau, resultats):
+                medecins, vacances, nb_jours, max_gardes, solver, _ = scenario
+                if statut == "ok":
+                    resultat = Planning(medecins, vacances, nb_jours, max_gardes, valeur)
+                    self.cache.ecrire(cle, resultat)
+                else:
+                    resultat = EchecMemorise(valeur)
+                    # Comme `CacheSolutions.planifier` : seuls les échecs du solveur glouton sont mémorisés.
+                    if solver == "glouton":
+                        self.cache.ecrire(cle, resultat)
+                self.calculs += 1
+                del self._en_cours[cle]
+                future.set_result(resultat)
+
+    def _echouer(self, morceau, erreur: Exception) -> None:
+        """Transmet l'erreur du pool aux requêtes en attente d'un morceau de lot, sans rien mémoriser."""
+        with self._verrou:
+            if isinstance(erreur, BrokenProcessPool):
+                self._pool_interrompu = True
+            for cle, _, future in morceau:
+                del self._en_cours[cle]
+                future.set_exception(erreur)
+
+    def etat(self) -> dict:
+        """Compteurs du service et du cache, renvoyés par GET /sante."""
+        return {
+            "statut": "ok",
+            "workers": self.workers,
+            "requetes": self.requetes,
+            "lots": self.lots,
+            "calculs": self.calculs,
+            "cache": {
+                "succes_memoire": self.cache.succes_memoire,
+                "succes_disque": self.cache.succes_disque,
+                "defauts": self.cache.defauts,
+            },
+        }
+
+    def fermer(self) -> None:
+        """Arrête le regroupeur puis le pool, après les calculs en cours."""
+        self._file.put(None)
+        self._regroupeur.join()
+        self._pool.shutdown(wait=True)
+
+
+class _Gestionnaire(BaseHTTPRequestHandler):
+    """GET /sante et POST /solve?solver=...&verifier=0|1 (corps : critères au format de `demo`)."""
+    server_version = "planning-medecin"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _repondre(self, code: int, contenu: dict) -> None:
+        corps = json.dumps(contenu, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/sante":
+            self._repondre(404, {"statut": "erreur", "erreur": f"Chemin inconnu : {self.path}"})
+            return
+        self._repondre(200, self.server.service.etat())
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/solve":
+            self._repondre(404, {"statut": "erreur", "erreur": f"Chemin inconnu : {self.path}"})
+            return
+        parametres = parse_qs(url.query)
+        solver = parametres.get("solver", ["glouton"])[0]
+        verifier = parametres.get("verifier", ["0"])[0].lower() in ("1", "true", "oui")
+        try:
+            data = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            reponse = self.server.service.resoudre(data, solver, verifier)
+        except (ValueError, KeyError, TypeError) as erreur:
+            self._repondre(400, {"statut": "erreur", "erreur": f"Critères invalides : {erreur}"})
+            return
+        self._repondre({"ok": 200, "echec": 422}.get(reponse["statut"], 503), reponse)
+
+
+class _Serveur(ThreadingHTTPServer):
+    """Un thread par connexion ; file d'attente de connexions assez longue pour des rafales de clients simultanés."""
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def servir(hote: str = "127.0.0.1", port: int = 8765, workers: Optional[int] = None, delai_lot: float = 0.002, dossier_cache: Optional[str] = None) -> None:
+    """
+    Lance le service HTTP/JSON de planification et répond aux requêtes jusqu'à l'interruption (Ctrl+C).
+
+    ## Parameters:
+        hote (str): Adresse d'écoute ; par défaut, uniquement la machine locale.
+        port (int): Port d'écoute.
+        workers (Optional[int]): Nombre de processus du pool ; par défaut, le nombre de coeurs.
+        delai_lot (float): Délai de regroupement des requêtes en lots, en secondes.
+        dossier_cache (Optional[str]): Dossier du cache disque, partagé avec la commande `solve` ; None : cache mémoire seul.
+    """
+    from planning_medecin.cache import CacheSolutions
+
+    service = ServicePlanification(workers, CacheSolutions(dossier=dossier_cache), delai_lot)
+    serveur = _Serveur((hote, port), _Gestionnaire)
+    serveur.service = service
+    try:
+        serveur.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        serveur.server_close()
+        service.fermer()
+
+
+def resoudre_via_service(url: str, data: dict, solver: str = "glouton", verifier: bool = False, delai: float = 60.0) -> dict:
+    """
+    Client du service : envoie des critères au format de `demo` et renvoie la réponse (voir `ServicePlanification.resoudre`).
+
+    ## Raises:
+        OSError: Si le service est injoignable (urllib.error.URLError, délai dépassé...) ou indisponible (statut 503 :
+            pool interrompu, délai de réponse du service dépassé).
+        ValueError: Si les critères sont invalides ou si aucun emploi du temps ne respecte les contraintes.
+
+    ## Example:
+        >>> reponse = resoudre_via_service("http://127.0.0.1:8765", json.load(open("demonstration.json")))
+        >>> reponse["gardes"][:2]
+        [[1, '', 'Dr. MACHECOURT'], [2, '', 'Dr. SENGEL']]
+    """
+    requete = urllib.request.Request(
+        f"{url.rstrip('/')}/solve?{urlencode({'solver': solver, 'verifier': int(verifier)})}",
+        data=json.dumps(data).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(requete, timeout=delai) as reponse:
+            return json.load(reponse)
+    except urllib.error.HTTPError as erreur:
+        if erreur.code >= 500:
+            raise OSError(f"Service indisponible : {erreur}") from erreur
+        try:
+            contenu = json.load(erreur)
+        except ValueError:
+            raise OSError(f"Réponse inattendue du service : {erreur}") from erreur
+        raise ValueError(contenu.get("erreur", str(erreur))) from None
+
+
+def planifier_via_service(url: str, medecins, vacances, nb_jours: int, max_gardes: int, solver: str = "glouton", verifier: bool = False):
+    """
+    `planifier` délégué au service : renvoie le `Planning` calculé (ou relu dans le cache) par le service.
+
+    ## Raises:
+        OSError: Si le service est injoignable.
+        ValueError: Si aucun emploi du temps ne respecte les contraintes.
+    """
+    import numpy as np
+    from planning_medecin.lib_hp import Planning
+
+    data = {
+        "medecins": [{"id": med.id, "disponibilites": sorted(med.disponibilites)} for med in medecins],
+        "vacances": [{"nom": vac.nom, "debut": vac.debut, "duree": vac.duree} for vac in vacances],
+        "nb_jours": nb_jours,
+        "max_gardes": max_gardes,
+    }
+    reponse = resoudre_via_service(url, data, solver, verifier)
+    return Planning(medecins, vacances, nb_jours, max_gardes, np.array(reponse["affectation"], dtype=np.int64))
@@ -0,0 +1,268 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from planning_medecin.faisabilite import _construire_reseau
+from planning_medecin.calendrier import CalendrierVacances
+from planning_medecin.lib_hp import MatriceDisponibilites
+
+
+@dataclass
+class StatistiquesRecherche:
+    """
+    Statistiques d'une recherche exacte.
+
+    ## Attributes:
+        noeuds (int): Nombre d'affectations (jour, médecin) essayées.
+        retours_arriere (int): Nombre de jours dont toutes les valeurs ont été épuisées.
+        elagages (int): Nombre d'affectations rejetées par la propagation (domaine vide, capacité ou vacances).
+        solutions (int): Nombre d'emplois du temps complets trouvés.
+        duree (float): Durée de la recherche en secondes.
+        statut (str): "solution", "infaisable" (espace de recherche épuisé sans solution), "epuise" (espace de recherche
+            épuisé après au moins une solution) ou "budget" (budget de noeuds ou de temps atteint).
+    """
+    noeuds: int = 0
+    retours_arriere: int = 0
+    elagages: int = 0
+    solutions: int = 0
+    duree: float = 0.0
+    statut: str = ""
+
+
+class _Etat:
+    """Domaines des jours non affectés, charges des médecins et pile d'annulation de la recherche."""
+
+    def __init__(self, index: MatriceDisponibilites, calendrier: CalendrierVacances, max_gardes: int, symetries: bool = False):
+        nb_medecins, nb_jours = index.matrice.shape
+        self.max_gardes = max_gardes
+        self.domaines: List[Set[int]] = [set(index.medecins_disponibles(j + 1).tolist()) for j in range(nb_jours)]
+        self.jours_du_medecin: List[List[int]] = [(np.flatnonzero(index.matrice[i])).tolist() for i in range(nb_medecins)]
+        self.vacance: List[str] = calendrier.noms_par_jour()
+        self.jours_vacance: Dict[str, List[int]] = {}
+        for j, nom in enumerate(self.vacance):
+            if nom:
+                self.jours_vacance.setdefault(nom, []).append(j)
+        self.affectation = [-1] * nb_jours
+        self.charge = [0] * nb_medecins
+        self.non_affectes: Set[int] = set(range(nb_jours))
+        self.capacite_restante = nb_medecins * max(max_gardes, 0)
+        self.retraits: List[Tuple[int, int]] = []
+        # Classes de médecins interchangeables (mêmes disponibilités sur l'horizon), si les symétries sont brisées.
+        self.classe: Optional[List[int]] = None
+        if symetries:
+            self.classe = np.unique(index.matrice, axis=0, return_inverse=True)[1].ravel().tolist()
+
+    def choisir_jour(self) -> int:
+        """Jour non affecté au plus petit domaine (à égalité, le plus tôt)."""
+        return min(self.non_affectes, key=lambda j: (len(self.domaines[j]), j))
+
+    def valeurs(self, jour: int) -> List[int]:
+        """
+        Médecins du domaine, les moins chargés d'abord comme dans l'algorithme glouton.
+
+        Avec les symétries brisées, seul le premier médecin encore sans garde de chaque classe est essayé :
+        deux médecins interchangeables sans garde ont exactement le même état, leurs sous-arbres sont symétriques.
+        """
+        valeurs = sorted(self.domaines[jour], key=lambda i: (self.charge[i], i))
+        if self.classe is None:
+            return valeurs
+        retenues, classes_essayees = [], set()
+        for i in valeurs:
+            if self.charge[i] == 0:
+                if self.classe[i] in classes_essayees:
+                    continue
+                classes_essayees.add(self.classe[i])
+            retenues.append(i)
+        return retenues
+
+    def _retirer(self, jour: int, medecin: int) -> bool:
+        domaine = self.domaines[jour]
+        if medecin not in domaine:
+            return True
+        domaine.discard(medecin)
+        self.retraits.append((jour, medecin))
+        return bool(domaine)
+
+    def affecter(self, jour: int, medecin: int) -> bool:
+        """Affecte puis propage ; renvoie False si un jour non affecté n'a plus de candidat."""
+        self.affectation[jour] = medecin
+        self.non_affectes.discard(jour)
+        self.charge[medecin] += 1
+        self.capacite_restante -= 1
+        coherent = True
+
+        if self.charge[medecin] >= self.max_gardes:
+            for k in self.jours_du_medecin[medecin]:
+                if k in self.non_affectes:
+                    coherent = self._retirer(k, medecin) and coherent
+        nom = self.vacance[jour]
+        if nom:
+            jours_restants = [k for k in self.jours_vacance[nom] if k in self.non_affectes]
+            for k in jours_restants:
+                coherent = self._retirer(k, medecin) and coherent
+            if coherent:
+                # Chaque médecin ne couvre qu'un jour de la période : il faut autant de médecins distincts que de jours.
+                candidats = set().union(*(self.domaines[k] for k in jours_restants))
+                coherent = len(candidats) >= len(jours_restants)
+        return coherent and self.capacite_restante >= len(self.non_affectes)
+
+    def desaffecter(self, jour: int, repere: int) -> None:
+        while len(self.retraits) > repere:
+            k, medecin = self.retraits.pop()
+            self.domaines[k].add(medecin)
+        medecin = self.affectation[jour]
+        self.affectation[jour] = -1
+        self.non_affectes.add(jour)
+        self.charge[medecin] -= 1
+        self.capacite_restante += 1
+
+
+def explorer(
+    index: MatriceDisponibilites,
+    calendrier: CalendrierVacances,
+    max_gardes: int,
+    statistiques: StatistiquesRecherche,
+    budget_noeuds: Optional[int] = None,
+    budget_secondes: Optional[float] = None,
+    symetries: bool = False
+) -> Iterator[List[int]]:
+    """
+    Recherche arborescente avec vérification en avant : génère les affectations complètes (un indice de médecin par jour).
+
+    Le jour au plus petit domaine est choisi en premier ; chaque affectation retire le médecin des domaines des
+    autres jours de la même période de vacances et, s'il atteint `max_gardes`, de tous ses jours restants.
+    Une branche est abandonnée dès qu'un domaine est vide, que la capacité restante ne suffit plus à couvrir les jours
+    non affectés ou qu'une période de vacances a moins de médecins candidats distincts que de jours restants.
+
+    Le générateur s'arrête quand l'espace de recherche est épuisé ou quand un budget est atteint ; `statistiques`
+    est mis à jour au fil de l'eau et son statut final est renseigné. Seul le temps passé dans le générateur compte
+    pour `budget_secondes` (et `statistiques.duree`) : l'horloge est suspendue à chaque solution produite, tant que
+    l'appelant ne demande pas la suivante. Avec `symetries`, les médecins ayant les mêmes
+    disponibilités sont interchangeables et une partie des affectations symétriques n'est pas explorée (voir `_Etat.valeurs`).
+    """
+    reprise, ecoule = time.perf_counter(), 0.0
+    etat = _Etat(index, calendrier, max_gardes, symetries)
+    statistiques.statut = "infaisable"
+
+    def budget_atteint() -> bool:
+        if budget_noeuds is not None and statistiques.noeuds >= budget_noeuds:
+            return True
+        return budget_secondes is not None and ecoule + time.perf_counter() - reprise >= budget_secondes
+
+    try:
+        if any(not domaine for domaine in etat.domaines):
+            return
+        if not etat.non_affectes:
+            statistiques.solutions += 1
+            statistiques.statut = "solution"
+            ecoule, reprise = ecoule + time.perf_counter() - reprise, None
+            yield []
+            return
+
+        jour = etat.choisir_jour()
+        pile = [[jour, etat.valeurs(jour), 0, len(etat.retraits)]]
+        while pile:
+            cadre = pile[-1]
+            jour, valeurs, position, repere = cadre
+            if etat.affectation[jour] >= 0:
+                etat.desaffecter(jour, repere)
+            if position == len(valeurs):
+                pile.pop()
+                statistiques.retours_arriere += 1
+                continue
+            if budget_atteint():
+                statistiques.statut = "budget"
+                return
+
+            cadre[2] += 1
+            statistiques.noeuds += 1
+            if not etat.affecter(jour, valeurs[position]):
+                statistiques.elagages += 1
+                continue
+            if not etat.non_affectes:
+                statistiques.solutions += 1
+                statistiques.statut = "solution"
+                ecoule, reprise = ecoule + time.perf_counter() - reprise, None
+                statistiques.duree = ecoule
+                yield list(etat.affectation)
+                reprise = time.perf_counter()
+                continue
+
+            suivant = etat.choisir_jour()
+            pile.append([suivant, etat.valeurs(suivant), 0, len(etat.retraits)])
+        if statistiques.solutions:
+            statistiques.statut = "epuise"
+    finally:
+        if reprise is not None:
+            statistiques.duree = ecoule + time.perf_counter() - reprise
+
+
+def resoudre_exact(
+    index: MatriceDisponibilites,
+    calendrier: CalendrierVacances,
+    max_gardes: int,
+    budget_noeuds: Optional[int] = None,
+    budget_secondes: Optional[float] = None
+) -> Tuple[Optional[List[int]], StatistiquesRecherche]:
+    """
+    Renvoie la première affectation trouvée par `explorer` (ou None) et les statistiques de la recherche.
+
+    Une instance infaisable est d'abord détectée par le calcul de flot de `verifier_faisabilite`, sans aucune recherche.
+    """
+    statistiques = StatistiquesRecherche()
+    reseau, _, _ = _construire_reseau(index, calendrier, max_gardes)
+    if reseau.flot_max(0, 1) < index.nb_jours:
+        statistiques.statut = "infaisable"
+        return None, statistiques
+    solution = next(explorer(index, calendrier, max_gardes, statistiques, budget_noeuds, budget_secondes), None)
+    return solution, statistiques
+
+
+def _forme_canonique(affectation: List[int], classe: List[int]) -> bytes:
+    """
+    Affectation où chaque médecin est remplacé par (sa classe, son rang dans la classe par date de première garde) :
+    deux affectations ne différant que par une permutation de médecins interchangeables ont la même forme.
+    """
+    premiere_garde: Dict[int, int] = {}
+    for jour, medecin in enumerate(affectation):
+        premiere_garde.setdefault(medecin, jour)
+    rangs: Dict[int, int] = {}
+    par_classe: Dict[int, int] = {}
+    for medecin in sorted(premiere_garde, key=premiere_garde.__getitem__):
+        rangs[medecin] = par_classe.get(classe[medecin], 0)
+        par_classe[classe[medecin]] = rangs[medecin] + 1
+    return np.array([(classe[m], rangs[m]) for m in affectation], dtype=np.int64).tobytes()
+
+
+def enumerer_solutions(
+    index: MatriceDisponibilites,
+    calendrier: CalendrierVacances,
+    max_gardes: int,
+    statistiques: StatistiquesRecherche,
+    budget_noeuds: Optional[int] = None,
+    budget_secondes: Optional[float] = None,
+    symetries: bool = False
+) -> Iterator[List[int]]:
+    """
+    Génère, à la demande, des affectations complètes deux à deux distinctes (un indice de médecin par jour).
+
+    Une instance infaisable est d'abord détectée par le calcul de flot, sans aucune recherche. Avec `symetries`,
+    deux affectations qui ne diffèrent que par une permutation de médecins aux disponibilités identiques sont
+    considérées comme identiques : la recherche en élague une partie et les formes canoniques déjà produites
+    écartent les autres.
+    """
+    reseau, _, _ = _construire_reseau(index, calendrier, max_gardes)
+    if reseau.flot_max(0, 1) < index.nb_jours:
+        statistiques.statut = "infaisable"
+        return
+    classe = np.unique(index.matrice, axis=0, return_inverse=True)[1].ravel().tolist() if symetries else None
+    deja_produites: Set[bytes] = set()
+    for affectation in explorer(index, calendrier, max_gardes, statistiques, budget_noeuds, budget_secondes, symetries):
+        if classe is not None:
+            forme = _forme_canonique(affectation, classe)
+            if forme in deja_produites:
+                continue
+            deja_produites.add(forme)
+        yield affectation
@@ -0,0 +1,54 @@
+"""
+Desccription : Données de démonstration et solveurs par force brute partagés par les tests
+"""
+import random
+from collections import Counter
+from itertools import product
+
+from planning_medecin.calendrier import CalendrierVacances
+from planning_medecin.lib_hp import Medecin, PeriodeVacance
+
+
+def demonstration():
+    """Médecins et vacances de demonstration.json, ceux des exemples des docstrings (10 jours, 3 gardes au plus)."""
+    medecins = [Medecin("Dr. MACHECOURT", {1, 2, 3, 4, 8, 9}),
+                Medecin("Dr. SENGEL", {1, 2, 4, 5, 6, 7, 10}),
+                Medecin("Dr. THEODORE", {2, 3, 5, 6, 7, 8}),
+                Medecin("Dr. LECH", {3, 4, 6, 9, 10}),
+                Medecin("Dr. VIDAL", {1, 5, 7, 8, 9, 10})]
+    vacances = [PeriodeVacance("Noel", 3, 2), PeriodeVacance("Ete", 8, 2)]
+    return medecins, vacances
+
+
+def instances(graine, nombre=300, nb_medecins_max=4, nb_jours_max=7):
+    """Petites instances aléatoires reproductibles (medecins, vacances, nb_jours, max_gardes)."""
+    rng = random.Random(graine)
+    for _ in range(nombre):
+        nb_jours = rng.randint(1, nb_jours_max)
+        medecins = [Medecin(f"Dr. {i}", set(rng.sample(range(1, nb_jours + 2), rng.randint(1, nb_jours + 1))))
+                    for i in range(rng.randint(1, nb_medecins_max))]
+        vacances = [PeriodeVacance(rng.choice("AB"), rng.randint(1, nb_jours), rng.randint(1, 3))
+                    for _ in range(rng.randint(0, 2))]
+        yield medecins, vacances, nb_jours, rng.randint(1, 3)
+
+
+def est_valide(medecins, vacances, nb_jours, max_gardes, affectation):
+    """Vrai si `affectation` (un indice de médecin par jour) respecte toutes les contraintes."""
+    noms = CalendrierVacances(vacances, nb_jours).noms_par_jour()
+    if len(affectation) != nb_jours:
+        return False
+    if any(not 0 <= i < len(medecins) or jour not in medecins[i].disponibilites
+           for jour, i in enumerate(affectation, start=1)):
+        return False
+    if any(n > max_gardes for n in Counter(affectation).values()):
+        return False
+    par_periode = [(i, nom) for i, nom in zip(affectation, noms) if nom]
+    return len(par_periode) == len(set(par_periode))
+
+
+def emplois_du_temps(medecins, vacances, nb_jours, max_gardes):
+    """Tous les emplois du temps valides, par énumération exhaustive des affectations."""
+    candidats = [[i for i, med in enumerate(medecins) if jour in med.disponibilites] for jour in range(1, nb_jours + 1)]
+    for affectation in product(*candidats):
+        if est_valide(medecins, vacances, nb_jours, max_gardes, affectation):
+            yield list(affectation)
@@ -0,0 +1,112 @@
+"""
+Desccription : Tester la réparation locale de plannings de ajustement.py
+"""
+import random
+import numpy as np
+import pytest
+from planning_medecin.lib_hp import Medecin, PeriodeVacance, Planning, planifier
+from planning_medecin.ajustement import (
+    AjoutMedecin,
+    AjoutVacance,
+    RetraitDisponibilites,
+    RetraitMedecin,
+    ajuster_planning)
+from tests.outils import demonstration, emplois_du_temps, est_valide, instances
+
+
+def test_exemple_docstring():
+    planning = planifier([Medecin("A", {1, 2}), Medecin("B", {1, 2})], [PeriodeVacance("Noel", 1, 1)], 2, 1)
+    nouveau, modifications = ajuster_planning(planning, [RetraitDisponibilites("A", {1})])
+    assert modifications == [(1, "A", "B"), (2, "B", "A")]
+    assert nouveau.affectation.tolist() == [1, 0]
+    assert planning.affectation.tolist() == [0, 1]
+
+
+def ids(planning):
+    return [planning.medecins[i].id for i in planning.affectation.tolist()]
+
+
+def changement_aleatoire(rng, medecins, vacances, nb_jours, nature):
+    """Un changement tiré au hasard et les médecins et vacances qui en résultent (None si le tirage est sans objet)."""
+    if nature == "disponibilites":
+        i = rng.randrange(len(medecins))
+        jours = set(rng.sample(range(1, nb_jours + 1), rng.randint(1, nb_jours)))
+        if not medecins[i].disponibilites - jours:
+            return None
+        apres = [Medecin(med.id, med.disponibilites - jours) if k == i else med for k, med in enumerate(medecins)]
+        return RetraitDisponibilites(medecins[i].id, jours), apres, vacances
+    if nature == "medecin":
+        if len(medecins) < 2:
+            return None
+        i = rng.randrange(len(medecins))
+        return RetraitMedecin(medecins[i].id), medecins[:i] + medecins[i + 1:], vacances
+    vacance = PeriodeVacance(rng.choice("ABC"), rng.randint(1, nb_jours), rng.randint(1, 3))
+    return AjoutVacance(vacance), medecins, vacances + [vacance]
+
+
+@pytest.mark.parametrize("nature", ["disponibilites", "medecin", "vacance"])
+@pytest.mark.parametrize("graine", [0, 1])
+def test_changement_force_brute(graine, nature):
+    """La réparation aboutit exactement quand un planning existe après le changement, et ne touche que les jours modifiés."""
+    rng = random.Random(graine)
+    for medecins, vacances, nb_jours, max_gardes in instances(graine, nombre=300, nb_medecins_max=5):
+        try:
+            planning = planifier(medecins, vacances, nb_jours, max_gardes, solver="exact")
+        except ValueError:
+            continue
+        tirage = changement_aleatoire(rng, medecins, vacances, nb_jours, nature)
+        if tirage is None:
+            continue
+        changement, apres, vacances_apres = tirage
+        if len(apres) < max((v.duree for v in vacances_apres), default=0):
+            continue
+        existe = next(emplois_du_temps(apres, vacances_apres, nb_jours, max_gardes), None) is not None
+        try:
+            nouveau, modifications = ajuster_planning(planning, [changement])
+        except ValueError as erreur:
+            assert not existe
+            assert "Impossible de réparer le planning" in str(erreur)
+            continue
+        assert existe
+        assert [med.id for med in nouveau.medecins] == [med.id for med in apres]
+        assert est_valide(apres, vacances_apres, nb_jours, max_gardes, nouveau.affectation.tolist())
+        ids_apres = {med.id for med in apres}
+        attendues = [(jour, a if a in ids_apres else None, b)
+                     for jour, (a, b) in enumerate(zip(ids(planning), ids(nouveau)), start=1)
+                     if a != b]
+        assert modifications == attendues
+
+
+def test_chaine_passant_deux_fois_par_un_medecin():
+    """B cède son jour de Noel pour prendre le jour 3 puis reprend le jour 4 : un parcours qui écarte B de la chaîne échoue."""
+    medecins = [Medecin("A", {1, 2, 4, 5}), Medecin("B", {1, 3, 4})]
+    planning = Planning(medecins, [PeriodeVacance("Noel", 1, 1)], 5, 3, np.array([1, 0, 1, 0, 0]))
+    nouveau, modifications = ajuster_planning(planning, [AjoutVacance(PeriodeVacance("Noel", 3, 1))])
+    assert nouveau.affectation.tolist() == [0, 0, 1, 1, 0]
+    assert modifications == [(1, "B", "A"), (4, "A", "B")]
+
+
+def test_retrait_medecin():
+    medecins, vacances = demonstration()
+    planning = planifier(medecins, vacances, 10, 3)
+    nouveau, modifications = ajuster_planning(planning, [RetraitMedecin("Dr. LECH")])
+    assert [med.id for med in nouveau.medecins] == ["Dr. MACHECOURT", "Dr. SENGEL", "Dr. THEODORE", "Dr. VIDAL"]
+    assert est_valide(nouveau.medecins, vacances, 10, 3, nouveau.affectation.tolist())
+    assert {jour for jour, ancien, _ in modifications if ancien is None} == {4, 9}
+
+
+def test_ajout_vacance():
+    medecins = [Medecin("A", {1, 2, 3}), Medecin("B", {1, 2, 3})]
+    planning = Planning(medecins, [], 3, 2, np.array([0, 0, 1]))
+    nouveau, modifications = ajuster_planning(planning, [AjoutVacance(PeriodeVacance("Noel", 1, 2))])
+    assert modifications == [(2, "A", "B")]
+    assert est_valide(medecins, [PeriodeVacance("Noel", 1, 2)], 3, 2, nouveau.affectation.tolist())
+
+
+def test_changements_invalides():
+    medecins, vacances = demonstration()
+    planning = planifier(medecins, vacances, 10, 3)
+    with pytest.raises(ValueError):
+        ajuster_planning(planning, [RetraitDisponibilites("Dr. INCONNU", {1})])
+    with pytest.raises(ValueError):
+        ajuster_planning(planning, [AjoutMedecin(Medecin("Dr. VIDAL", {1}))])
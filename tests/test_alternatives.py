@@ -0,0 +1,54 @@
+"""
+Desccription : Tester l'énumération paresseuse de plannings de iter_emplois_du_temps
+"""
+import time
+from itertools import islice
+import pytest
+from planning_medecin.lib_hp import iter_emplois_du_temps
+from planning_medecin.solveur_exact import StatistiquesRecherche
+from tests.outils import demonstration, emplois_du_temps, est_valide, instances
+
+
+def test_exemple_docstring():
+    medecins, vacances = demonstration()
+    plannings = islice(iter_emplois_du_temps(medecins, vacances, 10, 3, symetries=True), 3)
+    assert [p.affectation.tolist() for p in plannings] == [
+        [0, 1, 2, 3, 4, 1, 2, 0, 3, 4],
+        [0, 1, 2, 3, 4, 1, 2, 0, 3, 1],
+        [0, 1, 2, 3, 4, 1, 2, 0, 3, 3],
+    ]
+
+
+@pytest.mark.parametrize("graine", [0, 1])
+def test_enumeration_force_brute(graine):
+    for medecins, vacances, nb_jours, max_gardes in instances(graine, nombre=150):
+        if len(medecins) < max((v.duree for v in vacances), default=0):
+            continue
+        statistiques = StatistiquesRecherche()
+        produits = [p.affectation.tolist() for p in iter_emplois_du_temps(
+            medecins, vacances, nb_jours, max_gardes, statistiques=statistiques)]
+        attendus = list(emplois_du_temps(medecins, vacances, nb_jours, max_gardes))
+        assert sorted(produits) == sorted(attendus)
+        assert statistiques.statut == ("epuise" if attendus else "infaisable")
+
+        symetriques = [p.affectation.tolist() for p in iter_emplois_du_temps(
+            medecins, vacances, nb_jours, max_gardes, symetries=True)]
+        assert bool(symetriques) == bool(attendus) and len(symetriques) <= len(attendus)
+        assert all(est_valide(medecins, vacances, nb_jours, max_gardes, a) for a in symetriques)
+
+
+def test_budget():
+    medecins, vacances = demonstration()
+    statistiques = StatistiquesRecherche()
+    plannings = list(iter_emplois_du_temps(medecins, vacances, 10, 3, budget_noeuds=50, statistiques=statistiques))
+    assert plannings and statistiques.statut == "budget"
+
+
+def test_attente_hors_budget():
+    medecins, vacances = demonstration()
+    statistiques = StatistiquesRecherche()
+    generateur = iter_emplois_du_temps(medecins, vacances, 10, 3, budget_secondes=0.2, statistiques=statistiques)
+    next(generateur)
+    time.sleep(0.3)
+    assert next(generateur, None) is not None
+    assert statistiques.duree < 0.2
@@ -0,0 +1,118 @@
+"""
+Desccription : Tester l'enregistrement et la relecture par projection en mémoire des archives de archive.py
+"""
+import os
+import numpy as np
+import pytest
+from typer.testing import CliRunner
+from planning_medecin.__main__ import app
+from planning_medecin.archive import FICHIER_AFFECTATION, _projeter_npy, enregistrer_planning, ouvrir_planning
+from planning_medecin.lib_hp import Planning, planifier
+from planning_medecin.scenarios import generer_scenario
+from tests.outils import demonstration
+
+
+def ecrire_entete(chemin, entete, donnees=b""):
+    with open(chemin, "wb") as file:
+        np.lib.format.write_array_header_1_0(file, entete)
+        file.write(donnees)
+
+
+def relire(chemin):
+    projection, donnees = _projeter_npy(str(chemin))
+    try:
+        return donnees.tolist()
+    finally:
+        donnees.release()
+        projection.close()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    medecins, vacances, nb_jours, max_gardes = generer_scenario(40, 400, graine=0)
+    planning = planifier(medecins, vacances, nb_jours, max_gardes)
+    enregistrer_planning(planning, str(tmp_path / "planning"))
+    return planning, str(tmp_path / "planning")
+
+
+def test_aller_retour(archive):
+    planning, dossier = archive
+    with ouvrir_planning(dossier) as relu:
+        assert np.asarray(relu.affectation).tolist() == planning.affectation.tolist()
+        assert list(relu.gardes_par_jour()) == list(planning.gardes_par_jour())
+        assert relu.ids == [med.id for med in planning.medecins] and relu.nb_jours == planning.nb_jours
+        assert relu.medecin_de_garde(400) == planning.medecins[planning.affectation[-1]].id
+
+
+@pytest.mark.parametrize("ordre", ["C", "F"])
+def test_npy_ecrit_par_numpy(tmp_path, ordre):
+    valeurs = np.arange(-3, 1000, 7, dtype="<i4")
+    np.save(tmp_path / "a.npy", np.require(valeurs, requirements=[ordre]))
+    assert relire(tmp_path / "a.npy") == valeurs.tolist()
+    # Un en-tête `fortran_order: True` à une dimension décrit les mêmes octets.
+    ecrire_entete(tmp_path / "b.npy", {"descr": "<i4", "fortran_order": ordre == "F", "shape": (len(valeurs),)}, valeurs.tobytes())
+    assert relire(tmp_path / "b.npy") == np.load(tmp_path / "b.npy").tolist() == valeurs.tolist()
+
+
+@pytest.mark.parametrize("ordre", ["C", "F"])
+def test_tableau_a_deux_dimensions_refuse(tmp_path, ordre):
+    np.save(tmp_path / "a.npy", np.zeros((3, 4), dtype="<i4", order=ordre))
+    with pytest.raises(ValueError, match="Format inattendu"):
+        _projeter_npy(str(tmp_path / "a.npy"))
+
+
+def test_plage_de_jours(archive):
+    planning, dossier = archive
+    attendu = list(planning.gardes_par_jour())
+    with ouvrir_planning(dossier) as relu:
+        assert list(relu.gardes_par_jour(100, 130)) == attendu[99:130]
+        assert list(relu.gardes_par_jour(0, 3)) == attendu[:3]
+        assert list(relu.gardes_par_jour(395, 1000)) == attendu[394:]
+        assert list(relu.gardes_par_jour(50, 10)) == []
+        with pytest.raises(IndexError):
+            relu.medecin_de_garde(0)
+
+
+def test_cli_view_plage(tmp_path):
+    medecins, vacances = demonstration()
+    planning = planifier(medecins, vacances, 10, 3)
+    enregistrer_planning(planning, str(tmp_path / "planning"))
+    resultat = CliRunner().invoke(app, ["view", str(tmp_path / "planning"), "--debut", "3", "--fin", "4"])
+    assert resultat.exit_code == 0
+    assert "jours 3 à 4" in resultat.output
+    lignes = [[cellule.strip() for cellule in ligne.split("│")[1:4]] for ligne in resultat.output.splitlines() if "Dr." in ligne]
+    assert lignes == [[str(jour), vacance, medecin] for jour, vacance, medecin in list(planning.gardes_par_jour())[2:4]]
+
+
+@pytest.mark.parametrize("octets_manquants", [1, 4, 40])
+def test_fichier_tronque(archive, octets_manquants):
+    _, dossier = archive
+    chemin = os.path.join(dossier, FICHIER_AFFECTATION)
+    with open(chemin, "r+b") as file:
+        file.truncate(os.path.getsize(chemin) - octets_manquants)
+    with pytest.raises(ValueError, match="tronqué"):
+        ouvrir_planning(dossier)
+
+
+def test_fichier_vide_ou_entete_illisible(tmp_path):
+    (tmp_path / "vide.npy").write_bytes(b"")
+    with pytest.raises(ValueError, match="n'est pas un fichier .npy"):
+        _projeter_npy(str(tmp_path / "vide.npy"))
+    (tmp_path / "entete.npy").write_bytes(b"\x93NUMPY\x01\x00\x10\x00{'descr': '<i4'")
+    with pytest.raises(ValueError, match="En-tête .npy illisible"):
+        _projeter_npy(str(tmp_path / "entete.npy"))
+
+
+@pytest.mark.parametrize("dtype", ["<i8", ">i4", "<u4", "<f4"])
+def test_type_inattendu(tmp_path, dtype):
+    np.save(tmp_path / "a.npy", np.arange(10, dtype=dtype))
+    with pytest.raises(ValueError, match="Format inattendu"):
+        _projeter_npy(str(tmp_path / "a.npy"))
+
+
+def test_archive_incomplete(tmp_path):
+    medecins, vacances = demonstration()
+    planning = planifier(medecins, vacances, 10, 3)
+    enregistrer_planning(Planning(medecins, vacances, 10, 3, planning.affectation[:8]), str(tmp_path / "planning"))
+    with pytest.raises(ValueError, match="incomplète : 8 jours sur 10"):
+        ouvrir_planning(str(tmp_path / "planning"))
@@ -0,0 +1,117 @@
+"""
+Desccription : Tester le cache de plannings de cache.py
+"""
+import os
+import numpy as np
+import pytest
+from planning_medecin import cache as module_cache
+from planning_medecin.lib_hp import Medecin, PeriodeVacance
+from planning_medecin.cache import CacheSolutions, EchecMemorise, cle_canonique
+from tests.outils import demonstration
+
+
+def test_cle_canonique():
+    assert cle_canonique([Medecin("Dr. VIDAL", {2, 1})], [], 2, 1) == cle_canonique([Medecin("Dr. VIDAL", {1, 2})], [], 2, 1)
+    medecins, vacances = demonstration()
+    cle = cle_canonique(medecins, vacances, 10, 3)
+    assert cle != cle_canonique(medecins[::-1], vacances, 10, 3)
+    assert cle != cle_canonique(medecins, vacances[::-1], 10, 3)
+    assert cle != cle_canonique(medecins, vacances, 10, 4)
+    assert cle != cle_canonique(medecins, vacances, 10, 3, solver="exact")
+
+
+def test_succes_memoire_et_disque(tmp_path):
+    medecins, vacances = demonstration()
+    cache = CacheSolutions(dossier=str(tmp_path))
+    planning = cache.planifier(medecins, vacances, 10, 3)
+    assert cache.planifier(medecins, vacances, 10, 3) is planning
+    assert (cache.succes_memoire, cache.defauts) == (1, 1)
+
+    autre = CacheSolutions(dossier=str(tmp_path))
+    assert autre.planifier(medecins, vacances, 10, 3).affectation.tolist() == planning.affectation.tolist()
+    assert (autre.succes_disque, autre.defauts) == (1, 0)
+
+
+def test_echec_memorise():
+    medecins = [Medecin("Dr. A", {1, 2}), Medecin("Dr. B", {1})]
+    cache = CacheSolutions()
+    for _ in range(2):
+        with pytest.raises(ValueError, match="jour 2"):
+            cache.planifier(medecins, [], 2, 1)
+    assert (cache.succes_memoire, cache.defauts) == (1, 1)
+    assert cache.planifier(medecins, [], 2, 1, solver="exact").affectation.tolist() == [1, 0]
+
+
+def test_eviction_memoire():
+    medecins, vacances = demonstration()
+    cache = CacheSolutions(taille_memoire=2)
+    for max_gardes in (3, 4, 5, 3):
+        cache.planifier(medecins, vacances, 10, max_gardes)
+    assert (cache.succes_memoire, cache.defauts) == (0, 4)
+    cache.planifier(medecins, vacances, 10, 3)
+    assert cache.succes_memoire == 1
+
+
+def test_eviction_disque(tmp_path):
+    medecins = [Medecin("Dr. VIDAL", {1, 2})]
+    vacances = [PeriodeVacance("Noel", 1, 1)]
+    cache = CacheSolutions(dossier=str(tmp_path))
+    cache.planifier(medecins, vacances, 2, 2)
+    taille = sum(entree.stat().st_size for entree in os.scandir(tmp_path))
+    cache.taille_disque_max = 2 * taille
+
+    cles = []
+    for max_gardes in (2, 3, 4, 5):
+        cles.append(cle_canonique(medecins, vacances, 2, max_gardes))
+        cache.planifier(medecins, vacances, 2, max_gardes)
+        # Dates de dernier accès croissantes et distinctes, quelle que soit la résolution de l'horloge.
+        os.utime(os.path.join(tmp_path, cles[-1] + ".npz"), (len(cles), len(cles)))
+    restants = sorted(nom[:-4] for nom in os.listdir(tmp_path))
+    assert restants == sorted(cles[-2:])
+
+
+def test_aller_retour_disque(tmp_path):
+    medecins, vacances = demonstration()
+    planning = CacheSolutions(dossier=str(tmp_path)).planifier(medecins, vacances, 10, 3)
+    cle = cle_canonique(medecins, vacances, 10, 3)
+    relu = CacheSolutions(dossier=str(tmp_path)).lire(cle)
+    assert relu.medecins == medecins and relu.vacances == vacances
+    assert (relu.nb_jours, relu.max_gardes) == (10, 3)
+    assert relu.affectation.tolist() == planning.affectation.tolist()
+    assert list(relu.gardes_par_jour()) == list(planning.gardes_par_jour())
+
+    CacheSolutions(dossier=str(tmp_path)).ecrire("echec", EchecMemorise("Aucun médecin disponible pour le jour 2"))
+    assert CacheSolutions(dossier=str(tmp_path)).lire("echec") == EchecMemorise("Aucun médecin disponible pour le jour 2")
+
+
+@pytest.mark.parametrize("contenu", ["objet", "tronque", "incomplet"])
+def test_entree_disque_refusee(tmp_path, contenu):
+    """Une entrée illisible, tronquée ou contenant des objets picklés est un défaut de cache, jamais désérialisée."""
+    chemin = tmp_path / "cle.npz"
+    if contenu == "objet":
+        np.savez(chemin, echec=np.array([{"message": "x"}], dtype=object))
+    elif contenu == "tronque":
+        medecins, vacances = demonstration()
+        CacheSolutions(dossier=str(tmp_path)).planifier(medecins, vacances, 10, 3)
+        donnees = (tmp_path / (cle_canonique(medecins, vacances, 10, 3) + ".npz")).read_bytes()
+        chemin.write_bytes(donnees[:len(donnees) // 2])
+    else:
+        np.savez(chemin, affectation=np.array([0, 1]))
+    cache = CacheSolutions(dossier=str(tmp_path))
+    assert cache.lire("cle") is None and cache.defauts == 1
+
+
+def test_eviction_sans_parcours_sous_la_limite(tmp_path, monkeypatch):
+    parcours = []
+    scandir = os.scandir
+    monkeypatch.setattr(module_cache.os, "scandir", lambda dossier: parcours.append(dossier) or scandir(dossier))
+    medecins = [Medecin("Dr. VIDAL", {1, 2})]
+    cache = CacheSolutions(dossier=str(tmp_path))
+    for max_gardes in range(2, 12):
+        cache.planifier(medecins, [], 2, max_gardes)
+    assert len(parcours) == 1
+
+    cache.taille_disque_max = cache._octets_disque - 1
+    cache.planifier(medecins, [], 2, 12)
+    assert len(parcours) == 2
+    assert sum(entree.stat().st_size for entree in os.scandir(tmp_path)) <= 0.9 * cache.taille_disque_max
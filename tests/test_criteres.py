@@ -0,0 +1,52 @@
+"""
+Desccription : Tester le chargement et la validation groupée des critères de lib_hp.py
+"""
+import pytest
+import planning_medecin
+from planning_medecin.lib_hp import CriteresInvalides, Medecin, PeriodeVacance, charger_criteres
+
+
+def test_exemple_docstring():
+    data = {"medecins": [{"id": "Dr. VIDAL", "disponibilites": [1, 2]}], "vacances": [], "nb_jours": 2}
+    assert charger_criteres(data) == ([Medecin("Dr. VIDAL", {1, 2})], [], 2, 3)
+
+
+def test_tous_les_enregistrements_invalides_dans_une_erreur():
+    data = {
+        "medecins": [
+            {"id": "Dr. VIDAL", "disponibilites": [1, 2]},
+            {"disponibilites": [1]},
+            {"id": "Dr. LECH", "disponibilites": [3, -2]},
+            {"id": "Dr. VIDAL", "disponibilites": [4]},
+            {"id": "Dr. SENGEL", "disponibilites": [5]},
+        ],
+        "vacances": [{"nom": "Noel", "debut": 3, "duree": 2}, {"nom": "Ete", "debut": -1, "duree": 2}],
+    }
+    with pytest.raises(ValueError) as excinfo:
+        charger_criteres(data)
+    assert isinstance(excinfo.value, CriteresInvalides)
+    assert excinfo.value.erreurs == [
+        "Médecin n°2 (None) : l'ID doit être une chaîne de caractères",
+        "Médecin n°3 ('Dr. LECH') : jours négatifs dans les disponibilités",
+        "Médecin n°4 ('Dr. VIDAL') : l'ID est déjà celui du médecin n°1",
+        "Période n°2 ('Ete') : debut n'est pas valide (-1)",
+    ]
+    assert str(excinfo.value).startswith("4 enregistrement(s) invalide(s) :\n- Médecin n°2")
+
+
+def test_erreurs_tronquees():
+    with pytest.raises(CriteresInvalides) as excinfo:
+        Medecin.from_records([{"id": f"Dr. {i}", "disponibilites": []} for i in range(25)])
+    assert len(excinfo.value.erreurs) == 25
+    assert str(excinfo.value).endswith("... et 5 autres")
+
+
+def test_comme_la_construction_objet_par_objet():
+    records = [{"id": f"Dr. {i}", "disponibilites": [i + 1, 2 * i + 3]} for i in range(50)]
+    assert Medecin.from_records(records) == [Medecin(rec["id"], set(rec["disponibilites"])) for rec in records]
+    assert PeriodeVacance.from_records([{"nom": "Noel", "debut": 3, "duree": 2}]) == [PeriodeVacance("Noel", 3, 2)]
+
+
+def test_export():
+    assert planning_medecin.charger_criteres is charger_criteres
+    assert "charger_criteres" in planning_medecin.__all__
@@ -0,0 +1,135 @@
+"""
+Desccription : Tester la planification de plusieurs gardes par jour de effectifs.py
+"""
+import json
+import random
+from collections import Counter
+from itertools import combinations, product
+import numpy as np
+import pytest
+from typer.testing import CliRunner
+from planning_medecin.__main__ import app
+from planning_medecin.calendrier import CalendrierVacances
+from planning_medecin.lib_hp import CriteresInvalides, Medecin, PeriodeVacance, planifier
+from planning_medecin.effectifs import charger_effectifs, effectifs_par_jour, planifier_effectifs
+from tests.outils import demonstration, instances
+from tests.test_glouton import glouton_d_origine
+
+
+def est_valide(medecins, vacances, nb_jours, max_gardes, effectifs, jours):
+    """Vrai si `jours` (les indices des médecins de garde, jour par jour) respecte toutes les contraintes."""
+    noms = CalendrierVacances(vacances, nb_jours).noms_par_jour()
+    par_periode = [(i, nom) for equipe, nom in zip(jours, noms) if nom for i in equipe]
+    return (
+        [len(equipe) for equipe in jours] == list(effectifs)
+        and all(len(set(equipe)) == len(equipe) for equipe in jours)
+        and all(jour in medecins[i].disponibilites for jour, equipe in enumerate(jours, start=1) for i in equipe)
+        and max(Counter(i for equipe in jours for i in equipe).values(), default=0) <= max_gardes
+        and len(par_periode) == len(set(par_periode))
+    )
+
+
+def existe(medecins, vacances, nb_jours, max_gardes, effectifs):
+    """Recherche exhaustive d'un emploi du temps respectant les effectifs."""
+    equipes = [list(combinations([i for i, med in enumerate(medecins) if jour in med.disponibilites], effectif))
+               for jour, effectif in enumerate(effectifs, start=1)]
+    return any(est_valide(medecins, vacances, nb_jours, max_gardes, effectifs, jours) for jours in product(*equipes))
+
+
+def equipes(planning):
+    """Les médecins de garde de chaque jour d'un `PlanningEffectifs`, sous forme de listes d'indices."""
+    debuts = planning.debuts.tolist()
+    return [planning.affectation[debuts[j]:debuts[j + 1]].tolist() for j in range(planning.nb_jours)]
+
+
+def test_effectifs_par_jour():
+    effectifs = effectifs_par_jour([PeriodeVacance("Noel", 8, 2)], 10, 2, hebdomadaire=[2, 2, 2, 2, 2, 3, 3], par_jour={10: 4})
+    assert effectifs.tolist() == [2, 2, 2, 2, 2, 3, 3, 2, 2, 4]
+    assert effectifs_par_jour([PeriodeVacance("Noel", 8, 2)], 10, 1, par_vacance={"Noel": 3}).tolist() == [1] * 7 + [3, 3, 1]
+
+
+def test_charger_effectifs():
+    assert charger_effectifs({"effectifs": {"par_defaut": 2, "jours": {"3": 3}}}, [], 4).tolist() == [2, 2, 3, 2]
+    assert charger_effectifs({}, [], 3).tolist() == [1, 1, 1]
+    assert charger_effectifs({"effectifs": 2}, [], 2).tolist() == [2, 2]
+
+
+@pytest.mark.parametrize("effectifs", [-1, True, {"hebdomadaire": [2, 2]}, {"jours": {"x": 2}}, {"vacances": {"Noel": 1.5}}])
+def test_plantage_charger_effectifs(effectifs):
+    with pytest.raises(CriteresInvalides):
+        charger_effectifs({"effectifs": effectifs}, [PeriodeVacance("Noel", 1, 1)], 7)
+
+
+def test_exemples_docstring():
+    medecins, vacances = demonstration()
+    effectifs = effectifs_par_jour(vacances, 10, 2, par_vacance={"Ete": 1})
+    planning = planifier_effectifs(medecins, vacances, 10, 6, effectifs)
+    assert planning.medecins_de_garde(1) == ["Dr. MACHECOURT", "Dr. SENGEL"]
+    assert planning.gardes.tolist() == [3, 4, 3, 4, 4]
+    assert est_valide(medecins, vacances, 10, 6, effectifs, equipes(planning))
+
+
+def test_medecin_ayant_deja_assure_la_periode_ecarte():
+    medecins = [Medecin("X", {2, 3}), Medecin("A", {1, 3}), Medecin("B", {1, 3})]
+    planning = planifier_effectifs(medecins, [PeriodeVacance("Noel", 2, 2)], 3, 3, [2, 1, 2])
+    assert [planning.medecins_de_garde(jour) for jour in (1, 2, 3)] == [["A", "B"], ["X"], ["A", "B"]]
+
+
+def test_un_par_jour_moins_charge_ayant_deja_assure_la_periode():
+    """A, le moins chargé le jour 4, a déjà assuré Noel le jour 3 : B est choisi, là où l'algorithme d'origine échouait."""
+    medecins, vacances = [Medecin("A", {3, 4}), Medecin("B", {1, 2, 4})], [PeriodeVacance("Noel", 3, 2)]
+    with pytest.raises(ValueError, match="ont déjà réalisé leur jour de garde"):
+        glouton_d_origine(medecins, vacances, 4, 3)
+    planning = planifier_effectifs(medecins, vacances, 4, 3)
+    assert [planning.medecins_de_garde(jour) for jour in (1, 2, 3, 4)] == [["B"], ["B"], ["A"], ["B"]]
+    assert planning.affectation.tolist() == planifier(medecins, vacances, 4, 3).affectation.tolist() == [1, 1, 0, 1]
+    # Sans autre médecin disponible le jour 4, l'erreur demeure.
+    with pytest.raises(ValueError, match="Les médecins disponibles pour Noel ont déjà réalisé leur jour de garde"):
+        planifier_effectifs([Medecin("A", {3, 4}), Medecin("B", {1, 2, 3})], vacances, 4, 3)
+
+
+def test_plantage_periode():
+    medecins = [Medecin("X", {2, 3}), Medecin("A", {1, 3}), Medecin("B", {1, 2, 3})]
+    with pytest.raises(ValueError, match="Nombre de médecins insuffisant pour couvrir les 4 gardes de la période Noel"):
+        planifier_effectifs(medecins, [PeriodeVacance("Noel", 2, 2)], 3, 3, [1, 2, 2])
+    with pytest.raises(ValueError, match="Les effectifs doivent être 3 entiers"):
+        planifier_effectifs(medecins, [], 3, 3, [1, 2])
+
+
+@pytest.mark.parametrize("graine", [0, 1])
+def test_un_par_jour_comme_planifier(graine):
+    for medecins, vacances, nb_jours, max_gardes in instances(graine):
+        try:
+            attendu = planifier(medecins, vacances, nb_jours, max_gardes).affectation.tolist()
+        except ValueError:
+            with pytest.raises(ValueError):
+                planifier_effectifs(medecins, vacances, nb_jours, max_gardes)
+            continue
+        assert planifier_effectifs(medecins, vacances, nb_jours, max_gardes).affectation.tolist() == attendu
+
+
+@pytest.mark.parametrize("graine", [0, 1])
+def test_plusieurs_par_jour_force_brute(graine):
+    rng = random.Random(graine)
+    for medecins, vacances, nb_jours, max_gardes in instances(graine, nombre=200, nb_medecins_max=5, nb_jours_max=5):
+        effectifs = np.array([rng.randint(0, 3) for _ in range(nb_jours)])
+        if not existe(medecins, vacances, nb_jours, max_gardes, effectifs):
+            with pytest.raises(ValueError):
+                planifier_effectifs(medecins, vacances, nb_jours, max_gardes, effectifs)
+            continue
+        try:
+            planning = planifier_effectifs(medecins, vacances, nb_jours, max_gardes, effectifs)
+        except ValueError:
+            continue
+        assert est_valide(medecins, vacances, nb_jours, max_gardes, effectifs, equipes(planning))
+
+
+def test_cli_refuse_options(tmp_path):
+    chemin = tmp_path / "effectifs.json"
+    chemin.write_text(json.dumps({"medecins": [{"id": "A", "disponibilites": [1, 2]}, {"id": "B", "disponibilites": [1, 2]}],
+                                  "vacances": [], "nb_jours": 2, "max_gardes": 2, "effectifs": 2}))
+    runner = CliRunner()
+    resultat = runner.invoke(app, ["solve", str(chemin), "--format", "csv"])
+    assert resultat.exit_code == 0 and "1,,A" in resultat.output and "1,,B" in resultat.output
+    resultat = runner.invoke(app, ["solve", str(chemin), "--verifier"])
+    assert resultat.exit_code != 0 and "--verifier" in resultat.output
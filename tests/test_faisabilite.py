@@ -0,0 +1,81 @@
+"""
+Desccription : Tester le calcul de flot de faisabilite.py
+"""
+import json
+import pytest
+from typer.testing import CliRunner
+from planning_medecin.__main__ import app
+from planning_medecin.calendrier import CalendrierVacances
+from planning_medecin.lib_hp import Medecin, PeriodeVacance, trouver_emploi_du_temps
+from planning_medecin.faisabilite import verifier_faisabilite
+from tests.outils import demonstration, emplois_du_temps, est_valide, instances
+
+
+def gardes_offertes(medecins, vacances, nb_jours, max_gardes, jours):
+    """Gardes que les médecins peuvent offrir à `jours` : une par jour hors vacances, une par période, `max_gardes` au plus."""
+    noms = CalendrierVacances(vacances, nb_jours).noms_par_jour()
+    total = 0
+    for medecin in medecins:
+        dispos = [jour for jour in jours if jour in medecin.disponibilites]
+        hors_vacances = [jour for jour in dispos if not noms[jour - 1]]
+        periodes = {noms[jour - 1] for jour in dispos if noms[jour - 1]}
+        total += min(max_gardes, len(hors_vacances) + len(periodes))
+    return total
+
+
+def test_exemple_docstring():
+    medecins = [Medecin("Dr. VIDAL", {1, 2, 3}), Medecin("Dr. SENGEL", {2, 3})]
+    vacances = [PeriodeVacance("Noel", 1, 3)]
+    resultat = verifier_faisabilite(medecins, vacances, 3, 3)
+    assert (resultat.faisable, resultat.jours_en_defaut, resultat.gardes_disponibles) == (False, [1, 2, 3], 2)
+    assert "[1, 2, 3]" in resultat.message()
+
+
+def test_demonstration_faisable():
+    medecins, vacances = demonstration()
+    resultat = verifier_faisabilite(medecins, vacances, 10, 3)
+    assert resultat.faisable and resultat.jours_couverts == 10
+    assert resultat.jours_en_defaut == [] and resultat.gardes_disponibles == 0
+    assert est_valide(medecins, vacances, 10, 3, resultat.affectation)
+
+
+@pytest.mark.parametrize("graine", [0, 1])
+def test_verdict_force_brute(graine):
+    for medecins, vacances, nb_jours, max_gardes in instances(graine):
+        resultat = verifier_faisabilite(medecins, vacances, nb_jours, max_gardes)
+        assert resultat.faisable == (next(emplois_du_temps(medecins, vacances, nb_jours, max_gardes), None) is not None)
+
+        couverts = [(jour, i) for jour, i in enumerate(resultat.affectation, start=1) if i >= 0]
+        assert len(couverts) == resultat.jours_couverts
+        assert all(jour in medecins[i].disponibilites for jour, i in couverts)
+        assert all(resultat.affectation.count(i) <= max_gardes for _, i in couverts)
+
+
+@pytest.mark.parametrize("graine", [0, 1])
+def test_temoin_de_hall(graine):
+    for medecins, vacances, nb_jours, max_gardes in instances(graine):
+        resultat = verifier_faisabilite(medecins, vacances, nb_jours, max_gardes)
+        if resultat.faisable:
+            continue
+        jours = resultat.jours_en_defaut
+        assert jours and set(jours) <= set(range(1, nb_jours + 1))
+        offertes = gardes_offertes(medecins, vacances, nb_jours, max_gardes, jours)
+        assert offertes == resultat.gardes_disponibles < len(jours)
+
+
+def test_glouton_en_echec_sur_instance_faisable():
+    medecins = [Medecin("Dr. A", {1, 2}), Medecin("Dr. B", {1})]
+    assert verifier_faisabilite(medecins, [], 2, 1).faisable
+    with pytest.raises(ValueError, match="jour 2"):
+        trouver_emploi_du_temps(medecins, [], 2, 1)
+
+
+def test_cli_verifier_avant_resolution(tmp_path):
+    chemin = tmp_path / "criteres.json"
+    chemin.write_text(json.dumps({"medecins": [{"id": "A", "disponibilites": [1, 2]}], "vacances": [], "nb_jours": 2, "max_gardes": 1}))
+    runner = CliRunner()
+    resultat = runner.invoke(app, ["solve", str(chemin), "--format", "csv", "--no-cache"])
+    assert resultat.exit_code != 0 and "1,,A" in resultat.output
+    resultat = runner.invoke(app, ["solve", str(chemin), "--format", "csv", "--no-cache", "--verifier"])
+    assert resultat.exit_code != 0 and "1,,A" not in resultat.output
+    assert "Aucun emploi du temps possible" in str(resultat.exception)
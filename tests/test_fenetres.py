@@ -0,0 +1,49 @@
+"""
+Desccription : Tester la planification par fenêtres de fenetres.py
+"""
+import re
+import numpy as np
+import pytest
+from planning_medecin.lib_hp import planifier
+from planning_medecin.fenetres import iterer_fenetres, planifier_par_fenetres
+from tests.outils import demonstration, instances
+
+
+def test_exemple_docstring():
+    medecins, vacances = demonstration()
+    fenetres = [(f.debut, f.fin, f.affectation.tolist()) for f in iterer_fenetres(medecins, vacances, 10, 3, taille_fenetre=4)]
+    assert fenetres == [(1, 4, [0, 1, 2, 3]), (5, 8, [4, 1, 2, 0]), (9, 10, [3, 4])]
+
+
+def test_gardes_par_jour():
+    medecins, vacances = demonstration()
+    fenetre = list(iterer_fenetres(medecins, vacances, 10, 3, taille_fenetre=4))[0]
+    assert list(fenetre.gardes_par_jour())[2] == (3, "Noel", "Dr. THEODORE")
+
+
+@pytest.mark.parametrize("taille_fenetre", [1, 2, 3, 7])
+def test_equivalence_glouton(taille_fenetre):
+    for medecins, vacances, nb_jours, max_gardes in instances(taille_fenetre, nombre=200, nb_medecins_max=5, nb_jours_max=15):
+        try:
+            attendu = planifier(medecins, vacances, nb_jours, max_gardes).affectation.tolist()
+        except ValueError as erreur:
+            with pytest.raises(ValueError, match=re.escape(str(erreur))):
+                list(iterer_fenetres(medecins, vacances, nb_jours, max_gardes, taille_fenetre))
+            continue
+        fenetres = list(iterer_fenetres(medecins, vacances, nb_jours, max_gardes, taille_fenetre))
+        assert np.concatenate([f.affectation for f in fenetres]).tolist() == attendu
+        assert [f.debut for f in fenetres] == list(range(1, nb_jours + 1, taille_fenetre))
+
+
+def test_planifier_par_fenetres():
+    medecins, vacances = demonstration()
+    recues = []
+    gardes = planifier_par_fenetres(medecins, vacances, 10, 3, 3, recues.append)
+    assert gardes.tolist() == planifier(medecins, vacances, 10, 3).gardes.tolist()
+    assert [(f.debut, f.fin) for f in recues] == [(1, 3), (4, 6), (7, 9), (10, 10)]
+
+
+def test_taille_fenetre_invalide():
+    medecins, vacances = demonstration()
+    with pytest.raises(ValueError):
+        list(iterer_fenetres(medecins, vacances, 10, 3, taille_fenetre=0))
@@ -0,0 +1,92 @@
+"""
+Desccription : Tester la lecture NDJSON et l'écriture au fil de l'eau de flux.py
+"""
+import io
+import json
+import pytest
+from planning_medecin.lib_hp import Medecin, PeriodeVacance, planifier
+from planning_medecin.flux import ecrire_planning_csv, ecrire_planning_ndjson, lire_criteres_ndjson, planifier_en_flux
+from tests.outils import demonstration, instances
+
+
+class FichierCompte(io.StringIO):
+    """Fichier en mémoire qui compte ses appels à `flush`."""
+
+    def __init__(self):
+        super().__init__()
+        self.flushs = 0
+
+    def flush(self):
+        self.flushs += 1
+        super().flush()
+
+
+def gardes_puis_erreur(nombre):
+    for jour in range(1, nombre + 1):
+        yield jour, "", "Dr. A"
+    raise ValueError(f"Aucun médecin disponible pour le jour {nombre + 1}")
+
+
+def test_lire_criteres_ndjson():
+    lignes = ['{"nb_jours": 3, "max_gardes": 2}', "", '{"id": "Dr. VIDAL", "disponibilites": [1, 3]}',
+              '{"id": "Dr. SENGEL", "disponibilites": [3, 2, 9]}', '{"nom": "Noel", "debut": 2, "duree": 1}']
+    medecins, vacances, nb_jours, max_gardes, index = lire_criteres_ndjson(lignes)
+    assert [med.id for med in medecins] == ["Dr. VIDAL", "Dr. SENGEL"]
+    assert vacances == [PeriodeVacance("Noel", 2, 1)] and (nb_jours, max_gardes) == (3, 2)
+    assert index.candidats_par_jour().tolist() == [1, 1, 2]
+    assert index.medecins_disponibles(3).tolist() == [0, 1]
+
+
+@pytest.mark.parametrize("ligne,type_recu", [("3", "int"), ("[]", "list"), ('"disponibilites"', "str"), ("null", "NoneType")])
+def test_ligne_qui_n_est_pas_un_objet(ligne, type_recu):
+    with pytest.raises(ValueError, match=f"Ligne 2 : objet JSON attendu, reçu {type_recu}"):
+        lire_criteres_ndjson(['{"id": "Dr. A", "disponibilites": [1]}', ligne])
+
+
+def test_ligne_json_invalide():
+    with pytest.raises(ValueError, match="Ligne 1 : JSON invalide"):
+        lire_criteres_ndjson(["{"])
+
+
+@pytest.mark.parametrize("graine", [0, 1])
+def test_flux_comme_planifier(graine):
+    for medecins, vacances, nb_jours, max_gardes in instances(graine, nombre=100):
+        try:
+            attendu = planifier(medecins, vacances, nb_jours, max_gardes).gardes_par_jour()
+        except ValueError:
+            with pytest.raises(ValueError):
+                list(planifier_en_flux(medecins, vacances, nb_jours, max_gardes))
+            continue
+        assert list(planifier_en_flux(medecins, vacances, nb_jours, max_gardes)) == list(attendu)
+
+
+def test_ecrire_csv_et_ndjson():
+    medecins, vacances = demonstration()
+    csv, ndjson = io.StringIO(), io.StringIO()
+    ecrire_planning_csv(planifier_en_flux(medecins, vacances, 10, 3), csv)
+    ecrire_planning_ndjson(planifier_en_flux(medecins, vacances, 10, 3), ndjson)
+    assert csv.getvalue().splitlines()[:2] == ["jour,vacance,medecin", "1,,Dr. MACHECOURT"]
+    assert json.loads(ndjson.getvalue().splitlines()[2]) == {"jour": 3, "vacance": "Noel", "medecin": "Dr. THEODORE"}
+
+
+@pytest.mark.parametrize("ecrire", [ecrire_planning_csv, ecrire_planning_ndjson])
+def test_flush_par_lot(ecrire):
+    fichier = FichierCompte()
+    ecrire(((jour, "", "Dr. A") for jour in range(1, 2501)), fichier, taille_lot=1000)
+    assert fichier.flushs == 3
+    assert fichier.getvalue().count("Dr. A") == 2500
+
+
+@pytest.mark.parametrize("ecrire", [ecrire_planning_csv, ecrire_planning_ndjson])
+def test_jours_ecrits_avant_une_erreur(ecrire):
+    fichier = FichierCompte()
+    with pytest.raises(ValueError, match="jour 6"):
+        ecrire(gardes_puis_erreur(5), fichier)
+    assert fichier.flushs == 1 and fichier.getvalue().count("Dr. A") == 5
+
+
+def test_planifier_en_flux_erreur_au_jour_concerne():
+    gardes = planifier_en_flux([Medecin("Dr. A", {1, 2})], [], 2, 1)
+    assert next(gardes) == (1, "", "Dr. A")
+    with pytest.raises(ValueError, match="jour 2"):
+        next(gardes)
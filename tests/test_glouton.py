@@ -0,0 +1,75 @@
+"""
+Desccription : Tester le coeur glouton de lib_hp.py contre une copie de l'implémentation d'origine
+"""
+import re
+import numpy as np
+import pytest
+from planning_medecin.lib_hp import IndexParJour, Medecin, MatriceDisponibilites, planifier
+from tests.outils import instances
+
+
+def glouton_d_origine(medecins, vacances, nb_jours, max_gardes):
+    """
+    Copie de l'algorithme glouton d'origine (`trouver_emploi_du_temps` avant l'index des disponibilités), réduite
+    à l'affectation : un indice de médecin par jour. Seul le refus d'une liste de vacances vide est retiré.
+    """
+    duree_max_vac = max(v.duree for v in vacances) if vacances else 0
+    if len(medecins) < duree_max_vac:
+        raise ValueError(f"Nombre de médecins insuffisant pour couvrir la plus longue période de vacances de {duree_max_vac} jours.")
+    jours_garde = {i + 1: "" for i in range(nb_jours)}
+    for vacance in vacances:
+        for i in range(vacance.debut, vacance.debut + vacance.duree):
+            jours_garde[i] = vacance.nom
+    dispo_medecins = {j: [] for j in range(1, nb_jours + 1)}
+    for medecin in medecins:
+        for jour in medecin.disponibilites:
+            dispo_medecins.setdefault(jour, []).append(medecin.id)
+
+    indices = {med.id: i for i, med in enumerate(medecins)}
+    affectation = []
+    gardes_vacance = {med.id: {v.nom: False for v in vacances} for med in medecins}
+    gardes_count = {med.id: 0 for med in medecins}
+    for jour in range(1, nb_jours + 1):
+        vacance_nom = jours_garde[jour]
+        medecins_jour = [(med_id, gardes_count[med_id]) for med_id in dispo_medecins.get(jour, []) if gardes_count[med_id] < max_gardes]
+        medecins_jour.sort(key=lambda x: x[1])
+        if not medecins_jour:
+            raise ValueError(f"Aucun médecin disponible pour le jour {jour}, impossible de compléter l'emploi du temps.")
+        med_id = medecins_jour[0][0]
+        if vacance_nom:
+            if gardes_vacance[med_id][vacance_nom]:
+                raise ValueError(f"Les médecins disponibles pour {vacance_nom} ont déjà réalisé leur jour de garde et des jours sont encore sans médecins.")
+            gardes_vacance[med_id][vacance_nom] = True
+        gardes_count[med_id] += 1
+        affectation.append(indices[med_id])
+    return affectation
+
+
+@pytest.mark.parametrize("graine,nb_medecins_max,nb_jours_max", [(0, 4, 7), (1, 4, 7), (2, 12, 40), (3, 40, 120)])
+def test_comme_glouton_d_origine(graine, nb_medecins_max, nb_jours_max):
+    """Partout où l'algorithme d'origine aboutit, l'affectation est la même ; où il échoue faute de médecin, aussi."""
+    for medecins, vacances, nb_jours, max_gardes in instances(graine, nombre=200, nb_medecins_max=nb_medecins_max, nb_jours_max=nb_jours_max):
+        try:
+            attendu = glouton_d_origine(medecins, vacances, nb_jours, max_gardes)
+        except ValueError as erreur:
+            if "ont déjà réalisé" in str(erreur):
+                continue
+            with pytest.raises(ValueError, match=re.escape(str(erreur))):
+                planifier(medecins, vacances, nb_jours, max_gardes)
+            continue
+        assert planifier(medecins, vacances, nb_jours, max_gardes).affectation.tolist() == attendu
+
+
+def test_index_par_jour_comme_matrice():
+    for medecins, _, nb_jours, _ in instances(4, nombre=100, nb_medecins_max=10, nb_jours_max=30):
+        creux = IndexParJour.depuis_medecins(medecins, nb_jours)
+        dense = MatriceDisponibilites.depuis_medecins(medecins, nb_jours)
+        assert creux.candidats_par_jour().tolist() == dense.candidats_par_jour().tolist()
+        assert all(creux.colonne(k).tolist() == dense.colonne(k).tolist() for k in range(nb_jours))
+
+
+def test_index_par_jour_hors_horizon():
+    index = IndexParJour.depuis_medecins([Medecin("Dr. A", {0, 2, 5}), Medecin("Dr. B", {2, 3})], 3)
+    assert index.candidats_par_jour().tolist() == [0, 2, 1]
+    assert index.medecins_disponibles(2).tolist() == [0, 1]
+    assert index.medecins.dtype == np.int32
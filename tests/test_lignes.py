@@ -0,0 +1,109 @@
+"""
+Desccription : Tester la planification par lignes de garde de lignes.py
+"""
+import json
+import random
+from collections import Counter
+import pytest
+from typer.testing import CliRunner
+from planning_medecin.__main__ import app
+from planning_medecin.calendrier import CalendrierVacances
+from planning_medecin.lib_hp import CriteresInvalides, Medecin, PeriodeVacance, planifier
+from planning_medecin.lignes import charger_lignes, planifier_par_lignes
+from tests.outils import instances
+
+
+def test_charger_lignes():
+    data = {"medecins": [{"id": "A", "disponibilites": [1], "lignes": ["Cardio", "Urgences"]},
+                         {"id": "B", "disponibilites": [1], "lignes": ["Urgences"]}]}
+    assert charger_lignes(data) == {"Cardio": [0], "Urgences": [0, 1]}
+
+
+@pytest.mark.parametrize("lignes", [None, [], "Cardio", [1]])
+def test_plantage_charger_lignes(lignes):
+    medecin = {"id": "B", "disponibilites": [1]}
+    if lignes is not None:
+        medecin["lignes"] = lignes
+    with pytest.raises(CriteresInvalides, match="Médecin n°2"):
+        charger_lignes({"medecins": [{"id": "A", "disponibilites": [1], "lignes": ["Cardio"]}, medecin]})
+
+
+def test_exemple_docstring():
+    medecins = [Medecin("Dr. VIDAL", {1, 2}), Medecin("Dr. SENGEL", {1, 2}), Medecin("Dr. LECH", {1, 2})]
+    planning = planifier_par_lignes(medecins, {"Cardio": [0, 1], "Urgences": [2]}, [], 2, 2)
+    assert planning.affectation.tolist() == [[0, 2], [1, 2]]
+    assert [(c.lignes, c.medecins) for c in planning.composantes] == [(["Cardio"], [0, 1]), (["Urgences"], [2])]
+    assert planning.to_dataframe()["Urgences"].tolist() == ["Dr. LECH", "Dr. LECH"]
+
+
+def test_composantes():
+    medecins = [Medecin(f"Dr. {i}", {1, 2, 3}) for i in range(5)]
+    lignes = {"A": [0, 1], "B": [1, 2], "C": [3, 4]}
+    planning = planifier_par_lignes(medecins, lignes, [], 3, 3, workers=1)
+    assert sorted(c.lignes for c in planning.composantes) == [["A", "B"], ["C"]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_lignes_independantes_comme_planifier(workers):
+    instances_a = list(instances(0, nombre=40, nb_jours_max=10))
+    instances_b = list(instances(1, nombre=40, nb_jours_max=10))
+    for (medecins_a, vacances, nb_jours, max_gardes), (medecins_b, _, _, _) in zip(instances_a, instances_b):
+        medecins_b = [Medecin(med.id + "b", med.disponibilites) for med in medecins_b]
+        lignes = {"A": list(range(len(medecins_a))), "B": list(range(len(medecins_a), len(medecins_a) + len(medecins_b)))}
+        resultats = []
+        for medecins in (medecins_a, medecins_b):
+            try:
+                resultats.append(planifier(medecins, vacances, nb_jours, max_gardes).affectation.tolist())
+            except ValueError:
+                resultats.append(None)
+        try:
+            planning = planifier_par_lignes(medecins_a + medecins_b, lignes, vacances, nb_jours, max_gardes, workers)
+        except ValueError as erreur:
+            assert None in resultats
+            assert [f"Ligne(s) {nom}" in str(erreur) for nom in "AB"] == [r is None for r in resultats]
+            continue
+        assert planning.affectation[:, 0].tolist() == resultats[0]
+        assert (planning.affectation[:, 1] - len(medecins_a)).tolist() == resultats[1]
+
+
+def test_lignes_partagees_valides():
+    rng = random.Random(0)
+    for medecins, vacances, nb_jours, max_gardes in instances(2, nombre=200, nb_medecins_max=6, nb_jours_max=10):
+        lignes = {"A": [], "B": []}
+        for i in range(len(medecins)):
+            for nom in rng.choice([["A"], ["B"], ["A", "B"]]):
+                lignes[nom].append(i)
+        lignes = {nom: indices for nom, indices in lignes.items() if indices}
+        try:
+            planning = planifier_par_lignes(medecins, lignes, vacances, nb_jours, max_gardes, workers=1)
+        except ValueError:
+            continue
+        noms = CalendrierVacances(vacances, nb_jours).noms_par_jour()
+        par_periode = Counter()
+        for jour, ligne_affectation in enumerate(planning.affectation.tolist(), start=1):
+            assert len(set(ligne_affectation)) == len(ligne_affectation)
+            for nom, i in zip(planning.lignes, ligne_affectation):
+                assert i in lignes[nom] and jour in medecins[i].disponibilites
+                if noms[jour - 1]:
+                    par_periode[i, noms[jour - 1]] += 1
+        assert planning.gardes.max() <= max_gardes
+        assert max(par_periode.values(), default=0) <= 1
+
+
+def test_vacances_trop_longues_pour_une_ligne():
+    medecins = [Medecin("Dr. A", {1, 2}), Medecin("Dr. B", {1, 2}), Medecin("Dr. C", {1, 2})]
+    with pytest.raises(ValueError, match="Nombre de médecins insuffisant sur la ligne Urgences"):
+        planifier_par_lignes(medecins, {"Cardio": [0, 1], "Urgences": [2]}, [PeriodeVacance("Noel", 1, 2)], 2, 2)
+
+
+def test_cli_refuse_options(tmp_path):
+    criteres = {"medecins": [{"id": "A", "disponibilites": [1, 2], "lignes": ["Cardio"]},
+                             {"id": "B", "disponibilites": [1, 2], "lignes": ["Cardio"]}],
+                "vacances": [], "nb_jours": 2, "max_gardes": 2}
+    chemin = tmp_path / "lignes.json"
+    chemin.write_text(json.dumps(criteres))
+    runner = CliRunner()
+    resultat = runner.invoke(app, ["solve", str(chemin), "--format", "csv"])
+    assert resultat.exit_code == 0 and "1,Cardio,,A" in resultat.output
+    resultat = runner.invoke(app, ["solve", str(chemin), "--solver", "exact", "--minimiser"])
+    assert resultat.exit_code != 0 and "--solver, --minimiser" in resultat.output
@@ -0,0 +1,61 @@
+"""
+Desccription : Tester la résolution par lot de lot.py
+"""
+import json
+import os
+from typer.testing import CliRunner
+from planning_medecin.__main__ import app
+from planning_medecin.lot import lister_scenarios, resoudre_lot
+
+CRITERES = {"medecins": [{"id": "A", "disponibilites": [1, 2]}, {"id": "B", "disponibilites": [1, 2]}],
+            "vacances": [], "nb_jours": 2, "max_gardes": 1}
+
+
+def ecrire(chemin, contenu):
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    chemin.write_text(contenu if isinstance(contenu, str) else json.dumps(contenu))
+    return str(chemin)
+
+
+def test_meme_nom_dans_deux_dossiers(tmp_path):
+    chemins = [ecrire(tmp_path / "scenarios" / "a" / "s1.json", CRITERES), ecrire(tmp_path / "scenarios" / "b" / "s1.json", CRITERES)]
+    resume = resoudre_lot(chemins, str(tmp_path / "resultats"), workers=1)
+    sorties = [ligne["sortie"] for ligne in resume]
+    assert sorties == [str(tmp_path / "resultats" / "a" / "s1.csv"), str(tmp_path / "resultats" / "b" / "s1.csv")]
+    assert all(os.path.isfile(sortie) for sortie in sorties)
+
+
+def test_un_scenario_en_echec(tmp_path):
+    chemins = [ecrire(tmp_path / "bon.json", CRITERES),
+               ecrire(tmp_path / "infaisable.json", dict(CRITERES, max_gardes=0)),
+               ecrire(tmp_path / "illisible.json", "{")]
+    resume = resoudre_lot(chemins, str(tmp_path / "resultats"), workers=1)
+    assert [ligne["fichier"] for ligne in resume] == chemins
+    assert [ligne["statut"] for ligne in resume] == ["ok", "echec", "echec"]
+    assert resume[1]["erreur"].startswith("ValueError") and resume[2]["erreur"].startswith("JSONDecodeError")
+    assert sorted(os.listdir(tmp_path / "resultats")) == ["bon.csv", "resume.json"]
+
+
+def test_resume(tmp_path):
+    chemins = [ecrire(tmp_path / "s1.json", CRITERES), ecrire(tmp_path / "s2.json", "{")]
+    resume = resoudre_lot(chemins, str(tmp_path / "resultats"), workers=1)
+    with open(tmp_path / "resultats" / "resume.json") as file:
+        assert json.load(file) == resume
+    assert all(ligne["duree"] >= 0 for ligne in resume)
+    assert set(resume[0]) == {"fichier", "statut", "duree", "sortie"} and set(resume[1]) == {"fichier", "statut", "duree", "erreur"}
+
+
+def test_lister_scenarios(tmp_path):
+    chemins = [ecrire(tmp_path / "b.json", CRITERES), ecrire(tmp_path / "a.json", CRITERES), ecrire(tmp_path / "x" / "c.json", CRITERES)]
+    assert lister_scenarios(str(tmp_path)) == sorted(chemins[:2])
+    assert lister_scenarios(str(tmp_path / "**" / "*.json")) == sorted(chemins)
+
+
+def test_cli(tmp_path):
+    ecrire(tmp_path / "scenarios" / "a" / "s1.json", CRITERES)
+    ecrire(tmp_path / "scenarios" / "b" / "s1.json", "{")
+    sortie = tmp_path / "resultats"
+    resultat = CliRunner().invoke(app, ["solve-batch", str(tmp_path / "scenarios" / "**" / "*.json"), "--sortie", str(sortie), "--workers", "1"])
+    assert resultat.exit_code == 0 and "Résolution par lot" in resultat.output
+    assert (sortie / "a" / "s1.csv").is_file() and not (sortie / "b").exists()
+    assert [ligne["statut"] for ligne in json.loads((sortie / "resume.json").read_text())] == ["ok", "echec"]
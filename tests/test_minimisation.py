@@ -0,0 +1,40 @@
+"""
+Desccription : Tester la recherche du plafond minimal de minimisation.py
+"""
+import pytest
+from planning_medecin.lib_hp import Medecin, PeriodeVacance
+from planning_medecin.minimisation import minimiser_max_gardes
+from tests.outils import demonstration, emplois_du_temps, est_valide, instances
+
+
+def test_exemple_docstring():
+    medecins, vacances = demonstration()
+    resultat = minimiser_max_gardes(medecins, vacances, 10)
+    assert (resultat.max_gardes, resultat.charge_min, resultat.charge_max, resultat.verifications) == (2, 2, 2, 2)
+    assert resultat.ecart == 0 and resultat.solveur == "glouton"
+
+
+def test_affectation_du_flot_si_glouton_echoue():
+    medecins = [Medecin("Dr. A", {1, 2}), Medecin("Dr. B", {1})]
+    resultat = minimiser_max_gardes(medecins, [], 2)
+    assert resultat.max_gardes == 1 and resultat.solveur == "flot"
+    assert resultat.planning.affectation.tolist() == [1, 0]
+
+
+def test_infaisable():
+    with pytest.raises(ValueError, match="Aucun emploi du temps possible"):
+        minimiser_max_gardes([Medecin("Dr. A", {1})], [PeriodeVacance("Noel", 1, 2)], 2)
+
+
+@pytest.mark.parametrize("graine", [0, 1])
+def test_plafond_force_brute(graine):
+    for medecins, vacances, nb_jours, _ in instances(graine, nombre=150):
+        plafonds = [max_gardes for max_gardes in range(1, nb_jours + 1)
+                    if next(emplois_du_temps(medecins, vacances, nb_jours, max_gardes), None) is not None]
+        if not plafonds:
+            with pytest.raises(ValueError):
+                minimiser_max_gardes(medecins, vacances, nb_jours)
+            continue
+        resultat = minimiser_max_gardes(medecins, vacances, nb_jours)
+        assert resultat.max_gardes == plafonds[0]
+        assert est_valide(medecins, vacances, nb_jours, resultat.max_gardes, resultat.planning.affectation.tolist())
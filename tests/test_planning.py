@@ -0,0 +1,46 @@
+"""
+Desccription : Tester les vues du résultat compact Planning de lib_hp.py
+"""
+import io
+import pandas as pd
+from planning_medecin.lib_hp import Medecin, PeriodeVacance, planifier, trouver_emploi_du_temps
+from tests.outils import demonstration
+
+
+def test_exemple_docstring():
+    planning = planifier([Medecin("Dr. VIDAL", {1, 2}), Medecin("Dr. SENGEL", {2})], [PeriodeVacance("Noel", 2, 1)], 2, 2)
+    assert planning.affectation.tolist() == [0, 1]
+    assert planning.gardes.tolist() == [1, 1]
+    assert planning.medecin_de_garde(2) == "Dr. SENGEL"
+
+
+def test_gardes_demonstration():
+    medecins, vacances = demonstration()
+    planning = planifier(medecins, vacances, 10, 3)
+    assert planning.gardes.tolist() == [2, 2, 2, 2, 2]
+
+
+def test_to_dataframe():
+    medecins, vacances = demonstration()
+    result_df = planifier(medecins, vacances, 10, 3).to_dataframe()
+    pd.testing.assert_frame_equal(result_df, trouver_emploi_du_temps(medecins, vacances, 10, 3))
+    assert result_df.index[2] == "Jour 3 Noel"
+    assert (result_df == "X").sum(axis=1).tolist() == [1] * 10
+
+
+def test_to_csv():
+    medecins, vacances = demonstration()
+    planning = planifier(medecins, vacances, 10, 3)
+    fichier = io.StringIO()
+    planning.to_csv(fichier)
+    lignes = fichier.getvalue().splitlines()
+    assert lignes[0] == "jour,vacance,medecin"
+    assert len(lignes) == 11
+    assert lignes[3] == f"3,Noel,{planning.medecin_de_garde(3)}"
+
+
+def test_to_rich():
+    medecins, vacances = demonstration()
+    table = planifier(medecins, vacances, 10, 3).to_rich(debut=3, fin=20)
+    assert table.row_count == 8
+    assert len(table.columns) == 1 + len(medecins)
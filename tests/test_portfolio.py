@@ -0,0 +1,54 @@
+"""
+Desccription : Tester le solveur portfolio de portfolio.py
+"""
+import pytest
+from planning_medecin.calendrier import CalendrierVacances
+from planning_medecin.lib_hp import Medecin, PeriodeVacance, MatriceDisponibilites, planifier
+from planning_medecin.portfolio import resoudre_portfolio
+from tests.outils import demonstration, est_valide
+
+
+def instance(medecins, vacances, nb_jours):
+    return MatriceDisponibilites.depuis_medecins(medecins, nb_jours), CalendrierVacances(vacances, nb_jours)
+
+
+def test_variante_0_sans_pool():
+    medecins, vacances = demonstration()
+    affectation, statistiques = resoudre_portfolio(*instance(medecins, vacances, 10), 3)
+    assert affectation.tolist() == planifier(medecins, vacances, 10, 3).affectation.tolist()
+    assert (statistiques.statut, statistiques.variante, statistiques.essais, statistiques.workers) == ("solution", 0, 1, 0)
+
+
+def test_infaisable_sans_pool():
+    affectation, statistiques = resoudre_portfolio(*instance([Medecin("Dr. A", {1})], [], 2), 2)
+    assert affectation is None
+    assert (statistiques.statut, statistiques.workers) == ("infaisable", 0)
+
+
+@pytest.mark.parametrize("budget_secondes", [None, 30.0])
+def test_variante_aleatoire_si_glouton_echoue(budget_secondes):
+    medecins = [Medecin("Dr. A", {1, 2}), Medecin("Dr. B", {1})]
+    affectation, statistiques = resoudre_portfolio(*instance(medecins, [], 2), 1, budget_secondes, workers=1, max_essais=16)
+    assert affectation.tolist() == [1, 0]
+    assert statistiques.statut == "solution" and statistiques.variante > 0
+
+
+def test_critere_equite():
+    medecins = [Medecin("Dr. A", {1, 2, 3, 4}), Medecin("Dr. B", {1, 2, 3, 4}), Medecin("Dr. C", {4})]
+    vacances = [PeriodeVacance("Noel", 4, 1)]
+    affectation, statistiques = resoudre_portfolio(*instance(medecins, vacances, 4), 4, None, workers=1, critere="equite", max_essais=16)
+    assert est_valide(medecins, vacances, 4, 4, affectation.tolist())
+    assert statistiques.essais == 16 and statistiques.ecart == 1
+
+
+def test_planifier_portfolio():
+    medecins = [Medecin("Dr. A", {1, 2}), Medecin("Dr. B", {1})]
+    with pytest.raises(ValueError):
+        planifier(medecins, [], 2, 1)
+    planning = planifier(medecins, [], 2, 1, solver="portfolio")
+    assert planning.affectation.tolist() == [1, 0] and planning.statistiques.statut == "solution"
+
+
+def test_critere_inconnu():
+    with pytest.raises(ValueError, match="Critère inconnu"):
+        resoudre_portfolio(*instance([Medecin("Dr. A", {1})], [], 1), 1, critere="rapide")
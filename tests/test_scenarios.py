@@ -0,0 +1,50 @@
+"""
+Desccription : Tester la génération de scénarios de scenarios.py et la commande demo
+"""
+import json
+import pytest
+from typer.testing import CliRunner
+from planning_medecin.__main__ import app, get_data, get_scenario
+from planning_medecin.scenarios import generer_scenario
+from tests.outils import demonstration
+
+
+def test_exemple_docstring():
+    medecins, vacances, nb_jours, max_gardes = generer_scenario(100, 365, densite=0.2, graine=42)
+    assert (len(medecins), nb_jours, max_gardes) == (100, 365, 8)
+    assert len(vacances) == 2 and all(v.duree == 7 for v in vacances)
+
+
+def test_reproductible_et_dans_l_horizon():
+    medecins, vacances, _, _ = generer_scenario(300, 120, densite=0.25, graine=3)
+    assert (medecins, vacances) == generer_scenario(300, 120, densite=0.25, graine=3)[:2]
+    assert medecins != generer_scenario(300, 120, densite=0.25, graine=4)[0]
+    assert all(med.disponibilites and med.disponibilites <= set(range(1, 121)) for med in medecins)
+    assert sum(len(med.disponibilites) for med in medecins) / (300 * 120) == pytest.approx(0.25, abs=0.02)
+    assert len({med.id for med in medecins}) == 300
+
+
+def test_au_moins_un_jour_par_medecin():
+    medecins, _, _, _ = generer_scenario(200, 5, densite=0.01, graine=0)
+    assert all(len(med.disponibilites) >= 1 for med in medecins)
+
+
+def test_plantage():
+    with pytest.raises(ValueError):
+        generer_scenario(10, 10, max_gardes="moyen")
+    with pytest.raises(ValueError):
+        generer_scenario(10, 10, densite=0)
+
+
+def test_get_data():
+    assert get_data() == demonstration()
+    assert get_scenario() == (*demonstration(), 10, 3)
+    assert get_scenario(20, 30, graine=1) == generer_scenario(20, 30, graine=1)
+
+
+def test_cli_demo(tmp_path):
+    sortie = tmp_path / "criteres.json"
+    resultat = CliRunner().invoke(app, ["demo", "--medecins", "20", "--jours", "30", "--sortie", str(sortie)])
+    assert resultat.exit_code == 0
+    data = json.loads(sortie.read_text())
+    assert (len(data["medecins"]), data["nb_jours"], data["max_gardes"]) == (20, 30, 4)
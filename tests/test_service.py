@@ -0,0 +1,124 @@
+"""
+Desccription : Tester le service de planification de service.py (lots, cache, pool interrompu, arrêt)
+"""
+import os
+import signal
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from planning_medecin.cache import CacheSolutions
+from planning_medecin.lib_hp import planifier
+from planning_medecin.service import ServicePlanification, _Gestionnaire, _Serveur, resoudre_via_service
+from planning_medecin.scenarios import generer_scenario
+
+
+def criteres(graine, **modifications):
+    medecins, vacances, nb_jours, max_gardes = generer_scenario(30, 40, graine=graine)
+    data = {
+        "medecins": [{"id": med.id, "disponibilites": sorted(med.disponibilites)} for med in medecins],
+        "vacances": [{"nom": vac.nom, "debut": vac.debut, "duree": vac.duree} for vac in vacances],
+        "nb_jours": nb_jours,
+        "max_gardes": max_gardes,
+    }
+    data.update(modifications)
+    return data
+
+
+@pytest.fixture
+def service():
+    service = ServicePlanification(workers=2, cache=CacheSolutions(), delai_lot=0.2)
+    yield service
+    service.fermer()
+
+
+def test_lot_de_requetes_simultanees(service):
+    graines = list(range(6))
+    with ThreadPoolExecutor(len(graines)) as executeur:
+        reponses = list(executeur.map(lambda graine: service.resoudre(criteres(graine)), graines))
+    for graine, reponse in zip(graines, reponses):
+        assert reponse["statut"] == "ok" and reponse["source"] == "calcul"
+        assert reponse["affectation"] == planifier(*generer_scenario(30, 40, graine=graine)).affectation.tolist()
+    assert (service.requetes, service.calculs) == (6, 6)
+    assert service.lots < 6
+
+
+def test_cache_et_requetes_identiques(service):
+    with ThreadPoolExecutor(4) as executeur:
+        reponses = list(executeur.map(lambda _: service.resoudre(criteres(0)), range(4)))
+    assert all(reponse["affectation"] == reponses[0]["affectation"] for reponse in reponses)
+    assert service.calculs == 1
+    assert service.resoudre(criteres(0))["source"] == "cache"
+    assert service.etat()["cache"]["succes_memoire"] >= 1 and service.calculs == 1
+
+
+def test_echec_memorise(service):
+    reponse = service.resoudre(criteres(0, max_gardes=1))
+    assert reponse["statut"] == "echec" and "Aucun médecin" in reponse["erreur"]
+    assert service.resoudre(criteres(0, max_gardes=1))["statut"] == "echec"
+    assert service.calculs == 1
+
+
+def test_soumission_refusee(service, monkeypatch):
+    pool = service._pool
+
+    def soumettre(*args, **kwargs):
+        raise BrokenProcessPool("pool interrompu")
+
+    monkeypatch.setattr(pool, "submit", soumettre)
+    reponse = service.resoudre(criteres(1))
+    assert reponse["statut"] == "erreur" and reponse["erreur"] == "BrokenProcessPool: pool interrompu"
+    assert service._en_cours == {} and service.calculs == 0
+    assert service.resoudre(criteres(1))["statut"] == "ok"
+    assert service._pool is not pool
+
+
+def test_processus_tue(service):
+    for pid in list(service._pool._processes):
+        os.kill(pid, signal.SIGKILL)
+    reponse = service.resoudre(criteres(2))
+    assert reponse["statut"] == "erreur" and reponse["erreur"].startswith("BrokenProcessPool")
+    assert service._en_cours == {}
+    reponse = service.resoudre(criteres(2))
+    assert reponse["statut"] == "ok" and reponse["source"] == "calcul"
+
+
+def test_delai_de_reponse(monkeypatch):
+    service = ServicePlanification(workers=1, cache=CacheSolutions(), delai_reponse=0.05)
+    try:
+        monkeypatch.setattr(service._pool, "submit", lambda *args, **kwargs: Future())
+        reponse = service.resoudre(criteres(3))
+        assert reponse["statut"] == "erreur" and reponse["erreur"].startswith("Délai de réponse dépassé (0.05 s)")
+    finally:
+        monkeypatch.undo()
+        service.fermer()
+
+
+def test_fermer():
+    service = ServicePlanification(workers=1, cache=CacheSolutions())
+    assert service.resoudre(criteres(4))["statut"] == "ok"
+    service.fermer()
+    assert not service._regroupeur.is_alive()
+    with pytest.raises(RuntimeError):
+        service._pool.submit(os.getpid)
+
+
+def test_client_http_service_indisponible(service, monkeypatch):
+    def soumettre(*args, **kwargs):
+        raise BrokenProcessPool("pool interrompu")
+
+    serveur = _Serveur(("127.0.0.1", 0), _Gestionnaire)
+    serveur.service = service
+    fil = threading.Thread(target=serveur.serve_forever, daemon=True)
+    fil.start()
+    url = f"http://127.0.0.1:{serveur.server_address[1]}"
+    try:
+        assert resoudre_via_service(url, criteres(5))["statut"] == "ok"
+        with pytest.raises(ValueError, match="Aucun médecin"):
+            resoudre_via_service(url, criteres(5, max_gardes=1))
+        monkeypatch.setattr(service._pool, "submit", soumettre)
+        with pytest.raises(OSError, match="503"):
+            resoudre_via_service(url, criteres(6))
+    finally:
+        serveur.shutdown()
+        serveur.server_close()
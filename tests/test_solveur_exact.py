@@ -0,0 +1,50 @@
+"""
+Desccription : Tester le solveur exact de solveur_exact.py
+"""
+import pytest
+from planning_medecin.lib_hp import Medecin, PeriodeVacance, planifier, trouver_emploi_du_temps
+from tests.outils import demonstration, emplois_du_temps, est_valide, instances
+
+
+@pytest.mark.parametrize("graine", [0, 1])
+def test_exact_force_brute(graine):
+    for medecins, vacances, nb_jours, max_gardes in instances(graine):
+        existe = next(emplois_du_temps(medecins, vacances, nb_jours, max_gardes), None) is not None
+        if len(medecins) < max((v.duree for v in vacances), default=0):
+            continue
+        try:
+            planning = planifier(medecins, vacances, nb_jours, max_gardes, solver="exact")
+        except ValueError as erreur:
+            assert not existe
+            assert "Aucun emploi du temps ne respecte les contraintes" in str(erreur)
+        else:
+            assert existe
+            assert est_valide(medecins, vacances, nb_jours, max_gardes, planning.affectation.tolist())
+            assert planning.statistiques.statut == "solution"
+
+
+def test_exact_demonstration():
+    medecins, vacances = demonstration()
+    planning = planifier(medecins, vacances, 10, 3, solver="exact")
+    assert planning.affectation.tolist() == [0, 1, 2, 3, 4, 1, 2, 0, 3, 4]
+    assert planning.statistiques.solutions == 1
+
+
+def test_exact_reussit_ou_glouton_echoue():
+    medecins = [Medecin("Dr. A", {1, 2}), Medecin("Dr. B", {1})]
+    with pytest.raises(ValueError):
+        trouver_emploi_du_temps(medecins, [], 2, 1)
+    result_df = trouver_emploi_du_temps(medecins, [], 2, 1, solver="exact")
+    assert result_df["Dr. A"].tolist() == ["-", "X"]
+    assert result_df["Dr. B"].tolist() == ["X", "-"]
+
+
+def test_exact_budget():
+    medecins, vacances = demonstration()
+    with pytest.raises(ValueError, match="Budget de recherche épuisé"):
+        planifier(medecins, vacances, 10, 3, solver="exact", budget_noeuds=3)
+
+
+def test_solveur_inconnu():
+    with pytest.raises(ValueError, match="Solveur inconnu"):
+        planifier([Medecin("Dr. A", {1})], [PeriodeVacance("Noel", 1, 1)], 1, 1, solver="tabou")